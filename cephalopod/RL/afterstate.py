@@ -0,0 +1,26 @@
+from cephalopod.core.board import Board, Die
+
+
+def afterstate_view(board, move, color):
+    """
+    Board dopo la mossa senza deepcopy: le righe sono copiate (shallow) e i Die non toccati
+    sono condivisi con la board originale. È pensata per la sola lettura (reward shaping, valutazioni).
+    """
+    r, c, top_face, captured = move
+    view = Board(board.size)
+    view.grid = [row[:] for row in board.grid]
+    for (rr, cc) in captured:
+        view.grid[rr][cc] = None
+    view.grid[r][c] = Die(color, top_face)
+    return view
+
+
+def afterstate_hash(board, move, color):
+    """Stringa uguale a RLPlayer.get_hash della board dopo la mossa, costruita senza copiare la board."""
+    r, c, top_face, captured = move
+    overrides = {(rr, cc): "" for (rr, cc) in captured}
+    overrides[(r, c)] = f"({color},{top_face})"
+    return str([
+        [overrides.get((i, j), str(cell) if cell else "") for j, cell in enumerate(row)]
+        for i, row in enumerate(board.grid)
+    ])
@@ -1,9 +1,8 @@
-import copy
 import pickle
 import random
 
+from cephalopod.RL.afterstate import afterstate_hash, afterstate_view
 from cephalopod.RL.reward_shaping.rewardshaping import BasicShaper
-from cephalopod.core.board import Die
 from cephalopod.core.mechanics import (
     find_capturing_subsets,
     choose_capturing_subset,
@@ -22,21 +21,28 @@ class RLPlayer:
 
         self.states = []  # Lista di (hash, reward intermedio)
         self.states_value = {}  # Q-table
+        self.dirty_keys = None  # Chiavi modificate dall'ultimo checkpoint (attivato da DeltaCheckpointer)
 
     def get_hash(self, board):
         return str([[str(cell) if cell else "" for cell in row] for row in board.grid])
 
-    def get_intermediate_reward(self, board, move, my_color):
+    def afterstate_hashes(self, board, actions, color):
+        """Hash della board dopo ciascuna azione, senza simulare le mosse su copie della board."""
+        return [afterstate_hash(board, a, color) for a in actions]
+
+    def get_intermediate_reward(self, board, move, my_color, after=None):
         opponent_color = "B" if my_color == "W" else "W"
+        if after is None:
+            after = afterstate_view(board, move, my_color)
 
         try:
             # Se lo shaper accetta 5 argomenti (shaper avanzati)
-            return self.reward_shaper.compute(board, move, my_color, opponent_color, None)
+            return self.reward_shaper.compute(board, move, my_color, opponent_color, None, after=after)
         except TypeError:
             # Per shaper semplici (basic, riskaware)
-            return self.reward_shaper.compute(board, move, my_color)
+            return self.reward_shaper.compute(board, move, my_color, after=after)
 
-    def choose_action(self, board, color):
+    def legal_actions(self, board):
         empty_cells = board.get_empty_cells()
         actions = []
 
@@ -47,37 +53,42 @@ class RLPlayer:
                 actions.append((r, c, sum_pips, subset))
             else:
                 actions.append((r, c, 1, []))
+        return actions
+
+    def select_action(self, board, color):
+        """Sceglie la mossa senza registrarla: ritorna (mossa, hash dell'afterstate, reward intermedio)."""
+        actions = self.legal_actions(board)
 
         if random.uniform(0, 1) <= self.exp_rate:
             move = random.choice(actions)
+            state_hash = self.afterstate_hashes(board, [move], color)[0]
         else:
             best_value = -float("inf")
-            move = None
-            for a in actions:
-                board_copy = copy.deepcopy(board)
-                for (rr, cc) in a[3]:
-                    board_copy.grid[rr][cc] = None
-                board_copy.place_die(a[0], a[1], Die(color, a[2]))
-                state_hash = self.get_hash(board_copy)
-                value = self.states_value.get(state_hash, 0)
+            move = state_hash = None
+            for a, a_hash in zip(actions, self.afterstate_hashes(board, actions, color)):
+                value = self.states_value.get(a_hash, 0)
                 if value > best_value:
                     best_value = value
-                    move = a
+                    move, state_hash = a, a_hash
 
-        # Salva lo stato simulato + reward intermedio
-        board_sim = copy.deepcopy(board)
-        for (rr, cc) in move[3]:
-            board_sim.grid[rr][cc] = None
-        board_sim.place_die(move[0], move[1], Die(color, move[2]))
-
-        state_hash = self.get_hash(board_sim)
         shaped_rwd = self.get_intermediate_reward(board, move, color)
+        return move, state_hash, shaped_rwd
+
+    def select_actions(self, boards, colors):
+        """Versione batch di select_action, usata dagli ambienti vettorizzati."""
+        return [self.select_action(board, color) for board, color in zip(boards, colors)]
+
+    def choose_action(self, board, color):
+        move, state_hash, shaped_rwd = self.select_action(board, color)
+
+        # Salva lo stato simulato + reward intermedio
         self.states.append((state_hash, shaped_rwd))
 
         return move
 
-    def feed_reward(self, final_reward):
-        for state_hash, shaped_reward in reversed(self.states):
+    def update_trajectory(self, states, final_reward):
+        """Aggiornamento all'indietro dei valori lungo una traiettoria [(hash, reward intermedio), ...]."""
+        for state_hash, shaped_reward in reversed(states):
             if state_hash not in self.states_value:
                 self.states_value[state_hash] = 0
             updated_value = self.states_value[state_hash] + self.lr * (
@@ -85,6 +96,16 @@ class RLPlayer:
             )
             self.states_value[state_hash] = updated_value
             final_reward = updated_value
+            if self.dirty_keys is not None:
+                self.dirty_keys.add(state_hash)
+
+    def feed_reward(self, final_reward):
+        self.update_trajectory(self.states, final_reward)
+
+    def feed_rewards(self, trajectories, final_rewards):
+        """Aggiorna più traiettorie (partite concluse insieme) in un'unica chiamata."""
+        for states, final_reward in zip(trajectories, final_rewards):
+            self.update_trajectory(states, final_reward)
 
     def reset(self):
         self.states = []
@@ -0,0 +1,127 @@
+import os
+import pickle
+
+# Parametri
+COMPACT_EVERY = 20
+BASE_NAME = "base.pkl"
+DELTA_NAME = "deltas.log"
+
+
+def _read_deltas(path):
+    """Legge i record del log; un record finale troncato (crash durante la scrittura) viene ignorato."""
+    records = []
+    if not os.path.exists(path):
+        return records, False
+    with open(path, "rb") as f:
+        while True:
+            try:
+                records.append(pickle.load(f))
+            except EOFError:
+                return records, False
+            except (pickle.UnpicklingError, ValueError, AttributeError, IndexError):
+                print(f"[WARN] Record troncato in '{path}', ignorato")
+                return records, True
+
+
+class DeltaCheckpointer:
+    """
+    Checkpoint incrementali della Q-table di un RLPlayer:
+      - base.pkl    snapshot completo (stesso contenuto di save_policy) con il numero di sequenza
+      - deltas.log  record pickle in append, ognuno con le sole voci modificate dal checkpoint precedente
+    Ogni `compact_every` delta il log viene fuso in una nuova base. Il costo di un checkpoint
+    è proporzionale alle voci cambiate, non alla dimensione della tabella.
+    """
+
+    def __init__(self, directory, compact_every=COMPACT_EVERY):
+        self.directory = directory
+        self.compact_every = compact_every
+        self.base_path = os.path.join(directory, BASE_NAME)
+        self.delta_path = os.path.join(directory, DELTA_NAME)
+        self.seq = 0
+        self.deltas_since_compact = 0
+        self._synced = False
+        os.makedirs(directory, exist_ok=True)
+
+    def attach(self, agent):
+        """
+        Attiva il tracciamento delle chiavi modificate. Se l'agente non è stato caricato da questo
+        checkpoint (load), la sua tabella diventa la nuova base: i delta successivi partono da lì.
+        """
+        if agent.dirty_keys is None:
+            agent.dirty_keys = set()
+        if not self._synced:
+            self.compact(agent)
+
+    @staticmethod
+    def _meta(agent):
+        return {"exp_rate": agent.exp_rate, "lr": agent.lr, "gamma": agent.gamma}
+
+    def checkpoint(self, agent):
+        """Aggiunge al log le voci cambiate dall'ultimo checkpoint; compatta quando serve."""
+        if agent.dirty_keys is None or not self._synced:
+            self.attach(agent)
+        self.seq += 1
+        values = agent.states_value
+        record = {"seq": self.seq, "entries": {key: values[key] for key in agent.dirty_keys}, **self._meta(agent)}
+        with open(self.delta_path, "ab") as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        changed = len(agent.dirty_keys)
+        agent.dirty_keys.clear()
+        self.deltas_since_compact += 1
+
+        if self.deltas_since_compact >= self.compact_every:
+            self.compact(agent)
+        return changed
+
+    def compact(self, agent):
+        """
+        Scrive una nuova base con l'intera tabella e svuota il log.
+        La base porta il numero di sequenza: se il processo muore tra i due passi,
+        il loader ignora i delta già inclusi.
+        """
+        data = {"seq": self.seq, "states_value": agent.states_value, **self._meta(agent)}
+        tmp_path = self.base_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.base_path)
+        open(self.delta_path, "wb").close()
+        if agent.dirty_keys is not None:
+            agent.dirty_keys.clear()
+        self.deltas_since_compact = 0
+        self._synced = True
+
+    def load(self, agent):
+        """Ricostruisce la Q-table dell'agente da base + delta e riprende la sequenza."""
+        data = load_checkpoint(self.directory)
+        agent.states_value = data["states_value"]
+        agent.exp_rate = data.get("exp_rate", agent.exp_rate)
+        agent.lr = data.get("lr", agent.lr)
+        agent.gamma = data.get("gamma", agent.gamma)
+        agent.dirty_keys = set()
+        self.seq = data["seq"]
+        self.deltas_since_compact = data["deltas"]
+        self._synced = True
+        if data["truncated"]:
+            # Nuovi record accodati dopo un record troncato non sarebbero più leggibili
+            self.compact(agent)
+
+
+def load_checkpoint(directory):
+    """Ritorna il dict della policy (come save_policy) ottenuto riapplicando i delta alla base."""
+    with open(os.path.join(directory, BASE_NAME), "rb") as f:
+        data = pickle.load(f)
+    states_value = data["states_value"]
+    applied = 0
+    records, truncated = _read_deltas(os.path.join(directory, DELTA_NAME))
+    for record in records:
+        if record["seq"] <= data["seq"]:
+            continue
+        for key, value in record["entries"].items():
+            states_value[key] = value
+        data.update(exp_rate=record["exp_rate"], lr=record["lr"], gamma=record["gamma"], seq=record["seq"])
+        applied += 1
+    data["deltas"] = applied
+    data["truncated"] = truncated
+    return data
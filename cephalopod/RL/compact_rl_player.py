@@ -0,0 +1,143 @@
+import pickle
+import random
+
+import numpy as np
+
+from cephalopod.RL.base_rl_player import RLPlayer
+from cephalopod.RL.qtable import ArrayQTable, DEFAULT_CAPACITY
+from cephalopod.RL.state_encoding import afterstate_canonical_key, afterstate_key, codes_key, legacy_hash_to_codes, \
+    state_key, symmetric_keys
+from cephalopod.core.packing import board_codes, pack_codes
+
+
+class CompactRLPlayer(RLPlayer):
+    """
+    RLPlayer con chiavi di stato intere (base 13, opzionalmente canoniche rispetto alle 8 simmetrie)
+    e Q-table su array NumPy. Stesso algoritmo di apprendimento, memoria per voce molto più bassa.
+    """
+
+    def __init__(self, name, exp_rate=0.3, lr=0.2, gamma=0.9, debug=False, policy_path=None, reward_shaper=None,
+                 canonical=True, capacity=DEFAULT_CAPACITY):
+        super().__init__(name, exp_rate=exp_rate, lr=lr, gamma=gamma, debug=debug,
+                         policy_path=policy_path, reward_shaper=reward_shaper)
+        self.canonical = canonical
+        self.states_value = ArrayQTable(capacity)
+
+    def get_hash(self, board):
+        return state_key(board, self.canonical)
+
+    def afterstate_hashes(self, board, actions, color):
+        # Una sola lettura della board, poi solo aritmetica intera per ogni azione
+        codes = board_codes(board)
+        if self.canonical:
+            sym_keys = symmetric_keys(codes)
+            return [afterstate_canonical_key(sym_keys, a, color) for a in actions]
+        key = pack_codes(codes)
+        return [afterstate_key(key, a, color) for a in actions]
+
+    def select_actions(self, boards, colors):
+        """
+        Selezione raggruppata per più partite: le chiavi di tutte le azioni greedy
+        vengono lette dalla Q-table con un'unica get_many.
+        """
+        all_actions = [self.legal_actions(board) for board in boards]
+        explore = [random.uniform(0, 1) <= self.exp_rate for _ in boards]
+
+        chosen = [None] * len(boards)
+        greedy_keys, segments = [], []
+        for i, (board, color, actions) in enumerate(zip(boards, colors, all_actions)):
+            if explore[i]:
+                move = random.choice(actions)
+                chosen[i] = (move, self.afterstate_hashes(board, [move], color)[0])
+            else:
+                keys = self.afterstate_hashes(board, actions, color)
+                segments.append((i, len(greedy_keys), keys))
+                greedy_keys.extend(keys)
+
+        if greedy_keys:
+            values = self.states_value.get_many(greedy_keys)
+            for i, start, keys in segments:
+                best = int(np.argmax(values[start:start + len(keys)]))
+                chosen[i] = (all_actions[i][best], keys[best])
+
+        return [(move, state_hash, self.get_intermediate_reward(board, move, color))
+                for board, color, (move, state_hash) in zip(boards, colors, chosen)]
+
+    def save_policy(self, path=None):
+        path = path or self.policy_path
+        with open(path, "wb") as f:
+            pickle.dump({
+                "states_value": self.states_value,
+                "canonical": self.canonical,
+                "exp_rate": self.exp_rate,
+                "lr": self.lr,
+                "gamma": self.gamma
+            }, f)
+
+    def load_policy(self, path=None):
+        path = path or self.policy_path
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        states_value = data.get("states_value", {})
+        if isinstance(states_value, ArrayQTable):
+            self.canonical = data.get("canonical", self.canonical)
+            self.states_value = states_value
+        else:
+            # Policy di RLPlayer con chiavi stringa: conversione al volo
+            self.states_value, _ = migrate_states_value(states_value, self.canonical)
+        self.exp_rate = data.get("exp_rate", self.exp_rate)
+        self.lr = data.get("lr", self.lr)
+        self.gamma = data.get("gamma", self.gamma)
+
+
+def migrate_states_value(states_value, canonical=True):
+    """
+    Converte una Q-table {stringa get_hash: valore} in una ArrayQTable.
+    Con `canonical=True` più stringhe possono finire sulla stessa chiave: i valori vengono mediati.
+    Ritorna (tabella, statistiche).
+    """
+    sums, counts = {}, {}
+    skipped = 0
+    for state_hash, value in states_value.items():
+        codes = legacy_hash_to_codes(state_hash)
+        if codes is None:
+            skipped += 1
+            continue
+        key = codes_key(codes, canonical)
+        sums[key] = sums.get(key, 0.0) + value
+        counts[key] = counts.get(key, 0) + 1
+
+    table = ArrayQTable(int(len(sums) / 0.7) + 1)
+    for key, total in sums.items():
+        table[key] = total / counts[key]
+
+    stats = {"entries": len(states_value), "migrated": len(table), "skipped": skipped,
+             "merged": len(states_value) - skipped - len(table)}
+    return table, stats
+
+
+def migrate_policy(src_path, dst_path, canonical=True):
+    """Converte un file policy di RLPlayer nel formato di CompactRLPlayer."""
+    with open(src_path, "rb") as f:
+        data = pickle.load(f)
+    # I file più vecchi sono direttamente il dict della Q-table
+    if "states_value" not in data:
+        data = {"states_value": data}
+
+    table, stats = migrate_states_value(data["states_value"], canonical)
+    migrated = dict(data, states_value=table, canonical=canonical)
+    with open(dst_path, "wb") as f:
+        pickle.dump(migrated, f)
+
+    print(f"[✓] Policy migrata in '{dst_path}': {stats['migrated']} stati "
+          f"({stats['merged']} uniti per simmetria, {stats['skipped']} chiavi non riconosciute)")
+    return stats
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3:
+        print("Uso: python -m cephalopod.RL.compact_rl_player <policy.pkl> <policy_compact.pkl>")
+    else:
+        migrate_policy(sys.argv[1], sys.argv[2])
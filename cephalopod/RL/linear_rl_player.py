@@ -0,0 +1,190 @@
+import pickle
+import random
+from itertools import combinations
+
+import numpy as np
+
+from cephalopod.RL.base_rl_player import RLPlayer
+from cephalopod.core.board import BOARD_SIZE
+from cephalopod.core.packing import board_codes
+
+_CELLS = BOARD_SIZE * BOARD_SIZE
+_PAD = _CELLS  # colonna fittizia: "occupata", faccia 0, usata per completare i sottoinsiemi
+
+
+def _neighbor_subsets():
+    """Per ogni cella, i sottoinsiemi di almeno 2 vicini ortogonali (al massimo 11), paddati a 4 elementi."""
+    idx = np.full((_CELLS, 11, 4), _PAD, dtype=np.intp)
+    size = np.zeros((_CELLS, 11), dtype=np.int64)
+    for cell in range(_CELLS):
+        r, c = divmod(cell, BOARD_SIZE)
+        neighbors = [(r + dr) * BOARD_SIZE + (c + dc) for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                     if 0 <= r + dr < BOARD_SIZE and 0 <= c + dc < BOARD_SIZE]
+        k = 0
+        for n in range(2, len(neighbors) + 1):
+            for combo in combinations(neighbors, n):
+                idx[cell, k, :n] = combo
+                size[cell, k] = n
+                k += 1
+    # Incidenza (cella, sottoinsieme) -> dadi coinvolti, per contare i dadi a rischio con un prodotto matriciale
+    members = np.zeros((_CELLS * 11, _CELLS + 1), dtype=np.float32)
+    flat = idx.reshape(_CELLS * 11, 4)
+    for row, cells in enumerate(flat):
+        members[row, cells] = 1
+    return idx, size, members[:, :_CELLS]
+
+
+SUBSET_IDX, SUBSET_SIZE, SUBSET_MEMBERS = _neighbor_subsets()
+
+FEATURE_NAMES = (
+    ["bias", "my_dice", "opp_dice", "empty"]
+    + [f"my_face_{f}" for f in range(1, 7)]
+    + [f"opp_face_{f}" for f in range(1, 7)]
+    + ["capture_cells", "six_capture_cells", "my_dice_at_risk", "opp_dice_at_risk", "my_sixes_at_risk"]
+    + [f"my_cell_{i}" for i in range(_CELLS)]
+    + [f"opp_cell_{i}" for i in range(_CELLS)]
+)
+NUM_FEATURES = len(FEATURE_NAMES)
+
+
+def board_features(codes):
+    """
+    Feature di un batch di board (B, 25) in codici relativi (1..6 dadi propri, 7..12 avversari)
+    viste dal giocatore che ha appena mosso: tocca all'avversario. Ritorna un array float32 (B, NUM_FEATURES).
+    """
+    codes = np.asarray(codes).reshape(-1, _CELLS)
+    batch = codes.shape[0]
+    mine = (codes > 0) & (codes <= 6)
+    theirs = codes > 6
+    empty = codes == 0
+    faces = np.where(theirs, codes - 6, codes)
+
+    # Catture disponibili alla prossima mossa: sottoinsiemi di vicini tutti occupati con somma <= 6
+    padded_faces = np.concatenate([faces, np.zeros((batch, 1), dtype=faces.dtype)], axis=1)
+    padded_occ = np.concatenate([~empty, np.ones((batch, 1), dtype=bool)], axis=1)
+    sums = padded_faces[:, SUBSET_IDX].sum(axis=-1)
+    valid = padded_occ[:, SUBSET_IDX].all(axis=-1) & (SUBSET_SIZE > 0) & empty[:, :, None] & (sums <= 6)
+
+    # Come choose_capturing_subset: il sottoinsieme più grande, a parità quello con somma maggiore
+    priority = np.where(valid, SUBSET_SIZE * 8 + sums, -1)
+    best = priority.argmax(axis=-1)
+    has_capture = valid.any(axis=-1)
+    chosen_sum = np.take_along_axis(sums, best[..., None], axis=-1)[..., 0]
+    six_capture = has_capture & (chosen_sum == 6)
+
+    at_risk = (valid.reshape(batch, -1).astype(np.float32) @ SUBSET_MEMBERS) > 0
+
+    features = np.empty((batch, NUM_FEATURES), dtype=np.float32)
+    features[:, 0] = 1.0
+    features[:, 1] = mine.sum(axis=1) / _CELLS
+    features[:, 2] = theirs.sum(axis=1) / _CELLS
+    features[:, 3] = empty.sum(axis=1) / _CELLS
+    for f in range(1, 7):
+        features[:, 3 + f] = (mine & (faces == f)).sum(axis=1) / 5
+        features[:, 9 + f] = (theirs & (faces == f)).sum(axis=1) / 5
+    features[:, 16] = has_capture.sum(axis=1) / 5
+    features[:, 17] = six_capture.sum(axis=1) / 5
+    features[:, 18] = (at_risk & mine).sum(axis=1) / 5
+    features[:, 19] = (at_risk & theirs).sum(axis=1) / 5
+    features[:, 20] = (at_risk & mine & (faces == 6)).sum(axis=1) / 5
+    features[:, 21:21 + _CELLS] = mine
+    features[:, 21 + _CELLS:] = theirs
+    return features
+
+
+def afterstate_codes(board, actions, color):
+    """Codici relativi a `color` delle board dopo ciascuna azione: array (A, 25)."""
+    codes = np.array(board_codes(board), dtype=np.int64)
+    if color == "W":
+        # Codici relativi: i dadi di chi muove valgono 1..6, quelli avversari 7..12
+        codes = np.where(codes > 6, codes - 6, np.where(codes > 0, codes + 6, 0))
+    after = np.repeat(codes[None, :], len(actions), axis=0)
+    for i, (r, c, top_face, captured) in enumerate(actions):
+        for (rr, cc) in captured:
+            after[i, rr * BOARD_SIZE + cc] = 0
+        after[i, r * BOARD_SIZE + c] = top_face
+    return after
+
+
+class LinearRLPlayer(RLPlayer):
+    """
+    RLPlayer con funzione valore lineare sulle feature di board_features al posto della Q-table.
+    Stessa interfaccia (choose_move, feed_reward, reset, save_policy, load_policy): la memoria
+    è costante e il valore si generalizza agli stati mai visti.
+    L'aggiornamento è un LMS normalizzato in batch verso gli stessi target all'indietro della versione tabellare.
+    """
+
+    def __init__(self, name, exp_rate=0.3, lr=0.2, gamma=0.9, debug=False, policy_path=None, reward_shaper=None):
+        super().__init__(name, exp_rate=exp_rate, lr=lr, gamma=gamma, debug=debug,
+                         policy_path=policy_path, reward_shaper=reward_shaper)
+        self.states_value = None
+        self.weights = np.zeros(NUM_FEATURES, dtype=np.float64)
+
+    def afterstate_features(self, board, actions, color):
+        return board_features(afterstate_codes(board, actions, color))
+
+    def value(self, features):
+        return features @ self.weights
+
+    def select_action(self, board, color):
+        actions = self.legal_actions(board)
+
+        if random.uniform(0, 1) <= self.exp_rate:
+            move = random.choice(actions)
+            features = self.afterstate_features(board, [move], color)[0]
+        else:
+            all_features = self.afterstate_features(board, actions, color)
+            best = int(np.argmax(self.value(all_features)))
+            move, features = actions[best], all_features[best]
+
+        shaped_rwd = self.get_intermediate_reward(board, move, color)
+        return move, features, shaped_rwd
+
+    def _targets(self, states, final_reward):
+        """Target all'indietro come in RLPlayer.update_trajectory, usando le predizioni correnti."""
+        features = np.stack([f for f, _ in states])
+        rewards = np.array([r for _, r in states], dtype=np.float64)
+        values = self.value(features)
+        targets = np.empty(len(states))
+        next_value = final_reward
+        for t in range(len(states) - 1, -1, -1):
+            targets[t] = self.gamma * next_value + rewards[t]
+            next_value = values[t] + self.lr * (targets[t] - values[t])
+        return features, targets
+
+    def _lms_update(self, features, targets):
+        errors = targets - self.value(features)
+        norms = np.einsum("ij,ij->i", features, features) + 1e-8
+        self.weights += self.lr * (features.T @ (errors / norms)) / len(targets)
+
+    def update_trajectory(self, states, final_reward):
+        if states:
+            self._lms_update(*self._targets(states, final_reward))
+
+    def feed_rewards(self, trajectories, final_rewards):
+        """Un solo aggiornamento per tutte le traiettorie concluse insieme."""
+        pairs = [self._targets(states, reward) for states, reward in zip(trajectories, final_rewards) if states]
+        if pairs:
+            self._lms_update(np.concatenate([f for f, _ in pairs]), np.concatenate([t for _, t in pairs]))
+
+    def save_policy(self, path=None):
+        path = path or self.policy_path
+        with open(path, "wb") as f:
+            pickle.dump({
+                "weights": self.weights,
+                "features": FEATURE_NAMES,
+                "exp_rate": self.exp_rate,
+                "lr": self.lr,
+                "gamma": self.gamma
+            }, f)
+
+    def load_policy(self, path=None):
+        path = path or self.policy_path
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("features") != FEATURE_NAMES:
+            raise ValueError(f"'{path}' usa un insieme di feature diverso da questa versione di LinearRLPlayer")
+        self.weights = np.asarray(data["weights"], dtype=np.float64)
+        self.exp_rate = data.get("exp_rate", self.exp_rate)
+        self.lr = data.get("lr", self.lr)
+        self.gamma = data.get("gamma", self.gamma)
@@ -0,0 +1,174 @@
+import numpy as np
+
+from cephalopod.RL.state_encoding import KEY_BITS, KEY_MASK, join_key, split_key
+
+# Ogni voce occupa 20 byte: chiave a 93 bit divisa in (hi, lo) e valore float32.
+# Le celle libere hanno hi = EMPTY_HI (una chiave reale ha hi < 2^29).
+TABLE_DTYPE = np.dtype([("hi", "<u8"), ("lo", "<u8"), ("value", "<f4")])
+EMPTY_HI = (1 << 64) - 1
+DEFAULT_CAPACITY = 1 << 16
+MAX_LOAD = 0.7
+
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _mix(hi, lo):
+    h = (lo ^ (hi * _GOLDEN)) & KEY_MASK
+    h ^= h >> 31
+    h = (h * _GOLDEN) & KEY_MASK
+    return h ^ (h >> 29)
+
+
+def _mix_array(hi, lo):
+    """Come _mix, su array uint64 (la moltiplicazione modulo 2^64 equivale alla maschera)."""
+    golden = np.uint64(_GOLDEN)
+    h = lo ^ (hi * golden)
+    h ^= h >> np.uint64(31)
+    h *= golden
+    return h ^ (h >> np.uint64(29))
+
+
+class ArrayQTable:
+    """
+    Q-table a indirizzamento aperto (probing lineare) su un unico array NumPy strutturato.
+    Espone la stessa interfaccia del dict usato da RLPlayer (get, [], in, len, items),
+    ma con chiavi intere (vedi RL/state_encoding.py) e circa 20 byte per voce / MAX_LOAD.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, max_load=MAX_LOAD):
+        capacity = 1 << max(4, (int(capacity) - 1).bit_length())
+        self.max_load = max_load
+        self._set_table(self._empty_table(capacity), 0)
+
+    @staticmethod
+    def _empty_table(capacity):
+        table = np.zeros(capacity, dtype=TABLE_DTYPE)
+        table["hi"] = EMPTY_HI
+        return table
+
+    def _set_table(self, table, count):
+        self._table = table
+        self._hi = table["hi"]
+        self._lo = table["lo"]
+        self._values = table["value"]
+        self._mask = len(table) - 1
+        self._count = count
+
+    def _find(self, key):
+        """Ritorna (indice, trovato): lo slot della chiave oppure il primo slot libero."""
+        hi, lo = split_key(key)
+        i = _mix(hi, lo) & self._mask
+        hi_arr, lo_arr = self._hi, self._lo
+        while True:
+            cur = int(hi_arr[i])
+            if cur == EMPTY_HI:
+                return i, False
+            if cur == hi and int(lo_arr[i]) == lo:
+                return i, True
+            i = (i + 1) & self._mask
+
+    def _grow(self):
+        old_hi, old_lo, old_values = self._hi, self._lo, self._values
+        used = np.nonzero(old_hi != EMPTY_HI)[0]
+        self._set_table(self._empty_table(2 * len(self._table)), 0)
+        for i in used:
+            self[join_key(old_hi[i], old_lo[i])] = old_values[i]
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return self._find(key)[1]
+
+    def __getitem__(self, key):
+        i, found = self._find(key)
+        if not found:
+            raise KeyError(key)
+        return float(self._values[i])
+
+    def get(self, key, default=None):
+        i, found = self._find(key)
+        return float(self._values[i]) if found else default
+
+    def get_many(self, keys, default=0.0):
+        """Legge più chiavi con un probing vettorizzato; ritorna un array float64."""
+        n = len(keys)
+        hi = np.fromiter((key >> KEY_BITS for key in keys), dtype=np.uint64, count=n)
+        lo = np.fromiter((key & KEY_MASK for key in keys), dtype=np.uint64, count=n)
+        slots = (_mix_array(hi, lo) & np.uint64(self._mask)).astype(np.intp)
+        out = np.full(n, default, dtype=np.float64)
+
+        pending = np.arange(n)
+        while pending.size:
+            idx = slots[pending]
+            cur_hi = self._hi[idx]
+            found = (cur_hi == hi[pending]) & (self._lo[idx] == lo[pending])
+            out[pending[found]] = self._values[idx[found]]
+            pending = pending[~found & (cur_hi != EMPTY_HI)]
+            slots[pending] = (slots[pending] + 1) & self._mask
+        return out
+
+    def __setitem__(self, key, value):
+        i, found = self._find(key)
+        if not found:
+            if (self._count + 1) > self.max_load * len(self._table):
+                self._grow()
+                i, _ = self._find(key)
+            hi, lo = split_key(key)
+            self._hi[i] = hi
+            self._lo[i] = lo
+            self._count += 1
+        self._values[i] = value
+
+    def update(self, other):
+        for key, value in other.items():
+            self[key] = value
+
+    def _used(self):
+        return np.nonzero(self._hi != EMPTY_HI)[0]
+
+    def keys(self):
+        for i in self._used():
+            yield join_key(self._hi[i], self._lo[i])
+
+    __iter__ = keys
+
+    def values(self):
+        return self._values[self._used()].astype(np.float64)
+
+    def items(self):
+        for i in self._used():
+            yield join_key(self._hi[i], self._lo[i]), float(self._values[i])
+
+    @property
+    def capacity(self):
+        return len(self._table)
+
+    @property
+    def nbytes(self):
+        return self._table.nbytes
+
+    def save(self, path):
+        """Salva la tabella come singolo file .npy (ricaricabile anche in memory-map)."""
+        np.save(path, self._table)
+
+    @classmethod
+    def load(cls, path, mmap=False, max_load=MAX_LOAD):
+        """
+        Carica una tabella salvata con save(). Con `mmap=True` il file è mappato in lettura/scrittura:
+        gli aggiornamenti finiscono sul disco finché la tabella non deve crescere (poi diventa in RAM).
+        """
+        table = np.load(path, mmap_mode="r+" if mmap else None)
+        if table.dtype != TABLE_DTYPE:
+            raise ValueError(f"'{path}' non contiene una ArrayQTable")
+        qtable = cls.__new__(cls)
+        qtable.max_load = max_load
+        qtable._set_table(table, int(np.count_nonzero(table["hi"] != EMPTY_HI)))
+        return qtable
+
+    def __getstate__(self):
+        return {"table": np.asarray(self._table), "count": self._count, "max_load": self.max_load}
+
+    def __setstate__(self, state):
+        self.max_load = state["max_load"]
+        self._set_table(state["table"], state["count"])
@@ -1,23 +1,20 @@
 import random
 from abc import ABC, abstractmethod
 from cephalopod.core.mechanics import get_opponent, find_capturing_subsets, choose_capturing_subset
-from cephalopod.core.board import Die
-import copy
+from cephalopod.RL.afterstate import afterstate_view
 
-from cephalopod.strategies import AggressiveStrategy
-from cephalopod.strategies.smart_lookahead5 import SmartLookaheadStrategy5
-from cephalopod.strategies.smart_position import SmartPositionalLookaheadStrategy
-from strategies import NaiveStrategy
+from cephalopod.strategies.registry import STRATEGY_REGISTRY
 
 
 class RewardShaper(ABC):
     @abstractmethod
-    def compute(self, board, move, my_color) -> float:
+    def compute(self, board, move, my_color, after=None) -> float:
+        """`after` è la board dopo la mossa (vedi RL/afterstate.py), condivisa da chi la ha già calcolata."""
         pass
 
 
 class BasicShaper(RewardShaper):
-    def compute(self, board, move, my_color):
+    def compute(self, board, move, my_color, after=None):
         r, c, top_face, captured = move
         reward = 0
         if top_face == 6:
@@ -29,14 +26,10 @@ class BasicShaper(RewardShaper):
 
 
 class RiskAwareShaper(RewardShaper):
-    def compute(self, board, move, my_color):
-        r, c, top_face, captured = move
+    def compute(self, board, move, my_color, after=None):
         reward = BasicShaper().compute(board, move, my_color)
 
-        board_copy = copy.deepcopy(board)
-        for (rr, cc) in captured:
-            board_copy.grid[rr][cc] = None
-        board_copy.place_die(r, c, Die(my_color, top_face))
+        board_copy = after or afterstate_view(board, move, my_color)
 
         opponent = get_opponent(my_color)
         for (rr, cc) in board_copy.get_empty_cells():
@@ -52,19 +45,10 @@ class RiskAwareShaper(RewardShaper):
 # ... [import e RewardShaper, BasicShaper, RiskAwareShaper invariati] ...
 
 class AggressiveBoardShaper:
-    def compute(self, board, move, my_color, opponent_color, winner):
+    def compute(self, board, move, my_color, opponent_color, winner, after=None):
         reward = 0
 
-        from copy import deepcopy
-        from cephalopod.core.board import Die
-        from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset
-
-        board_copy = deepcopy(board)
-        r, c, top_face, captured = move
-
-        for (rr, cc) in captured:
-            board_copy.grid[rr][cc] = None
-        board_copy.place_die(r, c, Die(my_color, top_face))
+        board_copy = after or afterstate_view(board, move, my_color)
 
         # ✅ Usa top_face
         for row in board_copy.grid:
@@ -104,22 +88,15 @@ class AggressiveBoardShaper:
 
 
 class AggressiveBoardShaper2:
-    def compute(self, board, move, my_color, opponent_color, winner):
+    def compute(self, board, move, my_color, opponent_color, winner, after=None):
         reward = 0
 
-        from copy import deepcopy
-        from cephalopod.core.board import Die
-        from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset
-
         r, c, top_face, captured = move
-        board_copy = deepcopy(board)
-
         for (rr, cc) in captured:
             if board.grid[rr][cc] and board.grid[rr][cc].top_face == 6:
                 reward += 10
-            board_copy.grid[rr][cc] = None
 
-        board_copy.place_die(r, c, Die(my_color, top_face))
+        board_copy = after or afterstate_view(board, move, my_color)
 
         for row in board_copy.grid:
             for cell in row:
@@ -174,20 +151,32 @@ class AdvancedBoardShaper(RewardShaper):
                * La vittoria (o penalizza la sconfitta).
                * La differenza nel numero di dadi.
                * Il numero di 1 "safe" (cioè che non sono stati catturati, perché ancora presenti sul board).
+        I pesi dei singoli termini sono in `weights` (default: DEFAULT_WEIGHTS), così possono essere tunati.
     """
 
-    def compute(self, board, move, my_color, opponent_color=None, winner=None):
+    DEFAULT_WEIGHTS = {
+        "five_penalty": 1.1,
+        "six_threat": 120,
+        "six_lead": 5,
+        "six_deficit": 20,
+        "win": 70,
+        "dice_diff": 1,
+        "safe_one": 10,
+    }
+
+    def __init__(self, weights=None):
+        self.weights = dict(self.DEFAULT_WEIGHTS)
+        self.weights.update(weights or {})
+
+    def compute(self, board, move, my_color, opponent_color=None, winner=None, after=None):
         if not opponent_color:
             opponent_color = get_opponent(my_color)
+        w = self.weights
 
-        r, c, top_face, captured = move
         reward = 0.0
 
         # Simula la mossa sul board
-        board_copy = copy.deepcopy(board)
-        for (rr, cc) in captured:
-            board_copy.grid[rr][cc] = None
-        board_copy.place_die(r, c, Die(my_color, top_face))
+        board_copy = after or afterstate_view(board, move, my_color)
 
         # Penalizza se la cattura produce un 5 (dato debole)
         new_fives = 0
@@ -195,7 +184,7 @@ class AdvancedBoardShaper(RewardShaper):
             for cell in row:
                 if cell and cell.color == my_color and cell.top_face == 5:
                     new_fives += 1
-        reward -= 1.1 * new_fives  # Penalizzazione proporzionale
+        reward -= w["five_penalty"] * new_fives  # Penalizzazione proporzionale
 
         # Penalità se la mossa lascia l'avversario una cattura immediata con somma 6
         for (rr, cc) in board_copy.get_empty_cells():
@@ -203,7 +192,7 @@ class AdvancedBoardShaper(RewardShaper):
             if options:
                 _, sum_pips = choose_capturing_subset(options)
                 if sum_pips == 6:
-                    reward -= 120
+                    reward -= w["six_threat"]
                     break
 
         # Bilancio dei 6 sul board (importanza strategica del controllo dei 6)
@@ -218,26 +207,26 @@ class AdvancedBoardShaper(RewardShaper):
                         opp_6_count += 1
         diff_6 = my_6_count - opp_6_count
         if diff_6 > 0:
-            reward += 5 * diff_6
+            reward += w["six_lead"] * diff_6
         elif diff_6 < 0:
-            reward -= 20 * abs(diff_6)
+            reward -= w["six_deficit"] * abs(diff_6)
 
         # Fase finale: se la partita è terminata
         if winner:
             if winner == my_color:
-                reward += 70
+                reward += w["win"]
             else:
-                reward -= 70
+                reward -= w["win"]
 
             my_dice = sum(1 for row in board.grid for cell in row if cell and cell.color == my_color)
             opp_dice = sum(1 for row in board.grid for cell in row if cell and cell.color == opponent_color)
-            reward += (my_dice - opp_dice)
+            reward += w["dice_diff"] * (my_dice - opp_dice)
 
             safe_ones = sum(
                 1 for row in board.grid for cell in row
                 if cell and cell.color == my_color and cell.top_face == 1
             )
-            reward += 10 * safe_ones
+            reward += w["safe_one"] * safe_ones
 
         return reward
 
@@ -245,10 +234,10 @@ class AdvancedBoardShaper(RewardShaper):
 class OpponentManager:
     def __init__(self):
         self.opponents = [
-            ("naive", NaiveStrategy(), 0.4),
-            ("smartpos", SmartPositionalLookaheadStrategy(), 0.3),
-            ("smartlook5", SmartLookaheadStrategy5(), 0.1),
-            ("aggressive", AggressiveStrategy(), 0.2)  # incluso ma disattivato inizialmente
+            ("naive", STRATEGY_REGISTRY["Naive"](), 0.4),
+            ("smartpos", STRATEGY_REGISTRY["SmartPos"](), 0.3),
+            ("smartlook5", STRATEGY_REGISTRY["Goat5"](), 0.1),
+            ("aggressive", STRATEGY_REGISTRY["Aggressive"](), 0.2)  # incluso ma disattivato inizialmente
         ]
         self.last_opponent_name = ""
 
@@ -0,0 +1,113 @@
+import ast
+
+from cephalopod.core.board import BOARD_SIZE
+from cephalopod.core.packing import COLOR_OFFSET, NUM_CODES, board_codes, canonical_key, pack_codes
+from cephalopod.core.symmetry import DEST, GATHER, NUM_SYMMETRIES
+
+# Chiave di stato compatta: i 25 codici di cella (0 vuota, 1..6 dado B, 7..12 dado W)
+# impacchettati in un intero in base 13. 13^25 < 2^93, quindi la chiave sta in due parole a 64 bit.
+KEY_BITS = 64
+KEY_MASK = (1 << KEY_BITS) - 1
+
+
+def state_key(board, canonical=False):
+    """Chiave intera della board; con `canonical=True` è la minima tra le 8 simmetrie."""
+    codes = board_codes(board)
+    if canonical:
+        return canonical_key(codes)[0]
+    return pack_codes(codes)
+
+
+def codes_key(codes, canonical=False):
+    if canonical:
+        return canonical_key(codes)[0]
+    return pack_codes(codes)
+
+
+def split_key(key):
+    """Divide la chiave in (hi, lo) a 64 bit, il formato usato da ArrayQTable."""
+    return key >> KEY_BITS, key & KEY_MASK
+
+
+def join_key(hi, lo):
+    return (int(hi) << KEY_BITS) | int(lo)
+
+
+def legacy_hash_to_codes(state_hash):
+    """
+    Converte una chiave stringa di RLPlayer.get_hash (str della griglia di "(colore,faccia)")
+    nei 25 codici di cella. Ritorna None se la stringa non è in quel formato.
+    """
+    try:
+        grid = ast.literal_eval(state_hash)
+    except (ValueError, SyntaxError):
+        return None
+    if not isinstance(grid, list) or len(grid) != 5:
+        return None
+
+    codes = []
+    for row in grid:
+        if not isinstance(row, list) or len(row) != 5:
+            return None
+        for cell in row:
+            if not cell:
+                codes.append(0)
+                continue
+            try:
+                color, face = cell.strip("() ").split(",")
+                codes.append(int(face) + COLOR_OFFSET[color.strip()])
+            except (ValueError, KeyError):
+                return None
+    return tuple(codes)
+
+
+# Potenze di 13 per posizione di cella e, per ogni simmetria k, la posizione in cui finisce la cella i
+POW13 = [NUM_CODES ** i for i in range(BOARD_SIZE * BOARD_SIZE)]
+_SYM_POW13 = [[POW13[DEST[k][i]] for i in range(BOARD_SIZE * BOARD_SIZE)] for k in range(NUM_SYMMETRIES)]
+
+
+def symmetric_keys(codes):
+    """Le 8 chiavi della board, una per simmetria (la canonica è la minima)."""
+    return [pack_codes([codes[i] for i in GATHER[k]]) for k in range(NUM_SYMMETRIES)]
+
+
+def cell_code(key, index):
+    """Codice della cella `index` letto direttamente dalla chiave."""
+    return key // POW13[index] % NUM_CODES
+
+
+def afterstate_delta(key, move, color, size=BOARD_SIZE):
+    """
+    Ritorna la lista [(indice cella, variazione del codice)] della mossa:
+    il dado piazzato aggiunge il suo codice, ogni dado catturato sottrae il proprio.
+    """
+    r, c, top_face, captured = move
+    delta = [(r * size + c, top_face + COLOR_OFFSET[color])]
+    for (rr, cc) in captured:
+        index = rr * size + cc
+        delta.append((index, -cell_code(key, index)))
+    return delta
+
+
+def afterstate_key(key, move, color):
+    """Chiave (non canonica) della board dopo la mossa, calcolata solo con operazioni intere."""
+    for index, diff in afterstate_delta(key, move, color):
+        key += diff * POW13[index]
+    return key
+
+
+def afterstate_canonical_key(sym_keys, move, color):
+    """
+    Chiave canonica della board dopo la mossa, a partire dalle 8 chiavi simmetriche
+    della board corrente (vedi symmetric_keys): ogni chiave riceve la stessa variazione
+    nella posizione trasformata e si prende il minimo.
+    """
+    delta = afterstate_delta(sym_keys[0], move, color)
+    best = None
+    for k, key in enumerate(sym_keys):
+        pows = _SYM_POW13[k]
+        for index, diff in delta:
+            key += diff * pows[index]
+        if best is None or key < best:
+            best = key
+    return best
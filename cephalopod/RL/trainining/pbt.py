@@ -0,0 +1,228 @@
+import csv
+import json
+import multiprocessing as mp
+import os
+import pickle
+import random
+import shutil
+import time
+
+from cephalopod.RL.trainining.sweep import CPU_BUDGET, THREADS_PER_RUN, _limit_threads, _opponents, _save_state
+
+# Parametri
+POPULATION_SIZE = 8
+ROUNDS = 20
+EPISODES_PER_ROUND = 500
+EXPLOIT_FRACTION = 0.25
+PERTURB_FACTORS = (0.8, 1.2)
+PEER_OPPONENT_SHARE = 0.5
+ANCHOR_OPPONENTS = ["smartpos"]
+STATE_FILE = "pbt_state.json"
+
+# Intervalli ammessi per gli iperparametri perturbati
+BOUNDS = {
+    "lr": (0.01, 0.9),
+    "gamma": (0.5, 0.999),
+    "exp_rate": (0.02, 0.5),
+}
+
+
+def initial_member(index, rng):
+    from cephalopod.RL.reward_shaping.rewardshaping import AdvancedBoardShaper
+    return {
+        "name": f"PBT_{index}",
+        "lr": round(rng.uniform(0.05, 0.4), 4),
+        "gamma": round(rng.uniform(0.8, 0.99), 4),
+        "exp_rate": round(rng.uniform(0.1, 0.3), 4),
+        "shaper_weights": dict(AdvancedBoardShaper.DEFAULT_WEIGHTS),
+        "score": None,
+        "history": [],
+    }
+
+
+class FrozenRLOpponent:
+    """Snapshot greedy di un membro della popolazione: gioca senza esplorare e senza registrare stati."""
+
+    def __init__(self, name, policy_path):
+        from cephalopod.RL.base_rl_player import RLPlayer
+        self.name = name
+        self.player = RLPlayer(name=name, exp_rate=0.0, policy_path=policy_path)
+        self.player.load_policy()
+
+    def choose_move(self, board, color):
+        actions = self.player.legal_actions(board)
+        hashes = self.player.afterstate_hashes(board, actions, color)
+        values = self.player.states_value
+        best = max(range(len(actions)), key=lambda i: values.get(hashes[i], 0))
+        return actions[best]
+
+
+class PopulationOpponents:
+    """
+    Avversari per train_rl_agent: con probabilità PEER_OPPONENT_SHARE un altro membro della popolazione
+    (snapshot di inizio round), altrimenti una strategia fissa di riferimento.
+    """
+
+    def __init__(self, peers, anchors, peer_share=PEER_OPPONENT_SHARE):
+        self.peers = peers
+        self.anchors = anchors
+        self.peer_share = peer_share if peers and anchors else (1.0 if peers else 0.0)
+        self.last_opponent_name = ""
+
+    def scale_difficulty(self, episode):
+        pass
+
+    def choose_opponent(self):
+        pool = self.peers if random.random() < self.peer_share else self.anchors
+        name, strategy = random.choice(pool)
+        self.last_opponent_name = name
+        return strategy
+
+
+def policy_path(save_dir, name):
+    return os.path.join(save_dir, f"policy_{name}.pkl")
+
+
+def snapshot_path(save_dir, name):
+    return os.path.join(save_dir, "snapshots", f"policy_{name}.pkl")
+
+
+def train_member(member, peer_names, save_dir, log_dir, episodes, anchors, seed):
+    """Allena un membro per un round. Eseguita nei processi worker; ritorna (nome, win rate del round)."""
+    from cephalopod.RL.base_rl_player import RLPlayer
+    from cephalopod.RL.reward_shaping.rewardshaping import AdvancedBoardShaper
+    from cephalopod.RL.trainining.training import train_rl_agent
+
+    random.seed(seed)
+    name = member["name"]
+    rl = RLPlayer(
+        name=name,
+        lr=member["lr"],
+        gamma=member["gamma"],
+        exp_rate=member["exp_rate"],
+        reward_shaper=AdvancedBoardShaper(member["shaper_weights"]),
+        policy_path=policy_path(save_dir, name),
+    )
+    if os.path.exists(rl.policy_path):
+        rl.load_policy()
+        # Gli iperparametri li decide il PBT, non il file
+        rl.lr, rl.gamma, rl.exp_rate = member["lr"], member["gamma"], member["exp_rate"]
+
+    peers = [(peer, FrozenRLOpponent(peer, snapshot_path(save_dir, peer)))
+             for peer in peer_names if os.path.exists(snapshot_path(save_dir, peer))]
+    fixed = [(anchor, _opponents()[anchor]()) for anchor in anchors]
+
+    log_path = os.path.join(log_dir, f"{name}.csv")
+    train_rl_agent(
+        rl_agent=rl,
+        opponent_agent=PopulationOpponents(peers, fixed),
+        episodes=episodes,
+        save_every=episodes + 1,
+        save_dir=save_dir,
+        log_path=log_path,
+        decay_exploration=False,
+        verbose=False,
+        use_fixed_save=True,
+        plot=False,
+    )
+
+    with open(log_path, newline="") as f:
+        wins = [int(row["Win"]) for row in csv.DictReader(f)][-episodes:]
+    return name, sum(wins) / len(wins)
+
+
+def _train_member_star(args):
+    return train_member(*args)
+
+
+def _init_worker(threads):
+    _limit_threads(threads)
+
+
+def _clip(key, value):
+    low, high = BOUNDS[key]
+    return round(min(max(value, low), high), 4)
+
+
+def exploit_and_explore(population, save_dir, rng, fraction=EXPLOIT_FRACTION, factors=PERTURB_FACTORS):
+    """
+    Truncation selection: i membri nel quantile peggiore copiano Q-table e iperparametri
+    da uno del quantile migliore (exploit), poi perturbano lr, gamma, exp_rate e pesi dello shaper (explore).
+    """
+    ranked = sorted(population, key=lambda m: m["score"], reverse=True)
+    cutoff = max(1, int(len(ranked) * fraction))
+    top, bottom = ranked[:cutoff], ranked[-cutoff:]
+    events = []
+    for member in bottom:
+        if member in top:
+            continue
+        source = rng.choice(top)
+        shutil.copyfile(policy_path(save_dir, source["name"]), policy_path(save_dir, member["name"]))
+        for key in BOUNDS:
+            member[key] = _clip(key, source[key] * rng.choice(factors))
+        member["shaper_weights"] = {k: round(v * rng.choice(factors), 4) for k, v in source["shaper_weights"].items()}
+        events.append((member["name"], source["name"]))
+    return events
+
+
+def run_pbt(population_size=POPULATION_SIZE, rounds=ROUNDS, episodes_per_round=EPISODES_PER_ROUND,
+            save_dir="policies/pbt", log_dir="logs/pbt", anchors=None, cpu_budget=CPU_BUDGET,
+            threads_per_run=THREADS_PER_RUN, seed=0):
+    """
+    Population-based training: ogni round allena tutti i membri in parallelo (avversari: gli snapshot
+    degli altri membri e le strategie `anchors`), poi applica exploit/explore.
+    Lo stato della popolazione è salvato a fine round in log_dir/pbt_state.json e il run riprende da lì.
+    """
+    anchors = ANCHOR_OPPONENTS if anchors is None else anchors
+    os.makedirs(os.path.join(save_dir, "snapshots"), exist_ok=True)
+    os.makedirs(log_dir, exist_ok=True)
+    state_path = os.path.join(log_dir, STATE_FILE)
+
+    rng = random.Random(seed)
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            state = json.load(f)
+        rng.setstate(pickle.loads(bytes.fromhex(state["rng"])))
+        print(f"[LOAD] Popolazione ripresa dal round {state['round']}")
+    else:
+        state = {"round": 0, "population": [initial_member(i, rng) for i in range(population_size)]}
+    population = state["population"]
+    names = [m["name"] for m in population]
+
+    workers = max(1, min(len(population), cpu_budget // threads_per_run))
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(threads_per_run,)) as pool:
+        for round_id in range(state["round"], rounds):
+            start = time.time()
+            # Snapshot di inizio round: tutti i membri giocano contro le stesse versioni degli altri
+            for name in names:
+                if os.path.exists(policy_path(save_dir, name)):
+                    shutil.copyfile(policy_path(save_dir, name), snapshot_path(save_dir, name))
+
+            tasks = [(member, [n for n in names if n != member["name"]], save_dir, log_dir,
+                      episodes_per_round, anchors, seed * 100003 + round_id * len(names) + i)
+                     for i, member in enumerate(population)]
+            scores = dict(pool.imap_unordered(_train_member_star, tasks))
+            for member in population:
+                member["score"] = scores[member["name"]]
+                member["history"].append({"round": round_id, "score": member["score"], "lr": member["lr"],
+                                          "gamma": member["gamma"], "exp_rate": member["exp_rate"]})
+
+            best = max(population, key=lambda m: m["score"])
+            print(f"📈 Round {round_id + 1}/{rounds} ({time.time() - start:.0f}s) — migliore {best['name']}: "
+                  f"win={best['score']:.2f} lr={best['lr']} γ={best['gamma']} ε={best['exp_rate']}")
+
+            for target, source in exploit_and_explore(population, save_dir, rng):
+                print(f"   [EXPLOIT] {target} ← {source}")
+
+            state["round"] = round_id + 1
+            state["rng"] = pickle.dumps(rng.getstate()).hex()
+            _save_state(state_path, state)
+
+    best = max(population, key=lambda m: m["score"] or 0)
+    print(f"\n✅ PBT completato. Migliore: {best['name']} ({policy_path(save_dir, best['name'])})")
+    return population
+
+
+if __name__ == "__main__":
+    run_pbt()
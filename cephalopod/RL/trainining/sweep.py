@@ -0,0 +1,210 @@
+import csv
+import json
+import multiprocessing as mp
+import os
+import time
+from itertools import product
+
+# Parametri
+CPU_BUDGET = os.cpu_count() or 1
+THREADS_PER_RUN = 1
+EARLY_STOP_MIN_EPISODES = 1000
+EARLY_STOP_MARGIN = 0.15
+STATE_FILE = "sweep_state.json"
+RESULTS_FILE = "sweep_results.csv"
+TAIL_EPISODES = 500
+
+
+def _shapers():
+    from cephalopod.RL.reward_shaping.rewardshaping import BasicShaper, RiskAwareShaper, AggressiveBoardShaper, \
+        AggressiveBoardShaper2, AdvancedBoardShaper
+    return {
+        "basic": BasicShaper,
+        "riskaware": RiskAwareShaper,
+        "aggressive": AggressiveBoardShaper,
+        "strategic": AggressiveBoardShaper2,
+        "advanced": AdvancedBoardShaper,
+    }
+
+
+def _opponents():
+    from cephalopod.RL.reward_shaping.rewardshaping import OpponentManager
+    from cephalopod.strategies import AggressiveStrategy, NaiveStrategy
+    from cephalopod.strategies.smart_lookahead5 import SmartLookaheadStrategy5
+    from cephalopod.strategies.smart_position import SmartPositionalLookaheadStrategy
+    return {
+        "naive": NaiveStrategy,
+        "aggressive": AggressiveStrategy,
+        "smartpos": SmartPositionalLookaheadStrategy,
+        "smartlook5": SmartLookaheadStrategy5,
+        "manager": OpponentManager,
+    }
+
+
+def run_name(config):
+    return f"RL_lr{config['lr']}_g{config['gamma']}_{config['shaper']}"
+
+
+def build_grid(learning_rates, gammas, shapers, episodes, opponent="smartpos"):
+    return [
+        {"lr": lr, "gamma": gamma, "shaper": shaper, "episodes": episodes, "opponent": opponent}
+        for lr, gamma, shaper in product(learning_rates, gammas, shapers)
+    ]
+
+
+def _limit_threads(threads):
+    # Un run usa `threads` core: evita che NumPy/BLAS aprano un thread per core in ogni processo
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+
+def _init_worker(threads, leaderboard):
+    _limit_threads(threads)
+    global _LEADERBOARD
+    _LEADERBOARD = leaderboard
+
+
+_LEADERBOARD = None
+
+
+def make_early_stop(name, leaderboard, min_episodes=EARLY_STOP_MIN_EPISODES, margin=EARLY_STOP_MARGIN):
+    """
+    Ogni run pubblica il proprio win rate mobile per episodio in `leaderboard` (dict condiviso).
+    Dopo `min_episodes`, un run si ferma se è sotto il migliore allo stesso episodio di oltre `margin`.
+    """
+    def early_stop(episode, win_rate):
+        best = leaderboard.get(episode)
+        if best is None or win_rate > best[0]:
+            leaderboard[episode] = (win_rate, name)
+            return False
+        return episode >= min_episodes and win_rate < best[0] - margin
+
+    return early_stop
+
+
+def run_config(config, save_dir, log_dir, early_stop=True):
+    """Allena una configurazione. Eseguita nei processi worker; ritorna (nome, stato, episodi giocati, secondi)."""
+    from cephalopod.RL.base_rl_player import RLPlayer
+    from cephalopod.RL.trainining.training import train_rl_agent
+
+    name = run_name(config)
+    log_path = os.path.join(log_dir, f"{name}.csv")
+    if os.path.exists(log_path):
+        # Run interrotto a metà: riparte da zero per non mescolare due training nello stesso log
+        os.remove(log_path)
+
+    rl = RLPlayer(
+        name=name,
+        lr=config["lr"],
+        gamma=config["gamma"],
+        reward_shaper=_shapers()[config["shaper"]](),
+        policy_path=os.path.join(save_dir, f"policy_{name}.pkl"),
+    )
+    callback = make_early_stop(name, _LEADERBOARD) if early_stop and _LEADERBOARD is not None else None
+
+    start = time.time()
+    train_rl_agent(
+        rl_agent=rl,
+        opponent_agent=_opponents()[config["opponent"]](),
+        episodes=config["episodes"],
+        save_dir=save_dir,
+        log_path=log_path,
+        decay_exploration=True,
+        verbose=False,
+        use_fixed_save=True,
+        early_stop_callback=callback,
+        plot=False,
+    )
+    with open(log_path, newline="") as f:
+        played = sum(1 for _ in f) - 1
+    status = "stopped" if played < config["episodes"] else "done"
+    return name, status, played, time.time() - start
+
+
+def _run_config_star(args):
+    return run_config(*args)
+
+
+def summarize_log(log_path, tail=TAIL_EPISODES):
+    with open(log_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        return None
+    wins = [int(r["Win"]) for r in rows]
+    rewards = [float(r["FinalReward"]) for r in rows]
+    return {
+        "episodes": len(rows),
+        "win_rate": sum(wins) / len(wins),
+        f"win_rate_last{tail}": sum(wins[-tail:]) / len(wins[-tail:]),
+        "avg_final_reward": sum(rewards) / len(rewards),
+    }
+
+
+def collect_results(grid, log_dir, state, out_path):
+    """Unisce i CSV dei singoli run in un'unica tabella, ordinata per win rate finale."""
+    results = []
+    for config in grid:
+        name = run_name(config)
+        log_path = os.path.join(log_dir, f"{name}.csv")
+        if not os.path.exists(log_path):
+            continue
+        summary = summarize_log(log_path)
+        if summary is None:
+            continue
+        row = {"run": name, **config, "status": state.get(name, {}).get("status", "incomplete"), **summary}
+        results.append(row)
+
+    results.sort(key=lambda r: r[f"win_rate_last{TAIL_EPISODES}"], reverse=True)
+    if results:
+        with open(out_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+    return results
+
+
+def _save_state(path, state):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_sweep(grid, save_dir="policies/tuning_runs", log_dir="logs/tuning_runs", cpu_budget=CPU_BUDGET,
+              threads_per_run=THREADS_PER_RUN, early_stop=True):
+    """
+    Esegue le configurazioni della griglia in processi separati, al massimo cpu_budget // threads_per_run
+    alla volta. Lo stato è salvato in log_dir/sweep_state.json dopo ogni run: rilanciando lo sweep
+    i run già conclusi vengono saltati.
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    os.makedirs(log_dir, exist_ok=True)
+    state_path = os.path.join(log_dir, STATE_FILE)
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            state = json.load(f)
+
+    todo = [config for config in grid if run_name(config) not in state]
+    workers = max(1, min(len(todo), cpu_budget // threads_per_run))
+    print(f"[INFO] Configurazioni: {len(grid)}, già concluse: {len(grid) - len(todo)}, "
+          f"da eseguire: {len(todo)} su {workers} processi")
+
+    if todo:
+        ctx = mp.get_context("spawn")
+        with ctx.Manager() as manager:
+            leaderboard = manager.dict()
+            with ctx.Pool(workers, initializer=_init_worker, initargs=(threads_per_run, leaderboard)) as pool:
+                tasks = [(config, save_dir, log_dir, early_stop) for config in todo]
+                for name, status, played, elapsed in pool.imap_unordered(_run_config_star, tasks):
+                    state[name] = {"status": status, "episodes": played, "seconds": round(elapsed, 1)}
+                    _save_state(state_path, state)
+                    print(f"[✓] {name}: {status} dopo {played} episodi ({elapsed:.0f}s)")
+
+    results = collect_results(grid, log_dir, state, os.path.join(log_dir, RESULTS_FILE))
+    print("\n📈 Risultati:")
+    for r in results:
+        print(f"{r['run']:<35} {r['status']:<8} episodi={r['episodes']:<6} "
+              f"win={r['win_rate']:.3f} win_last{TAIL_EPISODES}={r[f'win_rate_last{TAIL_EPISODES}']:.3f}")
+    return results
@@ -15,9 +15,14 @@ def train_rl_agent(
         decay_exploration=True,
         verbose=True,
         use_fixed_save=False,
-        smart_decay_callback=None  # 🧠 se vuoi passare una funzione di decay intelligente
+        smart_decay_callback=None,  # 🧠 se vuoi passare una funzione di decay intelligente
+        early_stop_callback=None,  # (episodio, win rate ultimi 50) -> True per interrompere il training
+        plot=True,
+        checkpointer=None  # DeltaCheckpointer: salva solo le voci cambiate invece dell'intera policy
 ):
     os.makedirs(save_dir, exist_ok=True)
+    if checkpointer:
+        checkpointer.attach(rl_agent)
     win_rate_over_time = []
     avg_reward_over_time = []
     log_full = []
@@ -73,25 +78,37 @@ def train_rl_agent(
             if smart_decay_callback:
                 smart_decay_callback(rl_agent, win_rate)
 
+            if early_stop_callback and early_stop_callback(i + 1, win_rate):
+                if verbose:
+                    print(f"[STOP] Training interrotto all'episodio {i + 1}")
+                break
+
         if (i + 1) % save_every == 0:
             if decay_exploration and not smart_decay_callback:
                 maybe_decay_exploration(rl_agent)
-            if use_fixed_save:
+            if checkpointer:
+                checkpointer.checkpoint(rl_agent)
+            elif use_fixed_save:
                 rl_agent.save_policy()
             else:
                 filename = get_policy_name(rl_agent.name, rl_agent.reward_shaper)
                 rl_agent.save_policy(os.path.join(save_dir, filename))
 
     # Save finale
-    if use_fixed_save:
+    if checkpointer:
+        checkpointer.checkpoint(rl_agent)
+    elif use_fixed_save:
         rl_agent.save_policy()
     else:
         rl_agent.save_policy(os.path.join(save_dir, get_policy_name(rl_agent.name, rl_agent.reward_shaper)))
 
     print(f"\n🌝 Training completato.")
 
+    if not plot:
+        return win_rate_over_time
+
     step = 50
-    x_axis = range(step, episodes + 1, step)
+    x_axis = range(step, step * len(win_rate_over_time) + 1, step)
 
     plt.figure()
     plt.plot(x_axis, win_rate_over_time, label="Win Rate", marker='o')
@@ -106,3 +123,5 @@ def train_rl_agent(
         plt.show()
     except Exception as e:
         print(f"[WARN] Impossibile visualizzare il grafico: {e}")
+
+    return win_rate_over_time
@@ -0,0 +1,221 @@
+import os
+
+from cephalopod.RL.utils.utils import maybe_decay_exploration, get_policy_name, log_training_batch
+from cephalopod.core.board import Board, Die
+from cephalopod.core.mechanics import get_opponent
+
+# Parametri
+NUM_ENVS = 16
+STATS_EVERY = 50
+
+
+def final_reward_for(board, rl_color):
+    """Stesso reward finale di train_rl_agent: quota di dadi propri, -1 in caso di sconfitta."""
+    b_count = sum(1 for row in board.grid for cell in row if cell and cell.color == "B")
+    w_count = sum(1 for row in board.grid for cell in row if cell and cell.color == "W")
+    winner = "B" if b_count > w_count else "W"
+    total = b_count + w_count
+    final_reward = b_count / total if rl_color == "B" else w_count / total
+    if winner != rl_color:
+        final_reward -= 1.0
+    return final_reward, winner
+
+
+class VecCephalopodEnv:
+    """
+    M partite contro un avversario fisso (o un OpponentManager) giocate in lockstep.
+    Le osservazioni sono le board in cui tocca all'agente: l'avversario muove dentro step().
+    Come in train_rl_agent, l'agente gioca B negli episodi pari e W in quelli dispari.
+    """
+
+    def __init__(self, opponent_agent, num_envs=NUM_ENVS):
+        self.opponent_agent = opponent_agent
+        self.num_envs = num_envs
+        self.boards = [None] * num_envs
+        self.colors = [None] * num_envs
+        self.opponents = [None] * num_envs
+        self.episode_ids = [None] * num_envs
+        self.dones = [True] * num_envs
+        self.next_episode = 0
+
+    def _pick_opponent(self, episode):
+        # Se opponent_agent è dinamico, scegli l'avversario giusto e scala la difficoltà
+        if hasattr(self.opponent_agent, "choose_opponent"):
+            self.opponent_agent.scale_difficulty(episode)
+            return self.opponent_agent.choose_opponent()
+        return self.opponent_agent
+
+    def _apply(self, i, move, color):
+        r, c, top_face, captured = move
+        board = self.boards[i]
+        for (rr, cc) in captured:
+            board.grid[rr][cc] = None
+        board.place_die(r, c, Die(color, top_face))
+
+    def _opponent_moves(self, indices):
+        """Fa muovere l'avversario nelle partite indicate, raggruppando le chiamate se supporta choose_moves."""
+        by_opponent = {}
+        for i in indices:
+            by_opponent.setdefault(id(self.opponents[i]), []).append(i)
+        for group in by_opponent.values():
+            opponent = self.opponents[group[0]]
+            colors = [get_opponent(self.colors[i]) for i in group]
+            if hasattr(opponent, "choose_moves"):
+                moves = opponent.choose_moves([self.boards[i] for i in group], colors)
+            else:
+                moves = [opponent.choose_move(self.boards[i], color) for i, color in zip(group, colors)]
+            for i, move, color in zip(group, moves, colors):
+                self._apply(i, move, color)
+
+    def reset(self, indices=None):
+        """Avvia nuove partite negli ambienti indicati (tutti se None) e ritorna le osservazioni."""
+        if indices is None:
+            indices = range(self.num_envs)
+        opening = []
+        for i in indices:
+            episode = self.next_episode
+            self.next_episode += 1
+            self.boards[i] = Board()
+            self.colors[i] = "B" if episode % 2 == 0 else "W"
+            self.opponents[i] = self._pick_opponent(episode)
+            self.episode_ids[i] = episode
+            self.dones[i] = False
+            if self.colors[i] == "W":
+                opening.append(i)
+        self._opponent_moves(opening)
+        return self.observations()
+
+    def active(self):
+        return [i for i in range(self.num_envs) if not self.dones[i]]
+
+    def observations(self):
+        return [(i, self.boards[i], self.colors[i]) for i in self.active()]
+
+    def step(self, actions):
+        """
+        Applica {indice ambiente: mossa} per le partite attive e fa rispondere l'avversario.
+        Ritorna (osservazioni, rewards, dones, infos) come dict indicizzati per ambiente.
+        """
+        rewards, dones, infos = {}, {}, {}
+        reply = []
+        for i, move in actions.items():
+            self._apply(i, move, self.colors[i])
+            if not self.boards[i].is_full():
+                reply.append(i)
+        self._opponent_moves(reply)
+
+        for i in actions:
+            board = self.boards[i]
+            if board.is_full():
+                final_reward, winner = final_reward_for(board, self.colors[i])
+                self.dones[i] = True
+                rewards[i] = final_reward
+                infos[i] = {"episode": self.episode_ids[i], "winner": winner, "color": self.colors[i]}
+            else:
+                rewards[i] = 0.0
+            dones[i] = self.dones[i]
+        return self.observations(), rewards, dones, infos
+
+
+def train_rl_agent_vectorized(
+        rl_agent,
+        opponent_agent,
+        episodes=10000,
+        num_envs=NUM_ENVS,
+        save_every=1000,
+        log_path="training_log.csv",
+        save_dir="policies",
+        decay_exploration=True,
+        verbose=True,
+        use_fixed_save=False,
+        smart_decay_callback=None,
+        checkpointer=None
+):
+    """
+    Variante di train_rl_agent con `num_envs` partite in parallelo (lockstep, un solo processo).
+    La scelta delle mosse dell'agente è raggruppata (select_actions), gli aggiornamenti Q
+    sono applicati in batch alle partite concluse nello stesso passo e il CSV è scritto ogni STATS_EVERY episodi.
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    if checkpointer:
+        checkpointer.attach(rl_agent)
+    win_rate_over_time = []
+    avg_reward_over_time = []
+    log_full = []
+    episode_rewards = []
+    pending_rows = []
+
+    env = VecCephalopodEnv(opponent_agent, num_envs=min(num_envs, episodes))
+    trajectories = {i: [] for i in range(env.num_envs)}
+    observations = env.reset()
+    completed = 0
+
+    while observations:
+        indices = [i for i, _, _ in observations]
+        selections = rl_agent.select_actions([board for _, board, _ in observations],
+                                             [color for _, _, color in observations])
+        actions = {}
+        for i, (move, state_hash, shaped_rwd) in zip(indices, selections):
+            trajectories[i].append((state_hash, shaped_rwd))
+            actions[i] = move
+
+        _, rewards, dones, infos = env.step(actions)
+
+        finished = sorted((i for i in indices if dones[i]), key=lambda i: infos[i]["episode"])
+        rl_agent.feed_rewards([trajectories[i] for i in finished], [rewards[i] for i in finished])
+
+        restart = []
+        for i in finished:
+            info = infos[i]
+            win = 1 if info["winner"] == info["color"] else 0
+            completed += 1
+            log_full.append(win)
+            episode_rewards.append(sum(r for _, r in trajectories[i]))
+            pending_rows.append([info["episode"] + 1, win, rewards[i]])
+            trajectories[i] = []
+
+            if completed % STATS_EVERY == 0:
+                log_training_batch(log_path, pending_rows)
+                pending_rows = []
+                win_rate = sum(log_full[-STATS_EVERY:]) / STATS_EVERY
+                avg_shaped_reward = sum(episode_rewards[-STATS_EVERY:]) / STATS_EVERY
+                win_rate_over_time.append(win_rate)
+                avg_reward_over_time.append(avg_shaped_reward)
+
+                if verbose:
+                    print(f"[{completed}/{episodes}] Win rate ultimi {STATS_EVERY}: {win_rate:.2f} | "
+                          f"Avg reward: {avg_shaped_reward:.2f} | ε={rl_agent.exp_rate:.2f}")
+
+                if smart_decay_callback:
+                    smart_decay_callback(rl_agent, win_rate)
+
+            if completed % save_every == 0:
+                if decay_exploration and not smart_decay_callback:
+                    maybe_decay_exploration(rl_agent)
+                if checkpointer:
+                    checkpointer.checkpoint(rl_agent)
+                elif use_fixed_save:
+                    rl_agent.save_policy()
+                else:
+                    filename = get_policy_name(rl_agent.name, rl_agent.reward_shaper)
+                    rl_agent.save_policy(os.path.join(save_dir, filename))
+
+            if env.next_episode < episodes:
+                restart.append(i)
+
+        if restart:
+            env.reset(restart)
+        observations = env.observations()
+
+    log_training_batch(log_path, pending_rows)
+
+    # Save finale
+    if checkpointer:
+        checkpointer.checkpoint(rl_agent)
+    elif use_fixed_save:
+        rl_agent.save_policy()
+    else:
+        rl_agent.save_policy(os.path.join(save_dir, get_policy_name(rl_agent.name, rl_agent.reward_shaper)))
+
+    print(f"\n🌝 Training completato.")
+    return win_rate_over_time, avg_reward_over_time
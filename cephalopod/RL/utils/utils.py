@@ -22,3 +22,16 @@ def get_policy_name(name, reward_shaper):
     base = reward_shaper.__class__.__name__.lower()
     timestamp = datetime.now().strftime("%Y%m%d_%H%M")
     return f"policy_{name}_{base}_{timestamp}.pkl"
+
+
+def log_training_batch(path, rows):
+    """Come log_training, ma scrive più righe (episode, win, final_reward) con una sola apertura del file."""
+    if not rows:
+        return
+    header = ["Episode", "Win", "FinalReward"]
+    write_header = not os.path.exists(path)
+    with open(path, "a", newline="") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(header)
+        writer.writerows(rows)
@@ -2,25 +2,20 @@ import numpy as np
 import torch
 
 from cephalopod.alphazero.mcts import MCTS
+from cephalopod.core.encoding import encode_boards
 
 class CephalopodZero:
-    def __init__(self, model, mcts_simulations=50):
+    def __init__(self, model, mcts_simulations=50, cache=None):
         self.model = model
-        self.mcts = MCTS(self, num_simulations=mcts_simulations)
+        self.cache = cache
+        self.mcts = MCTS(self, num_simulations=mcts_simulations, cache=cache)
 
     def encode_board(self, board, player):
-        import numpy as np
-        planes = np.zeros((3, 5, 5), dtype=np.float32)
-        for r in range(5):
-            for c in range(5):
-                die = board.grid[r][c]
-                if die:
-                    if die.color == player:
-                        planes[0][r][c] = 1
-                        planes[1][r][c] = die.top_face / 6
-                    else:
-                        planes[2][r][c] = die.top_face / 6
-        return torch.tensor(planes, dtype=torch.float32)
+        return encode_boards([board], player, as_tensor=True)[0]
+
+    def encode_boards(self, boards, players, out=None):
+        """Versione batch di encode_board: ritorna un tensore (B, 3, 5, 5)."""
+        return encode_boards(boards, players, out=out, as_tensor=True)
 
     def generate_self_play_data(self, num_games=10):
         data = []
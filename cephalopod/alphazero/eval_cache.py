@@ -0,0 +1,68 @@
+# 📁 File: cephalopod/alphazero/eval_cache.py
+from collections import OrderedDict
+
+import numpy as np
+
+from cephalopod.core.packing import canonical_key, relative_codes
+from cephalopod.core.symmetry import DEST, GATHER
+
+CACHE_SIZE = 200000
+
+_DEST = np.array(DEST, dtype=np.intp)
+_GATHER = np.array(GATHER, dtype=np.intp)
+
+
+class EvaluationCache:
+    """
+    Cache LRU limitata delle valutazioni della rete (policy mascherata, value).
+    La chiave è la forma canonica della board (minima tra le 8 simmetrie) vista dal giocatore
+    di turno: i suoi dadi valgono 1..6 e quelli avversari 7..12, come negli input della rete.
+    La policy è salvata nel sistema di riferimento canonico e ri-trasformata a ogni lettura.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def evaluate(self, agent, board, player):
+        key, k = canonical_key(relative_codes(board, player))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            policy_c, value = entry
+            return policy_c[_DEST[k]], value
+
+        self.misses += 1
+        board_tensor = agent.encode_board(board, player)
+        policy, value = agent.model.predict(board_tensor, board.get_empty_cells())
+        self._entries[key] = (np.asarray(policy)[_GATHER[k]], value)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return policy, value
+
+    def clear(self):
+        """Da chiamare quando cambiano i pesi della rete."""
+        self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def evaluate_position(agent, board, player, cache=None):
+    """Valuta (policy, value) della posizione, passando dalla cache se disponibile."""
+    if cache is not None:
+        return cache.evaluate(agent, board, player)
+    board_tensor = agent.encode_board(board, player)
+    return agent.model.predict(board_tensor, board.get_empty_cells())
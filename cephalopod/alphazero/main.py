@@ -4,6 +4,7 @@ import os
 import torch
 from cephalopod.alphazero.neural_network import NeuralNetwork
 from cephalopod.alphazero.cephalopod_zero_dynamic import CephalopodZero
+from cephalopod.alphazero.eval_cache import EvaluationCache
 from cephalopod.alphazero.ui import CephalopodUI
 
 
@@ -15,7 +16,7 @@ def main():
     model.eval()
 
     print("🧠 Inizializzo agente con MCTS...")
-    agent = CephalopodZero(model=model, mcts_simulations=25)
+    agent = CephalopodZero(model=model, mcts_simulations=25, cache=EvaluationCache())
 
     print("🖥️ Avvio UI auto-play...")
     CephalopodUI(agent)
@@ -3,6 +3,7 @@ import math
 import copy
 from cephalopod.core.board import Die
 from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset, get_opponent
+from cephalopod.alphazero.eval_cache import evaluate_position
 
 class MCTSNode:
     def __init__(self, game, player, parent=None, prior=0.0):
@@ -18,10 +19,9 @@ class MCTSNode:
     def is_expanded(self):
         return bool(self.children)
 
-    def expand(self, model, current_player):
+    def expand(self, model, current_player, cache=None):
         legal_moves = self.game.get_empty_cells()
-        board_tensor = model.encode_board(self.game, current_player)
-        policy, _ = model.model.predict(board_tensor, legal_moves)
+        policy, value = evaluate_position(model, self.game, current_player, cache)
 
         for r, c in legal_moves:
             new_game = self.game.clone()
@@ -38,6 +38,7 @@ class MCTSNode:
                 parent=self,
                 prior=policy[move_index]
             )
+        return value
 
     def select_child(self, c_puct=1.0):
         total_visits = sum(child.N for child in self.children.values())
@@ -51,22 +52,22 @@ class MCTSNode:
             self.parent.backpropagate(-value)
 
 class MCTS:
-    def __init__(self, model, num_simulations=50, c_puct=1.0):
+    def __init__(self, model, num_simulations=50, c_puct=1.0, cache=None):
         self.model = model
         self.num_simulations = num_simulations
         self.c_puct = c_puct
+        self.cache = cache
 
     def run(self, root_game, root_player):
         root = MCTSNode(game=root_game.clone(), player=root_player)
-        root.expand(self.model, root_player)
+        root.expand(self.model, root_player, self.cache)
 
         for _ in range(self.num_simulations):
             node = root
             while node.is_expanded():
                 _, node = node.select_child(self.c_puct)
-            node.expand(self.model, node.player)
-            board_tensor = self.model.encode_board(node.game, node.player)
-            _, value = self.model.model.predict(board_tensor, node.game.get_empty_cells())
+            # expand valuta già la foglia: riuso il value invece di una seconda predict
+            value = node.expand(self.model, node.player, self.cache)
             node.backpropagate(value)
 
         visits = np.zeros(25)
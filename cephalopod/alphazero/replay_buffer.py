@@ -0,0 +1,122 @@
+# 📁 File: cephalopod/alphazero/replay_buffer.py
+import json
+import os
+
+import numpy as np
+
+from cephalopod.core.symmetry import GATHER, NUM_SYMMETRIES
+
+BUFFER_SIZE = 200000
+PLANES_SHAPE = (3, 5, 5)
+POLICY_SIZE = 25
+DEFAULT_BUFFER_DIR = os.path.join(os.path.dirname(__file__), "replay_buffer")
+
+_GATHER = np.array(GATHER, dtype=np.intp)  # (8, 25)
+
+
+def apply_symmetries(planes, policies, syms):
+    """
+    Applica a ogni esempio del batch la simmetria indicata in `syms`.
+    planes: (B, C, 5, 5), policies: (B, 25), syms: (B,) interi in [0, 8).
+    """
+    batch, channels = planes.shape[:2]
+    index = _GATHER[syms]  # (B, 25)
+    flat = planes.reshape(batch, channels, -1)
+    planes_t = np.take_along_axis(flat, index[:, None, :], axis=2).reshape(planes.shape)
+    policies_t = np.take_along_axis(policies, index, axis=1)
+    return planes_t, policies_t
+
+
+class MemmapReplayBuffer:
+    """
+    Replay buffer ad anello su array NumPy memory-mapped a forma fissa (planes, policy, value).
+    La memoria occupata è costante, i dati sopravvivono ai riavvii e il campionamento è vettorizzato.
+    Se `augment` è attivo ogni esempio campionato riceve una delle 8 simmetrie della board.
+    """
+
+    def __init__(self, directory=DEFAULT_BUFFER_DIR, capacity=BUFFER_SIZE, augment=True, planes_shape=PLANES_SHAPE):
+        self.directory = directory
+        self.augment = augment
+        os.makedirs(directory, exist_ok=True)
+        self.meta_path = os.path.join(directory, "meta.json")
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            self.capacity = meta["capacity"]
+            self.size = meta["size"]
+            self.position = meta["position"]
+            mode = "r+"
+        else:
+            self.capacity = capacity
+            self.size = 0
+            self.position = 0
+            mode = "w+"
+
+        self.planes = self._open("planes.npy", mode, (self.capacity,) + tuple(planes_shape))
+        self.policies = self._open("policies.npy", mode, (self.capacity, POLICY_SIZE))
+        self.values = self._open("values.npy", mode, (self.capacity,))
+        if mode == "w+":
+            self.flush()
+
+    def _open(self, name, mode, shape):
+        path = os.path.join(self.directory, name)
+        if mode == "w+":
+            return np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=shape)
+        array = np.lib.format.open_memmap(path, mode="r+")
+        if array.shape != shape:
+            raise ValueError(f"Forma di '{path}' incompatibile: {array.shape} invece di {shape}")
+        return array
+
+    def __len__(self):
+        return self.size
+
+    def add_game(self, game_data):
+        if not game_data:
+            return
+        states, policies, values = zip(*game_data)
+        self.add_batch(np.asarray(states, dtype=np.float32),
+                       np.asarray(policies, dtype=np.float32),
+                       np.asarray(values, dtype=np.float32))
+
+    def add_batch(self, planes, policies, values):
+        n = len(planes)
+        if n >= self.capacity:
+            # Tengo solo gli ultimi `capacity` esempi
+            planes, policies, values = planes[-self.capacity:], policies[-self.capacity:], values[-self.capacity:]
+            n = self.capacity
+
+        first = min(n, self.capacity - self.position)
+        end = self.position + first
+        self.planes[self.position:end] = planes[:first]
+        self.policies[self.position:end] = policies[:first]
+        self.values[self.position:end] = values[:first]
+
+        rest = n - first
+        if rest:
+            # Sovrascrittura ad anello dall'inizio
+            self.planes[:rest] = planes[first:]
+            self.policies[:rest] = policies[first:]
+            self.values[:rest] = values[first:]
+
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+
+    def sample(self, batch_size):
+        idx = np.random.randint(0, self.size, size=batch_size)
+        idx.sort()  # accessi più sequenziali sul file mappato
+        planes = self.planes[idx]
+        policies = self.policies[idx]
+        values = self.values[idx]
+        if self.augment:
+            syms = np.random.randint(0, NUM_SYMMETRIES, size=batch_size)
+            planes, policies = apply_symmetries(planes, policies, syms)
+        return planes, policies, values
+
+    def flush(self):
+        for array in (self.planes, self.policies, self.values):
+            array.flush()
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"capacity": self.capacity, "size": self.size, "position": self.position}, f)
+        os.replace(tmp_path, self.meta_path)
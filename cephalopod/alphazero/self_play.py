@@ -0,0 +1,224 @@
+# 📁 File: cephalopod/alphazero/self_play.py
+import os
+import queue
+import random
+import time
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+import torch.optim as optim
+
+from cephalopod.alphazero.neural_network import NeuralNetwork
+from cephalopod.alphazero.cephalopod_zero_dynamic import CephalopodZero
+from cephalopod.alphazero.eval_cache import EvaluationCache
+from cephalopod.alphazero.replay_buffer import MemmapReplayBuffer
+from cephalopod.alphazero.train_cephalopod_zero import BATCH_SIZE, LEARNING_RATE, MODEL_SAVE_PATH, train_on_batch
+
+# Parametri
+NUM_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MCTS_SIMULATIONS = 25
+BUFFER_SIZE = 50000
+MIN_BUFFER_SIZE = 512
+PUBLISH_EVERY = 50  # passi di training tra due pubblicazioni dei pesi
+TRAIN_STEPS_PER_GAME = 4  # limite di passi di training per partita ricevuta (evita overfitting sul buffer)
+WEIGHTS_PATH = os.path.join(os.path.dirname(__file__), "self_play_weights.pth")
+
+
+class ListReplayBuffer:
+    """
+    Replay buffer circolare in memoria.
+    Riceve partite intere (liste di (state, policy, value)) e restituisce batch campionati a caso.
+    """
+
+    def __init__(self, capacity=BUFFER_SIZE):
+        self.capacity = capacity
+        self.data = []
+        self.position = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def add_game(self, game_data):
+        for sample in game_data:
+            if len(self.data) < self.capacity:
+                self.data.append(sample)
+            else:
+                self.data[self.position] = sample
+            self.position = (self.position + 1) % self.capacity
+
+    def sample(self, batch_size):
+        batch = random.sample(self.data, min(batch_size, len(self.data)))
+        states, policies, values = zip(*batch)
+        return np.array(states), np.array(policies), np.array(values, dtype=np.float32)
+
+
+def publish_weights(model, weights_path, weights_version):
+    """Salva i pesi in modo atomico e incrementa la versione letta dai worker."""
+    tmp_path = weights_path + ".tmp"
+    torch.save(model.state_dict(), tmp_path)
+    os.replace(tmp_path, weights_path)
+    with weights_version.get_lock():
+        weights_version.value += 1
+
+
+def self_play_worker(worker_id, weights_path, weights_version, game_queue, stop_event, mcts_simulations, seed):
+    """
+    Processo di self-play: tiene una copia CPU della rete, la ricarica quando il trainer
+    pubblica una nuova versione e invia ogni partita conclusa sulla coda condivisa.
+    """
+    torch.set_num_threads(1)
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+    model = NeuralNetwork()
+    cache = EvaluationCache()
+    agent = CephalopodZero(model=model, mcts_simulations=mcts_simulations, cache=cache)
+    local_version = -1
+
+    while not stop_event.is_set():
+        version = weights_version.value
+        if version != local_version:
+            model.load_state_dict(torch.load(weights_path, map_location="cpu"))
+            model.eval()
+            cache.clear()  # le valutazioni dei pesi precedenti non sono più valide
+            local_version = version
+
+        game_data = agent.play_game()
+        while not stop_event.is_set():
+            try:
+                game_queue.put((worker_id, local_version, game_data), timeout=1.0)
+                break
+            except queue.Full:
+                continue
+
+
+class SelfPlayOrchestrator:
+    """
+    Coordina N processi di self-play e un trainer che consuma il replay buffer in parallelo.
+    Il trainer gira nel processo principale: scarica le partite dalla coda, allena la rete su batch
+    campionati dal buffer e ogni `publish_every` passi pubblica i nuovi pesi ai worker.
+    """
+
+    def __init__(self, model, num_workers=NUM_WORKERS, mcts_simulations=MCTS_SIMULATIONS, replay_buffer=None,
+                 min_buffer_size=MIN_BUFFER_SIZE, batch_size=BATCH_SIZE, publish_every=PUBLISH_EVERY,
+                 train_steps_per_game=TRAIN_STEPS_PER_GAME, weights_path=WEIGHTS_PATH, seed=0):
+        self.model = model
+        self.num_workers = num_workers
+        self.mcts_simulations = mcts_simulations
+        self.replay_buffer = replay_buffer if replay_buffer is not None else ListReplayBuffer()
+        self.min_buffer_size = min_buffer_size
+        self.batch_size = batch_size
+        self.publish_every = publish_every
+        self.train_steps_per_game = train_steps_per_game
+        self.weights_path = weights_path
+        self.seed = seed
+
+        self.games_received = 0
+        self.train_steps = 0
+
+    def run(self, total_games=1000, max_train_steps=None, verbose=True):
+        ctx = mp.get_context("spawn")
+        game_queue = ctx.Queue(maxsize=4 * self.num_workers)
+        stop_event = ctx.Event()
+        weights_version = ctx.Value("i", -1)
+        publish_weights(self.model, self.weights_path, weights_version)
+
+        workers = []
+        for worker_id in range(self.num_workers):
+            p = ctx.Process(
+                target=self_play_worker,
+                args=(worker_id, self.weights_path, weights_version, game_queue, stop_event,
+                      self.mcts_simulations, self.seed + worker_id),
+                daemon=True,
+            )
+            p.start()
+            workers.append(p)
+
+        optimizer = optim.Adam(self.model.parameters(), lr=LEARNING_RATE)
+        loss_fn_policy = nn.CrossEntropyLoss()
+        loss_fn_value = nn.MSELoss()
+        start = time.time()
+        recent_losses = []
+
+        try:
+            while self.games_received < total_games:
+                if max_train_steps is not None and self.train_steps >= max_train_steps:
+                    break
+
+                # Scarica le partite pronte; blocca solo se il buffer è troppo piccolo
+                # o se il trainer è troppo avanti rispetto ai dati generati
+                ready = self._can_train()
+                try:
+                    while True:
+                        worker_id, version, game_data = game_queue.get(block=not ready, timeout=1.0)
+                        self.replay_buffer.add_game(game_data)
+                        self.games_received += 1
+                        if verbose and self.games_received % 10 == 0:
+                            rate = self.games_received / (time.time() - start)
+                            print(f"  ▶️ Partite ricevute: {self.games_received}/{total_games} "
+                                  f"({rate:.2f} partite/s, buffer={len(self.replay_buffer)})")
+                        ready = self._can_train()
+                except queue.Empty:
+                    pass
+
+                if not ready:
+                    continue
+
+                self.model.train()
+                states, policies, values = self.replay_buffer.sample(self.batch_size)
+                loss = train_on_batch(self.model, optimizer, states, policies, values, loss_fn_policy, loss_fn_value)
+                recent_losses.append(loss)
+                self.train_steps += 1
+
+                if self.train_steps % self.publish_every == 0:
+                    publish_weights(self.model, self.weights_path, weights_version)
+                    self._flush_buffer()
+                    if verbose:
+                        avg_loss = sum(recent_losses) / len(recent_losses)
+                        print(f"📈 Step {self.train_steps} - Loss media: {avg_loss:.4f} - "
+                              f"pesi v{weights_version.value} pubblicati")
+                    recent_losses = []
+        finally:
+            stop_event.set()
+            # Svuota la coda per non lasciare i worker bloccati su put()
+            try:
+                while True:
+                    game_queue.get_nowait()
+            except queue.Empty:
+                pass
+            for p in workers:
+                p.join(timeout=5.0)
+                if p.is_alive():
+                    p.terminate()
+            self._flush_buffer()
+
+        self.model.eval()
+        return self.model
+
+    def _flush_buffer(self):
+        if hasattr(self.replay_buffer, "flush"):
+            self.replay_buffer.flush()
+
+    def _can_train(self):
+        if len(self.replay_buffer) < self.min_buffer_size:
+            return False
+        return self.train_steps < self.train_steps_per_game * self.games_received
+
+
+if __name__ == "__main__":
+    print("🧠 Inizializzo il modello neurale...")
+    model = NeuralNetwork()
+    if os.path.exists(MODEL_SAVE_PATH):
+        model.load_state_dict(torch.load(MODEL_SAVE_PATH, map_location="cpu"))
+        print(f"📦 Pesi iniziali caricati da: {MODEL_SAVE_PATH}")
+
+    print(f"♻️ Avvio self-play parallelo con {NUM_WORKERS} worker...")
+    orchestrator = SelfPlayOrchestrator(model, replay_buffer=MemmapReplayBuffer())
+    orchestrator.run(total_games=1000)
+
+    print(f"💾 Salvo modello in: {MODEL_SAVE_PATH}")
+    torch.save(model.state_dict(), MODEL_SAVE_PATH)
+    print("🎉 Training completato con successo!")
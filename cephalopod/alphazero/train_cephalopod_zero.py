@@ -7,15 +7,37 @@ import os
 
 from cephalopod.alphazero.neural_network import NeuralNetwork
 from cephalopod.alphazero.cephalopod_zero_dynamic import CephalopodZero
+from cephalopod.alphazero.replay_buffer import MemmapReplayBuffer
 
 # Parametri
 BATCH_SIZE = 64
 EPOCHS = 10
+STEPS_PER_EPOCH = 100
 LEARNING_RATE = 1e-3
 NUM_GAMES = 30
 MODEL_SAVE_PATH = os.path.join(os.path.dirname(__file__), "cephalopod_zero.pth")
 
 
+def train_on_batch(model, optimizer, states, target_policies, target_values, loss_fn_policy, loss_fn_value):
+    """Esegue un singolo passo di ottimizzazione su un batch e ritorna la loss."""
+    x = torch.tensor(np.array(states), dtype=torch.float32).permute(0, 3, 1, 2)  # (B, 3, 5, 5)
+    if x.shape[1] != 3:
+        x = x.permute(0, 2, 3, 1)[:, :3]  # forza la forma corretta se serve
+
+    y_policy = torch.tensor(np.array(target_policies), dtype=torch.float32)
+    y_value = torch.tensor(np.array(target_values), dtype=torch.float32).unsqueeze(1)
+
+    policy_logits, value = model(x)
+    policy_loss = loss_fn_policy(policy_logits, torch.argmax(y_policy, dim=1))
+    value_loss = loss_fn_value(value, y_value)
+    loss = policy_loss + value_loss
+
+    optimizer.zero_grad()
+    loss.backward()
+    optimizer.step()
+    return loss.item()
+
+
 def train(model, data, epochs=EPOCHS):
     model.train()
     optimizer = optim.Adam(model.parameters(), lr=LEARNING_RATE)
@@ -29,26 +51,28 @@ def train(model, data, epochs=EPOCHS):
         for i in range(0, len(data), BATCH_SIZE):
             batch = data[i:i + BATCH_SIZE]
             states, target_policies, target_values = zip(*batch)
+            total_loss += train_on_batch(model, optimizer, states, target_policies, target_values,
+                                         loss_fn_policy, loss_fn_value)
 
-            x = torch.tensor(np.array(states), dtype=torch.float32).permute(0, 3, 1, 2)  # (B, 3, 5, 5)
-            if x.shape[1] != 3:
-                x = x.permute(0, 2, 3, 1)[:, :3]  # forza la forma corretta se serve
-
-            y_policy = torch.tensor(np.array(target_policies), dtype=torch.float32)
-            y_value = torch.tensor(np.array(target_values), dtype=torch.float32).unsqueeze(1)
+        avg_loss = total_loss / max(1, len(data) // BATCH_SIZE)
+        print(f"📈 Epoch {epoch + 1}/{epochs} - Loss: {avg_loss:.4f}")
 
-            policy_logits, value = model(x)
-            policy_loss = loss_fn_policy(policy_logits, torch.argmax(y_policy, dim=1))
-            value_loss = loss_fn_value(value, y_value)
-            loss = policy_loss + value_loss
 
-            optimizer.zero_grad()
-            loss.backward()
-            optimizer.step()
+def train_from_buffer(model, replay_buffer, epochs=EPOCHS, steps_per_epoch=STEPS_PER_EPOCH):
+    """Come train(), ma campiona i batch dal replay buffer invece di rimescolare una lista."""
+    model.train()
+    optimizer = optim.Adam(model.parameters(), lr=LEARNING_RATE)
+    loss_fn_policy = nn.CrossEntropyLoss()
+    loss_fn_value = nn.MSELoss()
 
-            total_loss += loss.item()
+    for epoch in range(epochs):
+        total_loss = 0
+        for _ in range(steps_per_epoch):
+            states, target_policies, target_values = replay_buffer.sample(BATCH_SIZE)
+            total_loss += train_on_batch(model, optimizer, states, target_policies, target_values,
+                                         loss_fn_policy, loss_fn_value)
 
-        avg_loss = total_loss / max(1, len(data) // BATCH_SIZE)
+        avg_loss = total_loss / steps_per_epoch
         print(f"📈 Epoch {epoch + 1}/{epochs} - Loss: {avg_loss:.4f}")
 
 
@@ -59,15 +83,18 @@ if __name__ == "__main__":
     print("🎮 Creo agente CephalopodZero con MCTS...")
     agent = CephalopodZero(model=model, mcts_simulations=25)
 
+    replay_buffer = MemmapReplayBuffer()
+    print(f"📂 Replay buffer: {len(replay_buffer)} esempi già presenti")
+
     print(f"♻️ Avvio self-play con {NUM_GAMES} partite...")
-    training_data = []
     for i in range(NUM_GAMES):
         print(f"  ▶️ Partita {i + 1}/{NUM_GAMES} in corso...")
-        training_data.extend(agent.play_game())
-    print(f"✅ Dati raccolti: {len(training_data)} esempi")
+        replay_buffer.add_game(agent.play_game())
+    replay_buffer.flush()
+    print(f"✅ Dati nel buffer: {len(replay_buffer)} esempi")
 
     print("🏋️ Inizio training della rete neurale...")
-    train(model, training_data, epochs=EPOCHS)
+    train_from_buffer(model, replay_buffer, epochs=EPOCHS)
 
     print(f"💾 Salvo modello in: {MODEL_SAVE_PATH}")
     torch.save(model.state_dict(), MODEL_SAVE_PATH)
@@ -5,6 +5,7 @@ import numpy as np
 import torch
 from cephalopod.alphazero.neural_network import NeuralNetwork
 from cephalopod.alphazero.cephalopod_zero_dynamic import CephalopodZero
+from cephalopod.alphazero.eval_cache import EvaluationCache
 from cephalopod.core.board import Board, Die
 from cephalopod.core.mechanics import get_opponent, find_capturing_subsets, choose_capturing_subset
 
@@ -57,9 +58,10 @@ class CephalopodUI:
     def play_step(self):
         if self.board.is_full():
             print("🏁 Partita finita")
+            if self.agent.cache is not None:
+                print(f"🗃️ Cache valutazioni: {self.agent.cache.stats()}")
             return
 
-        board_tensor = self.agent.encode_board(self.board, self.current_player)
         board_clone = self.board.clone() if hasattr(self.board, "clone") else self.board
         policy = self.agent.mcts.run(board_clone, self.current_player)
         legal_moves = self.board.get_empty_cells()
@@ -89,5 +91,5 @@ if __name__ == "__main__":
     model = NeuralNetwork()
     model.load_state_dict(torch.load("cephalopod/alphazero/cephalopod_zero.pth", map_location="cpu"))
     model.eval()
-    agent = CephalopodZero(model, mcts_simulations=25)
+    agent = CephalopodZero(model, mcts_simulations=25, cache=EvaluationCache())
     CephalopodUI(agent)
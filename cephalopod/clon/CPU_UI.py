@@ -2,9 +2,6 @@ import threading
 import torch
 from torch.utils.data import DataLoader
 
-from RL.base_rl_player import RLPlayer
-from RL.reward_shaping.rewardshaping import AdvancedBoardShaper
-
 import random
 from cephalopod.core.board import Die, Board
 from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset
@@ -18,52 +15,31 @@ import tkinter as tk
 from tkinter import ttk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-from cephalopod.RL.base_rl_player import RLPlayer
-from cephalopod.RL.reward_shaping.rewardshaping import AdvancedBoardShaper
 from cephalopod.game_modes.cephalopod_game_dynamic import CephalopodGameDynamic
-from cephalopod.strategies import SmartLookaheadStrategy, SmartBlockAggressiveStrategy
-from cephalopod.strategies.deep5lookahead import SmartLookaheadStrategy6
-from cephalopod.strategies.deep_thinking import MinimaxStrategy, ExpectimaxStrategy
-from cephalopod.strategies.mod_smart_lookahead import ModSmartLookaheadStrategy
-from cephalopod.strategies.non5 import CautiousLookaheadStrategy
-from cephalopod.strategies.prob_lookahead import ProbabilisticLookaheadStrategy
-from cephalopod.strategies.smart_lookahead5 import SmartLookaheadStrategy5
-from cephalopod.strategies.smart_minimax import SmartMinimaxStrategy
-from cephalopod.strategies.smart_position import SmartPositionalLookaheadStrategy
-from clon.evaluate_bc_vs_expert import BCPolicyPlayer
-from strategies import NaiveStrategy, HeuristicStrategy, AggressiveStrategy
-
-# Placeholder per le configurazioni della strategia probabilistica
-best_config = {"param": "value"}
-best_multi_config = {"param": "value"}
-
-# Dizionario delle strategie/euristiche disponibili
-STRATEGIES = {
-    "Naive": NaiveStrategy,
-    "Heuristic": HeuristicStrategy,
-    "Aggressive": AggressiveStrategy,
-    "SmartLookahead": SmartLookaheadStrategy,
-    "Minimax (depth=3)": lambda: MinimaxStrategy(depth=3),
-    "Expectimax (depth=3)": lambda: ExpectimaxStrategy(depth=3),
-    "SmartMini": SmartMinimaxStrategy,
-    "SmartPositional": SmartPositionalLookaheadStrategy,
-    "ModifiedLookAhead": ModSmartLookaheadStrategy,
-    "SmartBA": SmartBlockAggressiveStrategy,
-    "SmartPos": SmartPositionalLookaheadStrategy,
-    "Non5": CautiousLookaheadStrategy,
-    # 🔥 Strategia probabilistica ottimizzata
-    "Prob (tuned)": lambda: ProbabilisticLookaheadStrategy(config=best_config, debug=False),
-    "Prob (multi)": lambda: ProbabilisticLookaheadStrategy(config=best_multi_config),
-    "Goat5": SmartLookaheadStrategy5,
-    "Goat?": SmartLookaheadStrategy6,
-    "RLPlayer": lambda: RLPlayer(
-        name="RL",
-        exp_rate=0.0,
-        policy_path="policies/policy_RL_advanced.pkl",
-        reward_shaper=AdvancedBoardShaper()
-    ),
-    "BCPlayer": lambda: BCPolicyPlayer(),
-}
+from cephalopod.strategies.registry import STRATEGY_REGISTRY
+
+# Strategie/euristiche disponibili: i moduli sono importati solo quando una strategia viene scelta
+STRATEGIES = STRATEGY_REGISTRY.subset([
+    "Naive",
+    "Heuristic",
+    "Aggressive",
+    "SmartLookahead",
+    "Minimax (depth=3)",
+    "Expectimax (depth=3)",
+    "SmartMini",
+    "SmartPositional",
+    "ModifiedLookAhead",
+    "SmartBA",
+    "SmartPos",
+    "Non5",
+    "Prob (tuned)",  # 🔥 Strategia probabilistica ottimizzata
+    "Prob (multi)",
+    "Goat5",
+    "Goat?",
+    "RLPlayer",
+    "LinearRL",
+    "BCPlayer",
+])
 
 ##########################################################
 # TRAINING & DATASET GENERATION
@@ -0,0 +1,63 @@
+import os
+
+import torch
+
+from cephalopod.core.encoding import encode_boards
+
+DEFAULT_MODEL_PATH = "policy_bc.pt"
+
+# Modelli già caricati, condivisi tra tutte le istanze: chiave (percorso assoluto, device)
+_MODELS = {}
+
+
+def resolve_model_path(model_path):
+    """I percorsi relativi sono cercati prima nella cartella corrente, poi accanto a questo file."""
+    if os.path.isabs(model_path) or os.path.exists(model_path):
+        return os.path.abspath(model_path)
+    return os.path.join(os.path.dirname(__file__), model_path)
+
+
+def encode_bc_boards(boards):
+    """Codifica una lista di Board nel formato dell'ExpertDataset: tensore (B, 5, 5, 2)."""
+    return encode_boards(boards, layout="bc", as_tensor=True).permute(0, 2, 3, 1)
+
+
+def load_bc_model(model_path=DEFAULT_MODEL_PATH, device="cpu"):
+    """Carica il BehaviorCloningModel una sola volta per processo e lo riusa."""
+    from cephalopod.clon.behavior import BehaviorCloningModel
+
+    key = (resolve_model_path(model_path), str(device))
+    model = _MODELS.get(key)
+    if model is None:
+        model = BehaviorCloningModel().to(device)
+        model.load_state_dict(torch.load(key[0], map_location=device))
+        model.eval()
+        _MODELS[key] = model
+    return model
+
+
+class BCInference:
+    """
+    Inferenza leggera per il behaviour cloning: nessun dataset, codifica diretta dalle Board
+    e modello caricato solo alla prima predizione.
+    """
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, device=None):
+        self.model_path = model_path
+        self.device = device or "cpu"
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = load_bc_model(self.model_path, self.device)
+        return self._model
+
+    def predict(self, boards):
+        """Ritorna una lista di (r, c, top_face) predetti, uno per board, con una sola forward."""
+        if not boards:
+            return []
+        with torch.no_grad():
+            encoded = encode_bc_boards(boards).to(self.device)
+            preds = self.model(encoded).round().int().tolist()
+        return [(r, c, max(1, min(6, top_face))) for r, c, top_face in preds]
@@ -0,0 +1,166 @@
+import json
+import os
+import pickle
+import struct
+import time
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+from cephalopod.core.encoding import encode_packed
+from cephalopod.clon.expert_dataset import parse_board_str
+
+# Formato binario del dataset esperto:
+#   MAGIC (8 byte) | lunghezza header (uint32 little-endian) | header JSON | padding fino a ALIGN
+#   boards: uint8 (N, 25)  codici di cella (0 vuota, 1..6 dado B, 7..12 dado W)
+#   moves:  uint8 (N, 3)   [cella r*5+c, top_face, maschera catture]
+# La maschera delle catture ha un bit per vicino ortogonale, nell'ordine di Board.orthogonal_neighbors:
+#   bit 0 = sopra, bit 1 = sotto, bit 2 = sinistra, bit 3 = destra
+MAGIC = b"CEPHBC\x00\x01"
+FORMAT_VERSION = 1
+ALIGN = 64
+NEIGHBOR_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def encode_move(move):
+    """Converte una mossa (r, c, top_face, captured) in tre interi piccoli [cella, faccia, maschera]."""
+    r, c, face, captured = move
+    r = max(0, min(r, 4))
+    c = max(0, min(c, 4))
+    face = max(1, min(face, 6))
+    mask = 0
+    for bit, (dr, dc) in enumerate(NEIGHBOR_OFFSETS):
+        if (r + dr, c + dc) in captured:
+            mask |= 1 << bit
+    return r * 5 + c, face, mask
+
+
+def decode_move(cell, face, mask):
+    r, c = divmod(int(cell), 5)
+    captured = [(r + dr, c + dc) for bit, (dr, dc) in enumerate(NEIGHBOR_OFFSETS) if int(mask) & (1 << bit)]
+    return r, c, int(face), captured
+
+
+def write_binary_dataset(path, boards, moves, metadata=None):
+    """Scrive boards (N, 25) e moves (N, 3) uint8 nel formato binario con header JSON."""
+    boards = np.ascontiguousarray(boards, dtype=np.uint8).reshape(-1, 25)
+    moves = np.ascontiguousarray(moves, dtype=np.uint8).reshape(-1, 3)
+    if len(boards) != len(moves):
+        raise ValueError(f"Numero di board ({len(boards)}) e mosse ({len(moves)}) diverso")
+
+    header = {
+        "version": FORMAT_VERSION,
+        "num_samples": len(boards),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "metadata": metadata or {},
+    }
+    # Gli offset dipendono dalla lunghezza dell'header che li contiene: itero finché sono stabili
+    header["boards_offset"] = header["moves_offset"] = 0
+    while True:
+        header_bytes = json.dumps(header).encode("utf-8")
+        prefix = len(MAGIC) + 4 + len(header_bytes)
+        boards_offset = -(-prefix // ALIGN) * ALIGN
+        moves_offset = -(-(boards_offset + boards.nbytes) // ALIGN) * ALIGN
+        if (boards_offset, moves_offset) == (header["boards_offset"], header["moves_offset"]):
+            break
+        header["boards_offset"] = boards_offset
+        header["moves_offset"] = moves_offset
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\x00" * (boards_offset - f.tell()))
+        f.write(boards.tobytes())
+        f.write(b"\x00" * (moves_offset - f.tell()))
+        f.write(moves.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' non è un dataset binario Cephalopod")
+        (length,) = struct.unpack("<I", f.read(4))
+        return json.loads(f.read(length).decode("utf-8"))
+
+
+def convert_pickle_dataset(pickle_path, out_path, metadata=None):
+    """Converte un dataset pickle [(str(board), move), ...] nel formato binario. Il parsing avviene una volta sola."""
+    start = time.time()
+    with open(pickle_path, "rb") as f:
+        raw_data = pickle.load(f)
+
+    boards = np.zeros((len(raw_data), 25), dtype=np.uint8)
+    moves = np.zeros((len(raw_data), 3), dtype=np.uint8)
+    for i, (board_str, move) in enumerate(raw_data):
+        boards[i] = parse_board_str(board_str)
+        moves[i] = encode_move(move)
+
+    meta = {"source": os.path.basename(pickle_path)}
+    meta.update(metadata or {})
+    write_binary_dataset(out_path, boards, moves, meta)
+    print(f"[✓] Convertiti {len(raw_data)} esempi da '{pickle_path}' a '{out_path}' in {time.time() - start:.2f} secondi.")
+
+
+class BinaryExpertDataset(Dataset):
+    """
+    Dataset esperto memory-mapped: restituisce (board (5, 5, 2) float, mossa [r, c, faccia] long)
+    come ExpertDataset, ma senza parsing. La mappatura viene aperta in modo lazy, così i worker
+    del DataLoader condividono le pagine del file invece di copiare i dati.
+    """
+
+    def __init__(self, path):
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(__file__), path)
+        self.path = path
+        self.header = read_header(path)
+        self.num_samples = self.header["num_samples"]
+        self._boards = None
+        self._moves = None
+
+    def _open(self):
+        if self._boards is None:
+            self._boards = np.memmap(self.path, dtype=np.uint8, mode="r",
+                                     offset=self.header["boards_offset"], shape=(self.num_samples, 25))
+            self._moves = np.memmap(self.path, dtype=np.uint8, mode="r",
+                                    offset=self.header["moves_offset"], shape=(self.num_samples, 3))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_boards"] = None
+        state["_moves"] = None
+        return state
+
+    def __len__(self):
+        return self.num_samples
+
+    def __getitem__(self, idx):
+        boards, moves = self.get_batch([idx])
+        return boards[0], moves[0]
+
+    def get_batch(self, indices):
+        """Ritorna i tensori (B, 5, 5, 2) e (B, 3) per gli indici richiesti, con operazioni vettorizzate."""
+        self._open()
+        indices = np.asarray(indices)
+        planes = encode_packed(self._boards[indices], layout="bc")
+        boards = torch.from_numpy(planes).permute(0, 2, 3, 1)
+
+        raw_moves = self._moves[indices].astype(np.int64)
+        rows, cols = np.divmod(raw_moves[:, 0], 5)
+        moves = torch.from_numpy(np.stack([rows, cols, raw_moves[:, 1]], axis=1))
+        return boards, moves
+
+    def raw_move(self, idx):
+        """Ritorna la mossa completa (r, c, top_face, captured) decodificata."""
+        self._open()
+        return decode_move(*self._moves[idx])
+
+
+if __name__ == "__main__":
+    convert_pickle_dataset(
+        os.path.join(os.path.dirname(__file__), "expert_dataset.pkl"),
+        os.path.join(os.path.dirname(__file__), "expert_dataset.bin"),
+    )
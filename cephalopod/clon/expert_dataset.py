@@ -1,11 +1,40 @@
+import numpy as np
 import torch
 from torch.utils.data import Dataset
+
+from cephalopod.core.encoding import encode_packed
+from cephalopod.core.packing import COLOR_OFFSET
 import pickle
 import os
 import ast
 import time
 
 
+def parse_board_str(board_str):
+    """Converte la stringa della board nei 25 codici di cella (vedi core/packing.py)."""
+    codes = np.zeros(25, dtype=np.uint8)
+    try:
+        raw = ast.literal_eval(board_str)
+    except Exception as e:
+        print(f"[ERRORE] Parsing board fallito: {e}")
+        return codes
+
+    for r in range(5):
+        for c in range(5):
+            val = raw[r][c]
+            if val:
+                try:
+                    color, face = val.strip("() ").split(",")
+                    color = color.strip()
+                    face = min(max(int(face), 1), 6)  # Clamp pips tra 1 e 6
+                    codes[r * 5 + c] = face + (COLOR_OFFSET["W"] if color != "B" else 0)
+                except Exception as e:
+                    print(f"[ERRORE] Encoding cella ({r},{c}): {val} — {e}")
+                    continue
+
+    return codes
+
+
 class ExpertDataset(Dataset):
     def __init__(self, path):
         start = time.time()
@@ -29,28 +58,7 @@ class ExpertDataset(Dataset):
         return encoded_board, encoded_move
 
     def encode_board(self, board_str):
-        board_tensor = torch.zeros((5, 5, 2), dtype=torch.float32)
-        try:
-            raw = ast.literal_eval(board_str)
-        except Exception as e:
-            print(f"[ERRORE] Parsing board fallito: {e}")
-            return board_tensor
-
-        for r in range(5):
-            for c in range(5):
-                val = raw[r][c]
-                if val:
-                    try:
-                        color, face = val.strip("() ").split(",")
-                        color = color.strip()
-                        face = int(face)
-                        board_tensor[r, c, 0] = 1 if color == "B" else 2
-                        board_tensor[r, c, 1] = min(max(face, 1), 6)  # Clamp pips tra 1 e 6
-                    except Exception as e:
-                        print(f"[ERRORE] Encoding cella ({r},{c}): {val} — {e}")
-                        continue
-
-        return board_tensor
+        return torch.from_numpy(encode_packed(parse_board_str(board_str), layout="bc")[0]).permute(1, 2, 0)
 
     def encode_move(self, move):
         r, c, face, _ = move
@@ -0,0 +1,181 @@
+import json
+import multiprocessing as mp
+import os
+import random
+import time
+
+import numpy as np
+from torch.utils.data import ConcatDataset
+
+from cephalopod.core.board import Board, Die
+from cephalopod.core.packing import board_codes
+from cephalopod.clon.binary_dataset import BinaryExpertDataset, encode_move, read_header, write_binary_dataset
+
+# Parametri
+SHARD_DIR = os.path.join(os.path.dirname(__file__), "expert_shards")
+GAMES_PER_SHARD = 50
+NUM_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+RANDOM_OPENING_MOVES = 4
+INDEX_NAME = "index.json"
+
+
+def default_expert():
+    from cephalopod.strategies.smart_lookahead5 import SmartLookaheadStrategy5
+    return SmartLookaheadStrategy5()
+
+
+def shard_path(out_dir, shard_id):
+    return os.path.join(out_dir, f"shard_{shard_id:05d}.bin")
+
+
+def shard_seed(seed, shard_id):
+    """Seed deterministico per shard: lo stesso shard rigenerato produce le stesse partite."""
+    return seed * 1_000_003 + shard_id
+
+
+def play_expert_game(expert, random_opening_moves=RANDOM_OPENING_MOVES):
+    """Gioca una partita esperto contro esperto e ritorna le liste (codici board, mossa codificata)."""
+    board = Board()
+    color = "B"
+    boards, moves = [], []
+
+    # Aperture casuali per diversificare le partite
+    for _ in range(random_opening_moves):
+        empty = board.get_empty_cells()
+        if not empty:
+            break
+        r, c = random.choice(empty)
+        boards.append(board_codes(board))
+        moves.append(encode_move((r, c, 1, [])))
+        board.place_die(r, c, Die(color, 1))
+        color = "W" if color == "B" else "B"
+
+    while not board.is_full():
+        move = expert.choose_move(board, color)
+        boards.append(board_codes(board))
+        moves.append(encode_move(move))
+        r, c, top_face, captured = move
+        for (rr, cc) in captured:
+            board.grid[rr][cc] = None
+        board.place_die(r, c, Die(color, top_face))
+        color = "W" if color == "B" else "B"
+
+    return boards, moves
+
+
+def generate_shard(shard_id, num_games, seed, out_dir, expert_factory=default_expert,
+                   random_opening_moves=RANDOM_OPENING_MOVES):
+    """Genera uno shard completo e lo scrive in modo atomico. Ritorna (shard_id, esempi, secondi)."""
+    start = time.time()
+    random.seed(shard_seed(seed, shard_id))
+    np.random.seed(shard_seed(seed, shard_id) % 2 ** 32)
+    expert = expert_factory()
+
+    boards, moves = [], []
+    for _ in range(num_games):
+        game_boards, game_moves = play_expert_game(expert, random_opening_moves)
+        boards.extend(game_boards)
+        moves.extend(game_moves)
+
+    metadata = {"shard_id": shard_id, "games": num_games, "seed": seed}
+    write_binary_dataset(shard_path(out_dir, shard_id), np.array(boards), np.array(moves), metadata)
+    return shard_id, len(boards), time.time() - start
+
+
+def _generate_shard_star(args):
+    return generate_shard(*args)
+
+
+def is_shard_complete(path, num_games, seed):
+    """Uno shard è completo se il file esiste con header valido (la scrittura è atomica) e parametri coerenti."""
+    if not os.path.exists(path):
+        return False
+    try:
+        meta = read_header(path)["metadata"]
+    except (ValueError, OSError, KeyError):
+        return False
+    return meta.get("games") == num_games and meta.get("seed") == seed
+
+
+def write_index(out_dir, num_shards=None):
+    """Raccoglie gli shard completi in un unico index.json con gli offset globali degli esempi."""
+    shards = []
+    total = 0
+    names = sorted(name for name in os.listdir(out_dir) if name.startswith("shard_") and name.endswith(".bin"))
+    for name in names:
+        header = read_header(os.path.join(out_dir, name))
+        if num_shards is not None and header["metadata"].get("shard_id", 0) >= num_shards:
+            continue
+        shards.append({"file": name, "start": total, "num_samples": header["num_samples"],
+                       "games": header["metadata"].get("games")})
+        total += header["num_samples"]
+
+    index = {"num_shards": len(shards), "num_samples": total, "shards": shards}
+    tmp_path = os.path.join(out_dir, INDEX_NAME + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, INDEX_NAME))
+    return index
+
+
+def load_sharded_dataset(out_dir=SHARD_DIR):
+    """Ritorna un ConcatDataset di BinaryExpertDataset, nell'ordine dell'index."""
+    with open(os.path.join(out_dir, INDEX_NAME)) as f:
+        index = json.load(f)
+    return ConcatDataset([BinaryExpertDataset(os.path.join(out_dir, s["file"])) for s in index["shards"]])
+
+
+def merge_shards(out_dir, out_path):
+    """Concatena tutti gli shard dell'index in un unico file binario (utile per BinaryExpertDataset)."""
+    with open(os.path.join(out_dir, INDEX_NAME)) as f:
+        index = json.load(f)
+    boards, moves = [], []
+    for s in index["shards"]:
+        ds = BinaryExpertDataset(os.path.join(out_dir, s["file"]))
+        ds._open()
+        boards.append(np.asarray(ds._boards))
+        moves.append(np.asarray(ds._moves))
+    write_binary_dataset(out_path, np.concatenate(boards), np.concatenate(moves),
+                         {"source": os.path.basename(out_dir), "shards": index["num_shards"]})
+    print(f"[✓] {index['num_samples']} esempi da {index['num_shards']} shard uniti in '{out_path}'")
+
+
+def generate_sharded_dataset(num_games=4000, out_dir=SHARD_DIR, games_per_shard=GAMES_PER_SHARD,
+                             num_workers=NUM_WORKERS, seed=0, expert_factory=default_expert,
+                             random_opening_moves=RANDOM_OPENING_MOVES):
+    """
+    Genera il dataset esperto in parallelo, uno shard di `games_per_shard` partite per task.
+    Gli shard già completi vengono saltati, quindi una generazione interrotta riprende da dove era rimasta.
+    `expert_factory` deve essere una funzione importabile (viene eseguita nei processi worker).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    num_shards = -(-num_games // games_per_shard)
+    tasks = []
+    for shard_id in range(num_shards):
+        games = min(games_per_shard, num_games - shard_id * games_per_shard)
+        if is_shard_complete(shard_path(out_dir, shard_id), games, seed):
+            continue
+        tasks.append((shard_id, games, seed, out_dir, expert_factory, random_opening_moves))
+
+    print(f"[INFO] Shard totali: {num_shards}, già completi: {num_shards - len(tasks)}, da generare: {len(tasks)}")
+    start = time.time()
+    if tasks:
+        if num_workers <= 1:
+            results = map(_generate_shard_star, tasks)
+            for done, (shard_id, samples, elapsed) in enumerate(results, 1):
+                print(f"[✓] Shard {shard_id} ({samples} esempi, {elapsed:.1f}s) — {done}/{len(tasks)}")
+        else:
+            ctx = mp.get_context("spawn")
+            with ctx.Pool(num_workers) as pool:
+                results = pool.imap_unordered(_generate_shard_star, tasks)
+                for done, (shard_id, samples, elapsed) in enumerate(results, 1):
+                    print(f"[✓] Shard {shard_id} ({samples} esempi, {elapsed:.1f}s) — {done}/{len(tasks)}")
+
+    index = write_index(out_dir, num_shards)
+    print(f"[✓] Dataset pronto: {index['num_samples']} esempi in {index['num_shards']} shard "
+          f"({time.time() - start:.1f}s)")
+    return index
+
+
+if __name__ == "__main__":
+    generate_sharded_dataset(num_games=4000)
@@ -2,6 +2,7 @@ import torch
 from torch.utils.data import DataLoader
 from clon.behavior import BehaviorCloningModel
 from expert_dataset import ExpertDataset
+from cephalopod.clon.binary_dataset import BinaryExpertDataset
 import random
 from cephalopod.core.board import Die, Board
 from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset
@@ -74,7 +75,10 @@ def generate_expert_dataset(num_games=1000, save_path="expert_dataset.pkl"):
 def train_behavior_model(epochs=10, model_save_path="policy_bc.pt", optimizer_path="optimizer_state.pt",
                          log_path="training_log.csv", patience=5, verbose=True, resume=True):
     print("[INFO] Caricamento del dataset...")
-    dataset = ExpertDataset("expert_dataset.pkl")
+    if os.path.exists(os.path.join(os.path.dirname(__file__), "expert_dataset.bin")):
+        dataset = BinaryExpertDataset("expert_dataset.bin")
+    else:
+        dataset = ExpertDataset("expert_dataset.pkl")
     dataloader = DataLoader(dataset, batch_size=128, shuffle=True)
     total_batches = len(dataloader)
     print(f"[INFO] Dataset caricato con {len(dataset)} esempi.")
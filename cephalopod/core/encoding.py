@@ -0,0 +1,74 @@
+# core/encoding.py
+
+import numpy as np
+
+from cephalopod.core.board import BOARD_SIZE
+from cephalopod.core.packing import die_code
+
+# Numero di piani per ciascun layout supportato:
+#   "alphazero": [miei dadi (0/1), mie facce / 6, facce avversarie / 6] dal punto di vista di `player`
+#   "bc":        [colore assoluto (1 = B, 2 = W), faccia (1..6)] come in ExpertDataset
+LAYOUT_CHANNELS = {"alphazero": 3, "bc": 2}
+
+_CELLS = BOARD_SIZE * BOARD_SIZE
+
+
+def pack_boards(boards, out=None):
+    """Converte una lista di Board in un array uint8 (B, 25) di codici di cella (vedi core/packing.py)."""
+    if out is None:
+        out = np.empty((len(boards), _CELLS), dtype=np.uint8)
+    for i, board in enumerate(boards):
+        out[i] = [die_code(cell) for row in board.grid for cell in row]
+    return out
+
+
+def encode_packed(packed, players=None, layout="alphazero", out=None):
+    """
+    Codifica un array di board impacchettate (B, 25) o (B, 5, 5) in un array float32 (B, C, 5, 5).
+    `players` (stringa o sequenza di "B"/"W") serve solo al layout "alphazero".
+    Se `out` è passato, i piani vengono scritti lì senza allocare un nuovo array.
+    """
+    channels = LAYOUT_CHANNELS[layout]
+    codes = np.asarray(packed).reshape(-1, _CELLS)
+    batch = codes.shape[0]
+    if out is None:
+        out = np.empty((batch, channels, BOARD_SIZE, BOARD_SIZE), dtype=np.float32)
+    elif not out.flags.c_contiguous:
+        raise ValueError("Il buffer di output deve essere C-contiguo")
+    flat = out.reshape(batch, channels, _CELLS)
+
+    is_white = codes > 6
+    is_black = (codes > 0) & ~is_white
+    faces = np.where(is_white, codes - 6, codes).astype(np.float32)
+
+    if layout == "bc":
+        flat[:, 0] = is_black + 2 * is_white
+        flat[:, 1] = faces
+        return out
+
+    if players is None:
+        raise ValueError("Il layout 'alphazero' richiede il giocatore di turno")
+    if isinstance(players, str):
+        player_is_black = np.full((batch, 1), players == "B")
+    else:
+        player_is_black = (np.asarray(players) == "B").reshape(batch, 1)
+    own = np.where(player_is_black, is_black, is_white)
+    opp = np.where(player_is_black, is_white, is_black)
+
+    flat[:, 0] = own
+    np.multiply(faces, own, out=flat[:, 1])
+    np.multiply(faces, opp, out=flat[:, 2])
+    flat[:, 1:] /= 6
+    return out
+
+
+def encode_boards(boards, players=None, layout="alphazero", out=None, as_tensor=False):
+    """
+    Codifica una lista di Board in un batch (B, C, 5, 5).
+    Con `as_tensor=True` ritorna un torch.Tensor che condivide la memoria con l'array NumPy.
+    """
+    encoded = encode_packed(pack_boards(boards), players, layout, out)
+    if as_tensor:
+        import torch
+        return torch.from_numpy(encoded)
+    return encoded
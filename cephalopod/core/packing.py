@@ -0,0 +1,82 @@
+# core/packing.py
+
+from cephalopod.core.board import Board, Die, BOARD_SIZE
+from cephalopod.core.symmetry import GATHER, NUM_SYMMETRIES
+
+# Ogni cella è codificata come un intero in [0, 12]:
+#   0 = vuota, 1..6 = dado "B" con quella faccia, 7..12 = dado "W" con faccia (codice - 6)
+EMPTY = 0
+NUM_CODES = 13
+COLOR_OFFSET = {"B": 0, "W": 6}
+
+
+def die_code(die):
+    if die is None:
+        return EMPTY
+    return die.top_face + COLOR_OFFSET[die.color]
+
+
+def code_to_die(code):
+    if code == EMPTY:
+        return None
+    if code <= 6:
+        return Die("B", code)
+    return Die("W", code - 6)
+
+
+def board_codes(board):
+    """Ritorna la tupla dei 25 codici di cella, riga per riga."""
+    return tuple(die_code(cell) for row in board.grid for cell in row)
+
+
+def relative_codes(board, player):
+    """Come board_codes, ma i dadi di `player` valgono 1..6 e quelli avversari 7..12."""
+    own_offset = COLOR_OFFSET[player]
+    codes = []
+    for row in board.grid:
+        for cell in row:
+            if cell is None:
+                codes.append(EMPTY)
+            elif COLOR_OFFSET[cell.color] == own_offset:
+                codes.append(cell.top_face)
+            else:
+                codes.append(cell.top_face + 6)
+    return tuple(codes)
+
+
+def codes_to_board(codes, size=BOARD_SIZE):
+    board = Board(size)
+    for i, code in enumerate(codes):
+        if code != EMPTY:
+            board.grid[i // size][i % size] = code_to_die(code)
+    return board
+
+
+def pack_codes(codes):
+    """Impacchetta i codici in un unico intero in base 13 (la cella 0 è la cifra meno significativa)."""
+    key = 0
+    for code in reversed(codes):
+        key = key * NUM_CODES + code
+    return key
+
+
+def unpack_key(key, cells=BOARD_SIZE * BOARD_SIZE):
+    codes = []
+    for _ in range(cells):
+        key, code = divmod(key, NUM_CODES)
+        codes.append(code)
+    return tuple(codes)
+
+
+def canonical_key(codes):
+    """
+    Ritorna (chiave, k): la chiave intera minima tra le 8 simmetrie della board
+    e l'indice k della simmetria che la produce.
+    """
+    best_key, best_k = None, 0
+    for k in range(NUM_SYMMETRIES):
+        gather = GATHER[k]
+        key = pack_codes([codes[i] for i in gather])
+        if best_key is None or key < best_key:
+            best_key, best_k = key, k
+    return best_key, best_k
@@ -0,0 +1,56 @@
+# core/symmetry.py
+
+from cephalopod.core.board import BOARD_SIZE
+
+NUM_SYMMETRIES = 8
+
+
+def transform_cell(r, c, k, size=BOARD_SIZE):
+    """
+    Applica la simmetria k (0..7) del quadrato alla cella (r, c).
+    0 = identità, 1-3 = rotazioni orarie di 90/180/270 gradi,
+    4 = specchio orizzontale, 5 = specchio verticale, 6 = trasposta, 7 = anti-trasposta.
+    """
+    n = size - 1
+    if k == 0:
+        return r, c
+    if k == 1:
+        return c, n - r
+    if k == 2:
+        return n - r, n - c
+    if k == 3:
+        return n - c, r
+    if k == 4:
+        return r, n - c
+    if k == 5:
+        return n - r, c
+    if k == 6:
+        return c, r
+    if k == 7:
+        return n - c, n - r
+    raise ValueError(f"Simmetria {k} non valida")
+
+
+def inverse_symmetry(k):
+    """Ritorna l'indice della simmetria inversa di k (solo le rotazioni di 90/270 non sono involuzioni)."""
+    return {1: 3, 3: 1}.get(k, k)
+
+
+def _build_tables(size):
+    # DEST[k][i]   = indice di destinazione della cella i sotto la simmetria k
+    # GATHER[k][j] = indice della cella sorgente che finisce in j (per np.take / gather)
+    dest, gather = [], []
+    for k in range(NUM_SYMMETRIES):
+        d = [0] * (size * size)
+        g = [0] * (size * size)
+        for r in range(size):
+            for c in range(size):
+                rr, cc = transform_cell(r, c, k, size)
+                d[r * size + c] = rr * size + cc
+                g[rr * size + cc] = r * size + c
+        dest.append(tuple(d))
+        gather.append(tuple(g))
+    return tuple(dest), tuple(gather)
+
+
+DEST, GATHER = _build_tables(BOARD_SIZE)
@@ -0,0 +1,212 @@
+import json
+import sqlite3
+import time
+
+from cephalopod.core.board import Board, Die, BOARD_SIZE
+from cephalopod.core.mechanics import get_opponent
+
+# Codifica delle mosse:
+#   placements: 1 byte per mossa = cella (r*5+c) * 6 + (top_face - 1)  -> 0..149
+#   masks:      4 bit per mossa, due mosse per byte (nibble basso = mossa pari)
+# La maschera ha un bit per vicino ortogonale catturato: bit 0 sopra, 1 sotto, 2 sinistra, 3 destra
+# (stesso ordine di clon/binary_dataset.py).
+NEIGHBOR_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DEFAULT_DB = "game_records.db"
+BUFFER_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY,
+    strategy_b  TEXT NOT NULL,
+    strategy_w  TEXT NOT NULL,
+    config_b    TEXT,
+    config_w    TEXT,
+    seed        INTEGER,
+    winner      TEXT,
+    b_count     INTEGER,
+    w_count     INTEGER,
+    num_moves   INTEGER,
+    seconds     REAL,
+    source      TEXT,
+    created     REAL,
+    meta        TEXT,
+    placements  BLOB NOT NULL,
+    masks       BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_games_strategy_b ON games(strategy_b);
+CREATE INDEX IF NOT EXISTS idx_games_strategy_w ON games(strategy_w);
+CREATE INDEX IF NOT EXISTS idx_games_config_b ON games(config_b);
+CREATE INDEX IF NOT EXISTS idx_games_config_w ON games(config_w);
+"""
+
+_COLUMNS = ["strategy_b", "strategy_w", "config_b", "config_w", "seed", "winner", "b_count", "w_count",
+            "num_moves", "seconds", "source", "created", "meta", "placements", "masks"]
+
+
+def encode_moves(moves):
+    """Lista di mosse (r, c, top_face, captured) -> (placements, masks) come bytes."""
+    placements = bytearray(len(moves))
+    masks = bytearray((len(moves) + 1) // 2)
+    for i, (r, c, face, captured) in enumerate(moves):
+        placements[i] = (r * BOARD_SIZE + c) * 6 + face - 1
+        mask = 0
+        for bit, (dr, dc) in enumerate(NEIGHBOR_OFFSETS):
+            if (r + dr, c + dc) in captured:
+                mask |= 1 << bit
+        masks[i // 2] |= mask << (4 * (i % 2))
+    return bytes(placements), bytes(masks)
+
+
+def decode_moves(placements, masks):
+    """Inverso di encode_moves."""
+    moves = []
+    for i, code in enumerate(placements):
+        cell, face = divmod(code, 6)
+        r, c = divmod(cell, BOARD_SIZE)
+        mask = (masks[i // 2] >> (4 * (i % 2))) & 0xF
+        captured = [(r + dr, c + dc) for bit, (dr, dc) in enumerate(NEIGHBOR_OFFSETS) if mask & (1 << bit)]
+        moves.append((r, c, face + 1, captured))
+    return moves
+
+
+def moves_from_log(moves_log):
+    """Mosse di CephalopodGameDynamic.moves_log (esclude le righe END/WINNER)."""
+    return [(m["row"], m["col"], m["top_face"], m["captured"]) for m in moves_log if m["player"] in ("B", "W")]
+
+
+def replay(moves, first_player="B"):
+    """Rigioca le mosse e produce la board dopo ciascuna di esse (la stessa istanza, aggiornata)."""
+    board = Board()
+    color = first_player
+    for r, c, face, captured in moves:
+        for (rr, cc) in captured:
+            board.grid[rr][cc] = None
+        board.place_die(r, c, Die(color, face))
+        yield board
+        color = get_opponent(color)
+
+
+def _config_text(config):
+    """Configurazione in JSON canonico, così la stessa config ha sempre la stessa stringa (indicizzabile)."""
+    if config is None or isinstance(config, str):
+        return config
+    return json.dumps(config, sort_keys=True, separators=(",", ":"))
+
+
+class GameStore:
+    """
+    Archivio SQLite delle partite: metadati interrogabili (strategie, config, seed, tempi, esito)
+    e sequenza di mosse compatta (~1.5 byte per mossa).
+    Gli inserimenti sono bufferizzati e scritti in un'unica transazione ogni `buffer_size` partite.
+    """
+
+    def __init__(self, path=DEFAULT_DB, buffer_size=BUFFER_SIZE):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_game(self, strategy_b, strategy_w, moves, winner=None, b_count=None, w_count=None, config_b=None,
+                 config_w=None, seed=None, seconds=None, source=None, meta=None):
+        placements, masks = encode_moves(moves)
+        self._buffer.append((strategy_b, strategy_w, _config_text(config_b), _config_text(config_w), seed, winner,
+                             b_count, w_count, len(moves), seconds, source, time.time(),
+                             json.dumps(meta) if meta is not None else None, placements, masks))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def add_game_log(self, strategy_b, strategy_w, moves_log, **kwargs):
+        """Registra una partita a partire dal log di CephalopodGameDynamic.simulate_game()."""
+        moves = moves_from_log(moves_log)
+        end = next((m["captured"] for m in moves_log if m["player"] == "END"), None)
+        if end and "b_count" not in kwargs:
+            b_part, w_part = end.split("=>")[1].split(",")
+            kwargs["b_count"] = int(b_part.split(":")[1])
+            kwargs["w_count"] = int(w_part.split(":")[1])
+        kwargs.setdefault("winner", moves_log[-1]["captured"] if moves_log[-1]["player"] == "WINNER" else None)
+        self.add_game(strategy_b, strategy_w, moves, **kwargs)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO games ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                self._buffer)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def query(self, strategy=None, color=None, config=None, winner=None, source=None, limit=None, with_moves=True):
+        """
+        Partite filtrate per strategia (come B, W o entrambi con color=None), config, vincitore o sorgente.
+        Ritorna un iteratore di dict; con with_moves=True include la lista di mosse decodificata.
+        """
+        self.flush()
+        where, params = [], []
+        if strategy is not None:
+            if color in ("B", "W"):
+                where.append(f"strategy_{color.lower()} = ?")
+                params.append(strategy)
+            else:
+                where.append("(strategy_b = ? OR strategy_w = ?)")
+                params += [strategy, strategy]
+        if config is not None:
+            where.append("(config_b = ? OR config_w = ?)")
+            params += [_config_text(config)] * 2
+        if winner is not None:
+            where.append("winner = ?")
+            params.append(winner)
+        if source is not None:
+            where.append("source = ?")
+            params.append(source)
+        sql = f"SELECT id, {', '.join(_COLUMNS)} FROM games"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        for row in self.conn.execute(sql, params):
+            record = dict(zip(["id"] + _COLUMNS, row))
+            placements, masks = record.pop("placements"), record.pop("masks")
+            for key in ("config_b", "config_w", "meta"):
+                if record[key] is not None and record[key][:1] in "{[":
+                    record[key] = json.loads(record[key])
+            if with_moves:
+                record["moves"] = decode_moves(placements, masks)
+            yield record
+
+    def get_moves(self, game_id):
+        self.flush()
+        row = self.conn.execute("SELECT placements, masks FROM games WHERE id = ?", (game_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Partita {game_id} non trovata")
+        return decode_moves(*row)
+
+    def win_counts(self):
+        """{strategia: (partite, vittorie)} su tutte le partite registrate, calcolato in SQL."""
+        self.flush()
+        rows = self.conn.execute("""
+            SELECT name, COUNT(*), SUM(won) FROM (
+                SELECT strategy_b AS name, winner = 'B' AS won FROM games
+                UNION ALL
+                SELECT strategy_w AS name, winner = 'W' AS won FROM games
+            ) GROUP BY name
+        """).fetchall()
+        return {name: (games, wins or 0) for name, games, wins in rows}
+
+    def __len__(self):
+        self.flush()
+        return self.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
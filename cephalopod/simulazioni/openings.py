@@ -0,0 +1,211 @@
+import json
+import math
+import multiprocessing as mp
+import os
+import random
+import statistics
+import zlib
+
+from cephalopod.core.board import Board, Die
+from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset, get_opponent
+from cephalopod.core.packing import board_codes, canonical_key
+from cephalopod.game_modes.cephalopod_game_dynamic import CephalopodGameDynamic
+from cephalopod.strategies.registry import STRATEGY_REGISTRY
+
+# Parametri
+NUM_OPENINGS = 32
+OPENING_PLIES = 4
+OPENINGS_PATH = "openings.json"
+NUM_WORKERS = os.cpu_count() or 1
+CHUNKSIZE = 4
+
+
+def legal_moves(board):
+    """Mosse legali nel formato (r, c, top_face, captured), come in TrainingViewer.play_turn."""
+    moves = []
+    for (r, c) in board.get_empty_cells():
+        capturing_options = find_capturing_subsets(board, r, c)
+        if capturing_options:
+            subset, sum_pips = choose_capturing_subset(capturing_options)
+            moves.append((r, c, sum_pips, subset))
+        else:
+            moves.append((r, c, 1, []))
+    return moves
+
+
+def apply_move(board, move, color):
+    r, c, top_face, captured = move
+    for (rr, cc) in captured:
+        board.grid[rr][cc] = None
+    board.place_die(r, c, Die(color, top_face))
+
+
+def generate_openings(num_openings=NUM_OPENINGS, plies=OPENING_PLIES, seed=0, max_attempts=100000):
+    """
+    Insieme fisso di aperture: `plies` mosse legali casuali a partire dalla board vuota (B muove per primo).
+    Le posizioni equivalenti per simmetria sono scartate, così ogni apertura porta informazione nuova.
+    """
+    rng = random.Random(seed)
+    openings, seen = [], set()
+    for _ in range(max_attempts):
+        if len(openings) >= num_openings:
+            break
+        board, color, moves = Board(), "B", []
+        for _ in range(plies):
+            move = rng.choice(legal_moves(board))
+            apply_move(board, move, color)
+            moves.append(move)
+            color = get_opponent(color)
+        key = canonical_key(board_codes(board))
+        if key not in seen:
+            seen.add(key)
+            openings.append(moves)
+    return openings
+
+
+def save_openings(openings, path=OPENINGS_PATH):
+    with open(path, "w") as f:
+        json.dump([[[r, c, face, [list(cell) for cell in captured]] for r, c, face, captured in moves]
+                   for moves in openings], f)
+
+
+def load_openings(path=OPENINGS_PATH):
+    with open(path) as f:
+        data = json.load(f)
+    return [[(r, c, face, [tuple(cell) for cell in captured]) for r, c, face, captured in moves] for moves in data]
+
+
+def start_from_opening(strategy_B, strategy_W, opening, max_dice_per_player=24):
+    """CephalopodGameDynamic con le mosse d'apertura già giocate (e registrate nel log)."""
+    game = CephalopodGameDynamic(strategy_B, strategy_W, max_dice_per_player)
+    for move in opening:
+        color = game.current_player
+        apply_move(game.board, move, color)
+        game.dice_remaining[color] -= 1
+        r, c, top_face, captured = move
+        game.moves_log.append({"move_num": game.move_num, "player": color, "row": r, "col": c,
+                               "top_face": top_face, "captured": list(captured)})
+        game.move_num += 1
+        game.current_player = get_opponent(color)
+    return game
+
+
+def crn_seed(base_seed, opponent_name, opening_index, color):
+    """
+    Seed comune (common random numbers): dipende da avversario, apertura e colore ma non dal candidato,
+    quindi tutti i candidati affrontano la stessa sequenza casuale nella stessa partita.
+    """
+    return zlib.crc32(f"{base_seed}|{opponent_name}|{opening_index}|{color}".encode("utf-8"))
+
+
+def _factory(spec):
+    """Nome del registry oppure factory picklable (classe, functools.partial)."""
+    return STRATEGY_REGISTRY[spec] if isinstance(spec, str) else spec
+
+
+def play_opening_game(task):
+    """Worker: il candidato gioca un'apertura con il colore indicato. Punteggio e margine dal suo punto di vista."""
+    candidate, candidate_spec, opponent, opponent_spec, opening_index, opening, color, seed, max_dice = task
+    random.seed(seed)
+    try:
+        import numpy as np
+        np.random.seed(seed)
+    except ImportError:
+        pass
+    me, them = _factory(candidate_spec)(), _factory(opponent_spec)()
+    game = start_from_opening(me if color == "B" else them, them if color == "B" else me, opening, max_dice)
+    game.simulate_game()
+    mine = sum(1 for row in game.board.grid for d in row if d and d.color == color)
+    theirs = sum(1 for row in game.board.grid for d in row if d and d.color != color)
+    return {
+        "candidate": candidate,
+        "opponent": opponent,
+        "opening": opening_index,
+        "color": color,
+        "score": 1 if mine > theirs else 0,
+        "margin": mine - theirs,
+    }
+
+
+def evaluate_candidates(candidates, opponents, openings, seed=0, num_workers=NUM_WORKERS, max_dice_per_player=24):
+    """
+    Ogni candidato gioca ogni apertura con entrambi i colori contro ogni avversario.
+    `candidates` e `opponents` sono dict nome -> nome del registry o factory picklable.
+    Ritorna {candidato: lista di risultati} con le liste allineate sulla stessa chiave
+    (avversario, apertura, colore), pronte per paired_stats.
+    """
+    tasks = [(cand, cand_spec, opp, opp_spec, i, opening, color, crn_seed(seed, opp, i, color), max_dice_per_player)
+             for cand, cand_spec in candidates.items()
+             for opp, opp_spec in opponents.items()
+             for i, opening in enumerate(openings)
+             for color in ("B", "W")]
+
+    if num_workers <= 1:
+        records = list(map(play_opening_game, tasks))
+    else:
+        ctx = mp.get_context("spawn")
+        with ctx.Pool(num_workers) as pool:
+            records = list(pool.imap_unordered(play_opening_game, tasks, chunksize=CHUNKSIZE))
+
+    results = {cand: [] for cand in candidates}
+    for record in sorted(records, key=lambda r: (r["opponent"], r["opening"], r["color"])):
+        results[record["candidate"]].append(record)
+    return results
+
+
+def paired_stats(results_a, results_b, key="score"):
+    """
+    Statistiche appaiate tra due candidati sulle stesse partite (stessa apertura, colore, avversario).
+    La varianza della differenza esclude quella comune alle due serie: servono molte meno partite
+    per distinguere due candidati rispetto a campioni indipendenti.
+    """
+    a = [r[key] for r in results_a]
+    b = [r[key] for r in results_b]
+    if len(a) != len(b) or not a:
+        raise ValueError("Le due serie devono essere non vuote e allineate sulle stesse partite")
+    diffs = [x - y for x, y in zip(a, b)]
+    n = len(diffs)
+    mean_diff = statistics.mean(diffs)
+    se = statistics.stdev(diffs) / math.sqrt(n) if n > 1 else math.inf
+    if se == 0:
+        t = 0.0 if mean_diff == 0 else math.copysign(math.inf, mean_diff)
+    else:
+        t = mean_diff / se
+    better = sum(1 for d in diffs if d > 0)
+    worse = sum(1 for d in diffs if d < 0)
+
+    # Test del segno (binomiale esatto, bilaterale) sulle sole partite discordanti
+    discordant = better + worse
+    k = min(better, worse)
+    p_value = min(1.0, 2 * sum(math.comb(discordant, i) for i in range(k + 1)) / 2 ** discordant) if discordant else 1.0
+
+    return {
+        "games": n,
+        "mean_a": statistics.mean(a),
+        "mean_b": statistics.mean(b),
+        "mean_diff": mean_diff,
+        "se": se,
+        "t": t,
+        "better": better,
+        "worse": worse,
+        "sign_p_value": p_value,
+    }
+
+
+def compare_to_baseline(results, baseline, key="score"):
+    """paired_stats di ogni candidato contro `baseline` (uno dei candidati valutati)."""
+    return {cand: paired_stats(res, results[baseline], key) for cand, res in results.items() if cand != baseline}
+
+
+if __name__ == "__main__":
+    if os.path.exists(OPENINGS_PATH):
+        openings = load_openings()
+    else:
+        openings = generate_openings()
+        save_openings(openings)
+
+    results = evaluate_candidates({"Goat5": "Goat5", "SmartLookahead": "SmartLookahead", "SmartBA": "SmartBA"},
+                                  {"Naive": "Naive", "Aggressive": "Aggressive"}, openings)
+    for cand, stats in compare_to_baseline(results, "SmartLookahead").items():
+        print(f"{cand} vs SmartLookahead: Δ={stats['mean_diff']:+.3f} ± {stats['se']:.3f} "
+              f"({stats['better']}+/{stats['worse']}-, p={stats['sign_p_value']:.3f}) su {stats['games']} partite")
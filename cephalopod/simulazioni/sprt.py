@@ -0,0 +1,148 @@
+import math
+
+from cephalopod.game_modes.cephalopod_game_dynamic import CephalopodGameDynamic
+
+# Parametri
+CONFIDENCE = 0.95
+P0, P1 = 0.45, 0.55  # Ipotesi SPRT: win rate dello sfidante <= P0 contro >= P1
+MAX_PAIRS = 50
+MIN_PAIRS = 1
+
+
+def _betacf(a, b, x):
+    """Frazione continua della beta incompleta (Lentz)."""
+    tiny = 1e-30
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 200):
+        m2 = 2 * m
+        for num in (m * (b - m) * x / ((a + m2 - 1) * (a + m2)),
+                    -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1))):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def beta_cdf(x, a, b):
+    """P(X <= x) per X ~ Beta(a, b)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _betacf(b, a, 1 - x) / b
+
+
+class SequentialTest:
+    """
+    Decide se lo sfidante è più forte dell'avversario man mano che arrivano i risultati
+    (1 vittoria, 0.5 pareggio, 0 sconfitta, dal punto di vista dello sfidante).
+      - "sprt":  test di Wald tra win rate P0 e P1, errori alfa = beta = 1 - confidence
+      - "bayes": posterior Beta(1 + W, 1 + L) sul win rate, stop se P(p > 0.5) esce da [1 - confidence, confidence]
+    decision() ritorna "win", "loss" oppure None finché il risultato non è deciso.
+    """
+
+    def __init__(self, method="bayes", confidence=CONFIDENCE, p0=P0, p1=P1):
+        if method not in ("sprt", "bayes"):
+            raise ValueError(f"Metodo sconosciuto: {method}")
+        self.method = method
+        self.confidence = confidence
+        self.p0, self.p1 = p0, p1
+        self.wins = 0.0
+        self.losses = 0.0
+
+    def update(self, score):
+        self.wins += score
+        self.losses += 1 - score
+
+    def llr(self):
+        """Log-likelihood ratio H1/H0; i pareggi contano mezza vittoria e mezza sconfitta."""
+        return (self.wins * math.log(self.p1 / self.p0)
+                + self.losses * math.log((1 - self.p1) / (1 - self.p0)))
+
+    def prob_better(self):
+        """P(win rate > 0.5) con prior uniforme."""
+        return 1.0 - beta_cdf(0.5, 1 + self.wins, 1 + self.losses)
+
+    def decision(self):
+        error = 1 - self.confidence
+        if self.method == "sprt":
+            llr = self.llr()
+            if llr >= math.log((1 - error) / error):
+                return "win"
+            if llr <= math.log(error / (1 - error)):
+                return "loss"
+            return None
+        p = self.prob_better()
+        if p >= self.confidence:
+            return "win"
+        if p <= error:
+            return "loss"
+        return None
+
+
+def run_sequential_match(play_pair, max_pairs=MAX_PAIRS, min_pairs=MIN_PAIRS, test=None, verbose=False):
+    """
+    Gioca coppie di partite a colori invertiti con `play_pair(indice)` -> (score1, score2),
+    punteggi dal punto di vista dello sfidante, finché il test non decide o si arriva a max_pairs.
+    """
+    test = test or SequentialTest()
+    scores = []
+    decision = None
+    for pair in range(max_pairs):
+        for score in play_pair(pair):
+            scores.append(score)
+            test.update(score)
+        decision = test.decision()
+        if verbose:
+            print(f"[SPRT] coppia {pair + 1}: {test.wins:g}W/{test.losses:g}L -> {decision or '...'}")
+        if decision and pair + 1 >= min_pairs:
+            break
+
+    games = len(scores)
+    return {
+        "scores": scores,
+        "wins": sum(1 for s in scores if s == 1),
+        "losses": sum(1 for s in scores if s == 0),
+        "draws": sum(1 for s in scores if s == 0.5),
+        "games": games,
+        "games_saved": 2 * max_pairs - games,
+        "win_rate": sum(scores) / games if games else 0.0,
+        "decision": decision,
+    }
+
+
+def cephalopod_pair(challenger, opponent, max_dice_per_player=24):
+    """play_pair per CephalopodGameDynamic: lo sfidante gioca prima B e poi W."""
+    def play_pair(_):
+        scores = []
+        for strategy_B, strategy_W, challenger_color in ((challenger, opponent, "B"), (opponent, challenger, "W")):
+            log = CephalopodGameDynamic(strategy_B, strategy_W, max_dice_per_player).simulate_game()
+            scores.append(1 if log[-1]["captured"] == challenger_color else 0)
+        return scores
+    return play_pair
+
+
+def simulate_match_sequential(strategy1, strategy2, num_games=10, method="bayes", confidence=CONFIDENCE,
+                              verbose=False):
+    """
+    Come tuning_launcher.simulate_match (stesso dict di vittorie), ma si ferma appena il test
+    sequenziale decide. `num_games` resta il tetto massimo; le partite risparmiate sono in "games_saved".
+    """
+    result = run_sequential_match(cephalopod_pair(strategy1, strategy2), max_pairs=max(1, num_games // 2),
+                                  test=SequentialTest(method, confidence), verbose=verbose)
+    return {
+        "strategy1": result["wins"],
+        "strategy2": result["losses"],
+        "games": result["games"],
+        "games_saved": result["games_saved"],
+        "decision": result["decision"],
+    }
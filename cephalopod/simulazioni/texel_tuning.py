@@ -0,0 +1,370 @@
+import csv
+import json
+import os
+import time
+
+import numpy as np
+
+from cephalopod.core.board import BOARD_SIZE
+from cephalopod.core.packing import COLOR_OFFSET, EMPTY, board_codes, relative_codes
+from cephalopod.RL.linear_rl_player import SUBSET_IDX, SUBSET_SIZE
+from cephalopod.simulazioni.game_records import GameStore, replay
+
+# Tuning offline dei pesi di valutazione (stile Texel): le feature delle posizioni si estraggono una
+# volta sola dalle partite del GameStore, poi ogni vettore di pesi è solo un prodotto matriciale.
+# Una config è buona se sigmoid(K * valutazione) predice bene l'esito finale della partita.
+
+# Parametri
+DB_PATH = "game_records.db"
+POSITIONS_PATH = "texel_positions.npz"
+RESULTS_PATH = "texel_screening.csv"
+BEST_PATH = "best_config_texel.json"
+MIN_PLY = 4          # le prime mosse dicono poco sull'esito: si scartano
+CHUNK_CONFIGS = 512  # config valutate insieme (memoria ~ CHUNK_CONFIGS x posizioni uniche)
+K_RANGE = (1e-3, 10.0)
+K_ITERATIONS = 30
+CORPUS_STRATEGIES = ["SmartLookahead", "Goat5", "Goat?", "V1", "we2", "Heuristic", "Aggressive", "Naive"]
+
+_CELLS = BOARD_SIZE * BOARD_SIZE
+
+# Feature della posizione dopo una mossa, dal punto di vista di chi l'ha giocata (tocca all'avversario)
+FEATURE_NAMES = [
+    "my_dice", "opp_dice", "my_six", "opp_six", "my_one", "opp_one",
+    "opp_six_captures",  # mosse avversarie che catturano con somma 6
+    "my_exposed",        # miei dadi non-6 catturabili, sommati sulle mosse avversarie
+    "multi_exposed",     # mosse avversarie che catturano almeno 2 miei dadi non-6
+    "captured_opp",      # dadi avversari non-6 catturati dalla mossa appena giocata
+    "captured_multi",    # 1 se la mossa ne ha catturati almeno 2
+]
+_F = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# Valutatori lineari: peso -> [(feature, coefficiente)]; "fixed" sono i termini con peso costante.
+# I segni riproducono il codice originale: in tuning_resilient_minimax la penalità di
+# simulate_opponent_response viene sottratta, il guadagno di reward_capture_gain sommato.
+EVALUATORS = {
+    # strategies/tunMinMax.TunableMinimaxStrategy.evaluate_board
+    "tunmin": {
+        "fixed": [("my_dice", 1.0), ("opp_dice", -1.0)],
+        "weights": {
+            "capture_6": [("my_six", 1.0)],
+            "avoid_enemy_6": [("opp_six", 1.0)],
+        },
+    },
+    # simulazioni/tornei/tuning_resilient_minimax.py (evaluate_board + penalità/guadagno della mossa)
+    "resilient": {
+        "fixed": [],
+        "weights": {
+            "my_piece": [("my_dice", 1.0)],
+            "my_six": [("my_six", 1.0)],
+            "my_one": [("my_one", 1.0)],
+            "opp_piece": [("opp_dice", 1.0)],
+            "opp_six": [("opp_six", 1.0)],
+            "opp_one": [("opp_one", 1.0)],
+            "allow_opp_6": [("opp_six_captures", -1.0)],
+            "lost_my_piece": [("my_exposed", -1.0)],
+            "lost_multi_my_piece": [("multi_exposed", -1.0)],
+            "captured_opp_piece": [("captured_opp", 1.0)],
+            "captured_multi_opp": [("captured_multi", 1.0)],
+        },
+    },
+    # ui/tuning_optuna.MinimaxStrategy
+    "optuna_ui": {
+        "fixed": [],
+        "weights": {
+            "piece": [("my_dice", 1.0)],
+            "bonus_six": [("my_six", 1.0)],
+            "opponent_piece": [("opp_dice", -1.0)],
+            "opponent_six": [("opp_six", -1.0)],
+        },
+    },
+}
+
+
+def position_features(codes, captured_opp=None):
+    """
+    Feature di un batch di board (N, 25) in codici relativi (1..6 dadi di chi ha appena mosso, 7..12 avversari).
+    `captured_opp` (N,) = dadi avversari non-6 catturati dalla mossa che ha prodotto la posizione.
+    Ritorna un array int16 (N, len(FEATURE_NAMES)).
+    """
+    codes = np.asarray(codes).reshape(-1, _CELLS)
+    batch = codes.shape[0]
+    mine = (codes > 0) & (codes <= 6)
+    theirs = codes > 6
+    empty = codes == 0
+    faces = np.where(theirs, codes - 6, codes)
+
+    # Cattura scelta dall'avversario in ogni cella vuota (come choose_capturing_subset, vedi linear_rl_player)
+    padded_faces = np.concatenate([faces, np.zeros((batch, 1), dtype=faces.dtype)], axis=1)
+    padded_occ = np.concatenate([~empty, np.ones((batch, 1), dtype=bool)], axis=1)
+    sums = padded_faces[:, SUBSET_IDX].sum(axis=-1)
+    valid = padded_occ[:, SUBSET_IDX].all(axis=-1) & (SUBSET_SIZE > 0) & empty[:, :, None] & (sums <= 6)
+    priority = np.where(valid, SUBSET_SIZE * 8 + sums, -1)
+    best = priority.argmax(axis=-1)
+    has_capture = valid.any(axis=-1)
+    chosen_sum = np.take_along_axis(sums, best[..., None], axis=-1)[..., 0]
+
+    # Miei dadi non-6 nel sottoinsieme scelto (la colonna di padding non è mai "mia")
+    exposed = np.concatenate([mine & (faces != 6), np.zeros((batch, 1), dtype=bool)], axis=1)
+    chosen_cells = SUBSET_IDX[np.arange(_CELLS)[None, :], best]  # (N, 25, 4)
+    lost = np.take_along_axis(exposed, chosen_cells.reshape(batch, -1), axis=1).reshape(batch, _CELLS, 4).sum(-1)
+    lost = np.where(has_capture, lost, 0)
+
+    features = np.zeros((batch, len(FEATURE_NAMES)), dtype=np.int16)
+    features[:, _F["my_dice"]] = mine.sum(axis=1)
+    features[:, _F["opp_dice"]] = theirs.sum(axis=1)
+    features[:, _F["my_six"]] = (mine & (faces == 6)).sum(axis=1)
+    features[:, _F["opp_six"]] = (theirs & (faces == 6)).sum(axis=1)
+    features[:, _F["my_one"]] = (mine & (faces == 1)).sum(axis=1)
+    features[:, _F["opp_one"]] = (theirs & (faces == 1)).sum(axis=1)
+    features[:, _F["opp_six_captures"]] = (has_capture & (chosen_sum == 6)).sum(axis=1)
+    features[:, _F["my_exposed"]] = lost.sum(axis=1)
+    features[:, _F["multi_exposed"]] = (lost >= 2).sum(axis=1)
+    if captured_opp is not None:
+        captured_opp = np.asarray(captured_opp)
+        features[:, _F["captured_opp"]] = captured_opp
+        features[:, _F["captured_multi"]] = captured_opp >= 2
+    return features
+
+
+def extract_positions(store, min_ply=MIN_PLY, limit=None, **query):
+    """
+    Rigioca le partite del GameStore (filtrate come in GameStore.query) e ritorna
+    (features, outcome): una riga per ogni posizione dalla mossa `min_ply` in poi, con l'esito
+    (1 vittoria, 0 sconfitta, 0.5 altrimenti) dal punto di vista di chi ha giocato la mossa.
+    """
+    codes, captured, outcomes = [], [], []
+    for record in store.query(limit=limit, **query):
+        before = [EMPTY] * _CELLS
+        for ply, ((r, c, face, cells), board) in enumerate(zip(record["moves"], replay(record["moves"]))):
+            color = "B" if ply % 2 == 0 else "W"
+            if ply >= min_ply:
+                opp_offset = COLOR_OFFSET["W" if color == "B" else "B"]
+                captured.append(sum(1 for (rr, cc) in cells
+                                    if before[rr * BOARD_SIZE + cc] - opp_offset in (1, 2, 3, 4, 5)))
+                codes.append(relative_codes(board, color))
+                winner = record["winner"]
+                outcomes.append(1.0 if winner == color else 0.0 if winner in ("B", "W") else 0.5)
+            before = board_codes(board)
+    if not codes:
+        return np.zeros((0, len(FEATURE_NAMES)), dtype=np.int16), np.zeros(0, dtype=np.float32)
+    return position_features(np.array(codes, dtype=np.int64), captured), np.array(outcomes, dtype=np.float32)
+
+
+def save_positions(features, outcome, path=POSITIONS_PATH):
+    np.savez_compressed(path, features=features, outcome=outcome, names=np.array(FEATURE_NAMES))
+
+
+def load_positions(path=POSITIONS_PATH):
+    data = np.load(path)
+    if list(data["names"]) != FEATURE_NAMES:
+        raise ValueError(f"{path}: feature diverse da FEATURE_NAMES, rigenerare il file")
+    return data["features"], data["outcome"]
+
+
+class PositionSet:
+    """
+    Posizioni raggruppate per vettore di feature identico: le feature sono piccoli conteggi,
+    quindi molte posizioni condividono la stessa riga. Per ogni riga si tengono conteggio,
+    somma e somma dei quadrati degli esiti, così la loss resta esatta.
+    """
+
+    def __init__(self, features, outcome):
+        outcome = np.asarray(outcome, dtype=np.float64)
+        self.num_positions = len(outcome)
+        self._group(np.asarray(features), np.ones_like(outcome), outcome, outcome ** 2)
+
+    def _group(self, features, count, sum_y, sum_y2):
+        self.features, inverse = np.unique(features, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        self.count = np.bincount(inverse, weights=count, minlength=len(self.features))
+        self.sum_y = np.bincount(inverse, weights=sum_y, minlength=len(self.features))
+        self.sum_y2 = np.bincount(inverse, weights=sum_y2, minlength=len(self.features))
+        self.x = self.features.astype(np.float64)
+
+    def project(self, columns):
+        """
+        Stesso insieme con le sole feature in `columns` (le altre azzerate) e righe raggruppate di nuovo.
+        Un valutatore che usa 4 feature vede poche centinaia di righe invece di migliaia.
+        """
+        features = np.zeros_like(self.features)
+        features[:, columns] = self.features[:, columns]
+        projected = PositionSet.__new__(PositionSet)
+        projected.num_positions = self.num_positions
+        projected._group(features, self.count, self.sum_y, self.sum_y2)
+        return projected
+
+    def __len__(self):
+        return len(self.features)
+
+    def loss(self, evals, k):
+        """
+        Errore quadratico medio tra esito e sigmoid(k * valutazione).
+        `evals` (C, U) valutazioni di C config sulle U righe uniche, `k` (C,) o scalare. Ritorna (C,).
+        """
+        p = 1.0 / (1.0 + np.exp(-np.clip(np.asarray(k, dtype=np.float64).reshape(-1, 1) * evals, -50, 50)))
+        total = (self.count * p * p - 2 * self.sum_y * p).sum(axis=1) + self.sum_y2.sum()
+        return total / self.num_positions
+
+
+def evaluator_matrix(configs, evaluator="tunmin"):
+    """
+    Config (dict di pesi) -> matrice (C, F) tale che valutazione = feature @ riga.
+    Ritorna anche i pesi delle config che non compaiono nella valutazione (nessun effetto sul punteggio).
+    """
+    spec = EVALUATORS[evaluator]
+    base = np.zeros(len(FEATURE_NAMES))
+    for feature, coef in spec["fixed"]:
+        base[_F[feature]] += coef
+    matrix = np.tile(base, (len(configs), 1))
+    for i, config in enumerate(configs):
+        for key, terms in spec["weights"].items():
+            for feature, coef in terms:
+                matrix[i, _F[feature]] += coef * config.get(key, 0)
+    unused = sorted({key for config in configs for key in config} - set(spec["weights"]))
+    return matrix, unused
+
+
+def fit_k(positions, evals, k_range=K_RANGE, iterations=K_ITERATIONS):
+    """K ottimale per ogni config: sezione aurea su log K, vettorizzata su tutte le righe di `evals`."""
+    lo = np.full(len(evals), np.log(k_range[0]))
+    hi = np.full(len(evals), np.log(k_range[1]))
+    ratio = (np.sqrt(5) - 1) / 2
+    a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+    fa, fb = positions.loss(evals, np.exp(a)), positions.loss(evals, np.exp(b))
+    for _ in range(iterations):
+        left = fa < fb
+        hi = np.where(left, b, hi)
+        lo = np.where(left, lo, a)
+        new_a = np.where(left, hi - ratio * (hi - lo), b)
+        new_b = np.where(left, a, lo + ratio * (hi - lo))
+        a, b = new_a, new_b
+        fa_new = positions.loss(evals, np.exp(a))
+        fb_new = positions.loss(evals, np.exp(b))
+        fa, fb = np.where(left, fa_new, fb), np.where(left, fa, fb_new)
+    k = np.exp((lo + hi) / 2)
+    return k, positions.loss(evals, k)
+
+
+def screen_configs(configs, positions, evaluator="tunmin", chunk=CHUNK_CONFIGS, verbose=True):
+    """
+    Loss di Texel di ogni config (K ottimizzato per config, così la scala dei pesi non conta).
+    Le config con la stessa matrice di valutazione sono calcolate una volta sola.
+    Ritorna (loss, k) come array allineati a `configs`.
+    """
+    matrix, unused = evaluator_matrix(configs, evaluator)
+    distinct, inverse = np.unique(matrix, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    positions = positions.project(np.flatnonzero(np.any(distinct != 0, axis=0)))
+    if verbose:
+        print(f"[✓] {len(configs)} config -> {len(distinct)} valutatori distinti, "
+              f"{positions.num_positions} posizioni -> {len(positions)} righe uniche")
+        if unused:
+            print(f"[WARN] Pesi senza effetto su '{evaluator}': {', '.join(unused)}")
+
+    losses, ks = np.empty(len(distinct)), np.empty(len(distinct))
+    start = time.time()
+    for lo in range(0, len(distinct), chunk):
+        evals = distinct[lo:lo + chunk] @ positions.x.T
+        ks[lo:lo + chunk], losses[lo:lo + chunk] = fit_k(positions, evals)
+        if verbose:
+            print(f"[{min(lo + chunk, len(distinct))}/{len(distinct)}] {time.time() - start:.1f}s")
+    return losses[inverse], ks[inverse]
+
+
+def fit_weights(positions, evaluator="tunmin", init=None, iterations=2000, lr=0.05):
+    """
+    Discesa del gradiente (Adam) sulla loss di Texel per i pesi di `evaluator`, con log K appreso insieme.
+    Parte da `init` (dict di pesi, default 0) e ritorna (pesi, k, loss).
+    """
+    spec = EVALUATORS[evaluator]
+    keys = list(spec["weights"])
+    init = init or {}
+    fixed, _ = evaluator_matrix([{}], evaluator)
+    # Colonna della matrice di valutazione per ciascun peso: d(valutazione)/d(peso) = x @ basis[j]
+    basis = np.zeros((len(keys), len(FEATURE_NAMES)))
+    for j, key in enumerate(keys):
+        for feature, coef in spec["weights"][key]:
+            basis[j, _F[feature]] += coef
+    positions = positions.project(np.flatnonzero(np.any(basis != 0, axis=0) | (fixed[0] != 0)))
+    x_fixed = positions.x @ fixed[0]
+    x_basis = positions.x @ basis.T  # (U, P)
+
+    theta = np.array([float(init.get(key, 0.0)) for key in keys] + [0.0])  # ultimo = log K
+    m, v = np.zeros_like(theta), np.zeros_like(theta)
+    for step in range(1, iterations + 1):
+        k = np.exp(theta[-1])
+        e = x_fixed + x_basis @ theta[:-1]
+        p = 1.0 / (1.0 + np.exp(-np.clip(k * e, -50, 50)))
+        dl_dp = (2 * positions.count * p - 2 * positions.sum_y) / positions.num_positions
+        dl_dz = dl_dp * p * (1 - p)
+        grad = np.append(k * (dl_dz @ x_basis), (dl_dz * e).sum() * k)
+        m = 0.9 * m + 0.1 * grad
+        v = 0.999 * v + 0.001 * grad ** 2
+        theta -= lr * (m / (1 - 0.9 ** step)) / (np.sqrt(v / (1 - 0.999 ** step)) + 1e-12)
+
+    k = np.exp(theta[-1])
+    loss = positions.loss((x_fixed + x_basis @ theta[:-1])[None, :], k)[0]
+    return dict(zip(keys, theta[:-1].tolist())), float(k), float(loss)
+
+
+def save_screening(configs, losses, ks, path=RESULTS_PATH):
+    """CSV ordinato per loss crescente: rank, indice della config (1-based come performance_log), loss, K, pesi."""
+    order = np.argsort(losses, kind="stable")
+    keys = sorted({key for config in configs for key in config})
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Rank", "Config", "Loss", "K"] + keys)
+        for rank, i in enumerate(order, 1):
+            writer.writerow([rank, i + 1, f"{losses[i]:.6f}", f"{ks[i]:.4f}"] + [configs[i].get(key) for key in keys])
+    return order
+
+
+def build_corpus(db_path=DB_PATH, strategies=CORPUS_STRATEGIES, games_per_pairing=10, num_workers=None, seed=0):
+    """Gioca un round robin andata/ritorno in parallelo registrando tutte le partite nel GameStore."""
+    from cephalopod.simulazioni.tornei.parallel_engine import run_tournament_parallel
+    run_tournament_parallel(strategies, games_per_pairing, num_workers=num_workers or os.cpu_count() or 1,
+                            seed=seed, store_path=db_path)
+
+
+def run_texel_screening(configs, evaluator="tunmin", db_path=DB_PATH, positions_path=POSITIONS_PATH,
+                        results_path=RESULTS_PATH, best_path=BEST_PATH, min_ply=MIN_PLY, top=10):
+    """
+    Pipeline completa: feature dal file cache (o estratte dal GameStore e salvate),
+    screening di tutte le config, CSV ordinato e migliore config in JSON.
+    """
+    if positions_path and os.path.exists(positions_path):
+        features, outcome = load_positions(positions_path)
+    else:
+        with GameStore(db_path) as store:
+            features, outcome = extract_positions(store, min_ply)
+        if positions_path:
+            save_positions(features, outcome, positions_path)
+    if not len(outcome):
+        print(f"❌ Nessuna posizione in {db_path}: generare prima il corpus con build_corpus().")
+        return None
+
+    positions = PositionSet(features, outcome)
+    losses, ks = screen_configs(configs, positions, evaluator)
+    order = save_screening(configs, losses, ks, results_path)
+    for rank, i in enumerate(order[:top], 1):
+        print(f"{rank:>3}. config #{i + 1}: loss={losses[i]:.5f} K={ks[i]:.3f} {configs[i]}")
+
+    best = configs[order[0]]
+    if best_path:
+        with open(best_path, "w") as f:
+            json.dump(best, f, indent=4)
+    print(f"🥇 Migliore: config #{order[0] + 1} (loss {losses[order[0]]:.5f}) -> {best_path}")
+    return losses, ks
+
+
+if __name__ == "__main__":
+    if not os.path.exists(POSITIONS_PATH):
+        with GameStore(DB_PATH) as store:
+            empty = len(store) == 0
+        if empty:
+            build_corpus()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(here, "../ui/tuning_configs_60k.json")) as f:
+        configs = json.load(f)
+    run_texel_screening(configs)
@@ -0,0 +1,186 @@
+import csv
+import json
+import multiprocessing as mp
+import os
+import random
+import time
+import zlib
+from collections import defaultdict
+
+from cephalopod.core.board import Board, Die
+from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset
+from cephalopod.simulazioni.openings import apply_move, crn_seed
+from cephalopod.simulazioni.tornei.parallel_engine import load_registry
+from cephalopod.strategies.tunMinMax import TunableMinimaxStrategy
+
+# Parametri
+OPPONENT_REGISTRY = "cephalopod.strategies.registry:TUNING_OPPONENTS"  # stessi avversari di round_robin.STRATEGIES
+NUM_WORKERS = os.cpu_count() or 1
+CHUNKSIZE = 8
+TUNABLE_DEPTH = None  # None = profondità di default di TunableMinimaxStrategy
+LOG_PATH = "performance_log.csv"
+BEST_PATH = "best_config.json"
+
+# Avversari già istanziati nel worker
+_OPPONENTS = {}
+
+
+def _opponent(registry_path, name):
+    key = (registry_path, name)
+    if key not in _OPPONENTS:
+        strat = load_registry(registry_path)[name]
+        _OPPONENTS[key] = strat() if callable(strat) else strat
+    return _OPPONENTS[key]
+
+
+def play_config_game(tunable, opponent, opening=(), tunable_color="B"):
+    """
+    Stessa partita di TrainingViewer.play_turn, senza interfaccia: di default la configurazione gioca B,
+    una mossa non legale viene sostituita da una mossa legale casuale.
+    Con `opening` la partita parte dopo le mosse d'apertura indicate (B muove per primo).
+    Ritorna (dadi B, dadi W, board finale come lista di stringhe "B3"/"").
+    """
+    board = Board()
+    current_player = "B"
+    for move in opening:
+        apply_move(board, move, current_player)
+        current_player = "W" if current_player == "B" else "B"
+
+    while not board.is_full():
+        strat = tunable if current_player == tunable_color else opponent
+
+        legal_moves = []
+        for (r, c) in board.get_empty_cells():
+            capturing_options = find_capturing_subsets(board, r, c)
+            if capturing_options:
+                subset, sum_pips = choose_capturing_subset(capturing_options)
+                legal_moves.append((r, c, sum_pips, subset))
+            else:
+                legal_moves.append((r, c, 1, []))
+
+        move = strat.choose_move(board, current_player)
+        if move not in legal_moves:
+            move = random.choice(legal_moves)
+
+        r, c, top_face, captured = move
+        for rr, cc in captured:
+            board.grid[rr][cc] = None
+        board.place_die(r, c, Die(current_player, top_face))
+        current_player = "W" if current_player == "B" else "B"
+
+    cells = [f"{d.color}{d.top_face}" if d else "" for row in board.grid for d in row]
+    b_score = sum(1 for cell in cells if cell.startswith("B"))
+    w_score = sum(1 for cell in cells if cell.startswith("W"))
+    return b_score, w_score, cells
+
+
+def evaluate_config(task):
+    """Worker: una partita configurazione contro avversario (senza apertura la configurazione gioca B)."""
+    config_index, weights, opponent_name, registry_path, depth, seed, opening, color = task
+    random.seed(seed)
+    tunable = TunableMinimaxStrategy(weights=weights) if depth is None \
+        else TunableMinimaxStrategy(weights=weights, depth=depth)
+    b_score, w_score, cells = play_config_game(tunable, _opponent(registry_path, opponent_name), opening, color)
+    mine, theirs = (b_score, w_score) if color == "B" else (w_score, b_score)
+    return {
+        "opponent": opponent_name,
+        "config": config_index + 1,  # 1-based come in TrainingViewer
+        "win": 1 if mine > theirs else 0,
+        "b_score": b_score,
+        "w_score": w_score,
+        "board": cells,
+    }
+
+
+def build_tasks(configs, opponent_names, registry_path=OPPONENT_REGISTRY, depth=TUNABLE_DEPTH, seed=0, openings=None):
+    """
+    Stesso ordine del viewer: tutte le configurazioni contro il primo avversario, poi il successivo.
+    Con `openings` ogni configurazione gioca ogni apertura con entrambi i colori, con seed comuni
+    a tutte le configurazioni (crn_seed): le differenze tra config non dipendono dalla fortuna della partita.
+    """
+    if openings is None:
+        return [(idx, weights, name, registry_path, depth,
+                 zlib.crc32(f"{seed}|{idx}|{name}".encode("utf-8")), (), "B")
+                for name in opponent_names
+                for idx, weights in enumerate(configs)]
+    return [(idx, weights, name, registry_path, depth, crn_seed(seed, name, i, color), opening, color)
+            for name in opponent_names
+            for idx, weights in enumerate(configs)
+            for i, opening in enumerate(openings)
+            for color in ("B", "W")]
+
+
+def pick_best_config(scores):
+    """Come TrainingViewer.finish_training: la configurazione con più vittorie complessive."""
+    win_counter = defaultdict(int)
+    for _, config_index, win in scores:
+        if win:
+            win_counter[config_index] += 1
+    if not win_counter:
+        return None, 0
+    best_index, best_wins = max(win_counter.items(), key=lambda x: x[1])
+    return best_index, best_wins
+
+
+def save_performance_log(scores, path=LOG_PATH):
+    with open(path, "w", newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Strategia", "Configurazione", "Vittoria (1=Si, 0=No)"])
+        for row in scores:
+            writer.writerow(row)
+
+
+def run_headless_tuning(configs, opponent_names, registry_path=OPPONENT_REGISTRY, num_workers=NUM_WORKERS,
+                        depth=TUNABLE_DEPTH, seed=0, log_path=LOG_PATH, best_path=BEST_PATH,
+                        observer=None, verbose=True, openings=None):
+    """
+    Valutazione configurazioni × avversari di TrainingViewer senza Tk né pause, su un pool di processi.
+    `observer(record, done, total)` riceve ogni partita appena conclusa (es. il viewer).
+    Scrive performance_log.csv e best_config.json (se i path non sono None) e ritorna (scores, best_config).
+    Con `openings` (vedi simulazioni/openings.py) il log ha una riga per apertura e colore.
+    """
+    tasks = build_tasks(configs, opponent_names, registry_path, depth, seed, openings)
+    order = {name: i for i, name in enumerate(opponent_names)}
+    scores = []
+    start = time.time()
+
+    def consume(records):
+        for done, record in enumerate(records, 1):
+            scores.append((record["opponent"], record["config"], record["win"]))
+            if observer:
+                observer(record, done, len(tasks))
+            if verbose and (done % 100 == 0 or done == len(tasks)):
+                print(f"[{done}/{len(tasks)}] {time.time() - start:.1f}s")
+
+    if num_workers <= 1:
+        consume(map(evaluate_config, tasks))
+    else:
+        ctx = mp.get_context("spawn")
+        with ctx.Pool(num_workers) as pool:
+            consume(pool.imap_unordered(evaluate_config, tasks, chunksize=CHUNKSIZE))
+
+    scores.sort(key=lambda s: (order[s[0]], s[1]))
+    best_index, best_wins = pick_best_config(scores)
+    best_config = configs[best_index - 1] if best_index else None
+
+    if log_path:
+        save_performance_log(scores, log_path)
+    if best_config is None:
+        print("❌ Nessuna configurazione ha vinto almeno una partita.")
+    else:
+        if best_path:
+            with open(best_path, "w") as f:
+                json.dump(best_config, f, indent=4)
+        if verbose:
+            print(f"🥇 Migliore: config #{best_index} con {best_wins} vittorie complessive")
+    if verbose:
+        print(f"🏁 {len(tasks)} partite in {time.time() - start:.1f}s su {num_workers} processi")
+    return scores, best_config
+
+
+if __name__ == "__main__":
+    here = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(here, "../../ui/tuning_configs_60k.json")) as f:
+        configs = json.load(f)
+
+    run_headless_tuning(configs, list(load_registry(OPPONENT_REGISTRY)))
@@ -0,0 +1,203 @@
+import csv
+import importlib
+import multiprocessing as mp
+import os
+import random
+import time
+import zlib
+
+from cephalopod.game_modes.cephalopod_game_dynamic import CephalopodGameDynamic
+from cephalopod.simulazioni.game_records import GameStore, moves_from_log
+
+# Parametri
+DEFAULT_REGISTRY = "cephalopod.strategies.registry:STRATEGY_REGISTRY"
+NUM_WORKERS = os.cpu_count() or 1
+CHUNKSIZE = 4
+
+# Cache per processo: registry importati e strategie già istanziate
+_REGISTRIES = {}
+_INSTANCES = {}
+
+
+def load_registry(path):
+    """Importa un registry "modulo:ATTRIBUTO" (dict o LazyRegistry nome -> classe o factory)."""
+    if path not in _REGISTRIES:
+        module_name, attr = path.split(":")
+        _REGISTRIES[path] = getattr(importlib.import_module(module_name), attr)
+    return _REGISTRIES[path]
+
+
+def build_strategy(registry_path, name):
+    """Istanzia la strategia nel processo corrente; come nei tornei sequenziali, l'istanza è riusata tra le partite."""
+    key = (registry_path, name)
+    if key not in _INSTANCES:
+        strat = load_registry(registry_path)[name]
+        instance = strat() if callable(strat) else strat
+        instance.name = name
+        _INSTANCES[key] = instance
+    return _INSTANCES[key]
+
+
+def game_seed(base_seed, name_B, name_W, game_index):
+    """Seed deterministico della partita: non dipende dall'ordine di esecuzione né dal worker."""
+    return zlib.crc32(f"{base_seed}|{name_B}|{name_W}|{game_index}".encode("utf-8"))
+
+
+def play_game(task):
+    """Gioca una partita nel worker e ritorna il record dei risultati."""
+    game_id, registry_path, name_B, name_W, game_index, seed, max_dice_per_player = task
+    random.seed(seed)
+    try:
+        import numpy as np
+        np.random.seed(seed)
+    except ImportError:
+        pass
+
+    start = time.time()
+    game = CephalopodGameDynamic(build_strategy(registry_path, name_B), build_strategy(registry_path, name_W),
+                                 max_dice_per_player)
+    moves_log = game.simulate_game()
+    grid = game.board.grid
+    b_count = sum(1 for row in grid for cell in row if cell and cell.color == "B")
+    w_count = sum(1 for row in grid for cell in row if cell and cell.color == "W")
+    return {
+        "game_id": game_id,
+        "B": name_B,
+        "W": name_W,
+        "game_index": game_index,
+        "seed": seed,
+        "winner": "B" if b_count > w_count else "W",
+        "b_count": b_count,
+        "w_count": w_count,
+        "moves": game.move_num - 1,
+        "seconds": round(time.time() - start, 3),
+        "moves_list": moves_from_log(moves_log),
+    }
+
+
+def home_away_tasks(strategy_names, games_per_pairing=1, registry_path=DEFAULT_REGISTRY, seed=0,
+                    max_dice_per_player=24):
+    """Matrice completa andata/ritorno: ogni coppia ordinata (B, W) gioca games_per_pairing partite."""
+    tasks = []
+    for name_B in strategy_names:
+        for name_W in strategy_names:
+            if name_B == name_W:
+                continue
+            for g in range(games_per_pairing):
+                tasks.append((len(tasks), registry_path, name_B, name_W, g,
+                              game_seed(seed, name_B, name_W, g), max_dice_per_player))
+    return tasks
+
+
+class TournamentTable:
+    """Classifica aggregata aggiornata partita per partita (vittorie, margini, numero di mosse)."""
+
+    def __init__(self, strategy_names):
+        self.stats = {name: {"played": 0, "wins": 0, "losses": 0, "points": 0, "margin": 0, "moves": 0,
+                             "wins_as_B": 0, "wins_as_W": 0} for name in strategy_names}
+        self.head_to_head = {}
+        self.games = []
+
+    def add(self, record):
+        self.games.append(record)
+        winner = record[record["winner"]]
+        for color, other in (("B", "W"), ("W", "B")):
+            name = record[color]
+            s = self.stats[name]
+            s["played"] += 1
+            s["points"] += 1  # Come nel round robin: 1 punto per la partita giocata, 1 per la vittoria
+            s["margin"] += record[f"{color.lower()}_count"] - record[f"{other.lower()}_count"]
+            s["moves"] += record["moves"]
+            if name == winner:
+                s["wins"] += 1
+                s["points"] += 1
+                s[f"wins_as_{color}"] += 1
+            else:
+                s["losses"] += 1
+        pair = (record["B"], record["W"])
+        h2h = self.head_to_head.setdefault(pair, {"B": 0, "W": 0})
+        h2h[record["winner"]] += 1
+
+    def standings(self):
+        return sorted(self.stats.items(), key=lambda x: (x[1]["points"], x[1]["margin"]), reverse=True)
+
+    def to_results(self):
+        """Formato di run_round_robin_home_away, compatibile con print_standings."""
+        results = {name: {"points": s["points"], "matches": []} for name, s in self.stats.items()}
+        for record in sorted(self.games, key=lambda r: r["game_id"]):
+            winner = record[record["winner"]]
+            results[record["B"]]["matches"].append(f"vs {record['W']} (B): {winner} vince")
+            results[record["W"]]["matches"].append(f"vs {record['B']} (W): {winner} vince")
+        return results
+
+    def print_table(self):
+        print(f"\n{'#':<3} {'Strategia':<25} {'Punti':>6} {'V':>5} {'P':>5} {'Win%':>6} {'Margine':>8} {'Mosse':>6}")
+        for rank, (name, s) in enumerate(self.standings(), start=1):
+            played = max(1, s["played"])
+            print(f"{rank:<3} {name:<25} {s['points']:>6} {s['wins']:>5} {s['losses']:>5} "
+                  f"{100 * s['wins'] / played:>5.1f}% {s['margin'] / played:>8.2f} {s['moves'] / played:>6.1f}")
+
+    def save_games_csv(self, path):
+        if not self.games:
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=[k for k in self.games[0] if k != "moves_list"], extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(sorted(self.games, key=lambda r: r["game_id"]))
+
+
+def run_tournament_parallel(strategy_names, games_per_pairing=1, registry_path=DEFAULT_REGISTRY,
+                            num_workers=NUM_WORKERS, seed=0, max_dice_per_player=24, verbose=True,
+                            games_csv=None, store_path=None):
+    """
+    Round robin andata e ritorno su un pool di processi. Le strategie sono costruite nei worker
+    a partire dai nomi del registry, ogni partita ha un seed deterministico e i risultati
+    confluiscono man mano in un'unica TournamentTable.
+    Con `store_path` ogni partita (mosse comprese) viene registrata anche nel GameStore SQLite.
+    """
+    tasks = home_away_tasks(strategy_names, games_per_pairing, registry_path, seed, max_dice_per_player)
+    table = TournamentTable(strategy_names)
+    store = GameStore(store_path) if store_path else None
+    start = time.time()
+
+    def consume(records):
+        for done, record in enumerate(records, 1):
+            table.add(record)
+            if store is not None:
+                store.add_game(record["B"], record["W"], record["moves_list"], winner=record["winner"],
+                               b_count=record["b_count"], w_count=record["w_count"], seed=record["seed"],
+                               seconds=record["seconds"], source="parallel_engine")
+            if verbose:
+                _print_progress(done, len(tasks), record)
+
+    try:
+        if num_workers <= 1:
+            consume(map(play_game, tasks))
+        else:
+            ctx = mp.get_context("spawn")
+            with ctx.Pool(num_workers) as pool:
+                consume(pool.imap_unordered(play_game, tasks, chunksize=CHUNKSIZE))
+    finally:
+        if store is not None:
+            store.close()
+
+    if verbose:
+        print(f"\n[✓] {len(tasks)} partite giocate in {time.time() - start:.1f}s su {num_workers} processi")
+        table.print_table()
+    if games_csv:
+        table.save_games_csv(games_csv)
+    return table
+
+
+def _print_progress(done, total, record):
+    winner = record[record["winner"]]
+    print(f"[{done}/{total}] {record['B']} (B) vs {record['W']} (W) -> Vincitore: {winner} | "
+          f"B:{record['b_count']}, W:{record['w_count']}")
+
+
+if __name__ == "__main__":
+    from cephalopod.simulazioni.tornei.round_robin_trasferta import print_standings
+
+    names = ["Naive", "Aggressive", "SmartLookahead", "SmartPos", "Non5", "Goat5"]
+    table = run_tournament_parallel(names, games_per_pairing=2, games_csv="parallel_tournament_games.csv")
+    print_standings(table.to_results())
@@ -1,50 +1,27 @@
 import tkinter as tk
 from tkinter import ttk
+import queue
 import random
 import json
 import csv
+import threading
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from cephalopod.core.board import Board, Die
 from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset
-from cephalopod.strategies import (
-    NaiveStrategy, HeuristicStrategy, AggressiveStrategy, SmartLookaheadStrategy,
-
-)
-from cephalopod.strategies.smart_minimax import SmartMinimaxStrategy
-
-from cephalopod.strategies.smart_position import SmartPositionalLookaheadStrategy
-
-from cephalopod.strategies.mod_smart_lookahead import ModSmartLookaheadStrategy
-
-from cephalopod.strategies.non5 import CautiousLookaheadStrategy
-
-from cephalopod.strategies.deep5lookahead import SmartLookaheadStrategy6
-
-from cephalopod.strategies.smart_lookahead5 import SmartLookaheadStrategy5
-
-from cephalopod.strategies import SmartBlockAggressiveStrategy
-from cephalopod.strategies.variant2_lookahead2 import Variant2SmartLookahead
-
-from cephalopod.strategies.weird2 import Weird2Strategy
+from cephalopod.strategies.registry import TUNING_OPPONENTS
 from cephalopod.strategies.tunMinMax import TunableMinimaxStrategy
 
 
-STRATEGIES = {
-
-    "SmartLookahead": SmartLookaheadStrategy,
-
-    "Goat5": SmartLookaheadStrategy5,
-    "Goat?": SmartLookaheadStrategy6,
-    "V1": Variant2SmartLookahead,
-    "we2": Weird2Strategy,
-}
+# Avversari risolti in modo lazy dal registry centrale
+STRATEGIES = TUNING_OPPONENTS
 
 BOARD_SIZE = 5
+POLL_MS = 500  # Modalità headless: ogni quanto il viewer campiona i risultati del motore
 
 class TrainingViewer(tk.Tk):
-    def __init__(self, configs, strategies_dict):
+    def __init__(self, configs, strategies_dict, headless=False, num_workers=None):
         super().__init__()
         self.title("Minimax Tuning Viewer")
         self.configs = configs
@@ -61,7 +38,56 @@ class TrainingViewer(tk.Tk):
         self.strategies_dict = strategies_dict
 
         self.setup_widgets()
-        self.after(1000, self.start_next_match)
+        if headless:
+            self.start_headless(num_workers)
+        else:
+            self.after(1000, self.start_next_match)
+
+    def start_headless(self, num_workers=None):
+        """
+        Le partite girano in headless_tuning.run_headless_tuning (pool di processi, senza pause)
+        e il viewer si limita a campionare i risultati ogni POLL_MS.
+        Gli avversari sono ricreati nei worker dai nomi di strategies_dict.
+        """
+        from cephalopod.simulazioni.tornei.headless_tuning import run_headless_tuning, NUM_WORKERS
+
+        self.results_queue = queue.Queue()
+        self.engine_thread = threading.Thread(
+            target=run_headless_tuning,
+            args=(self.configs, list(self.strategies_dict)),
+            kwargs={"num_workers": num_workers or NUM_WORKERS, "log_path": None, "best_path": None,
+                    "verbose": False, "observer": lambda record, done, total: self.results_queue.put((record, done, total))},
+            daemon=True
+        )
+        self.engine_thread.start()
+        self.append_log(f"⚡ Modalità headless: {len(self.configs)} config × {len(self.strategies)} avversari")
+        self.after(POLL_MS, self.poll_headless)
+
+    def poll_headless(self):
+        last = None
+        while True:
+            try:
+                record, done, total = self.results_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.scores.append((record["opponent"], record["config"], record["win"]))
+            last = (record, done, total)
+
+        if last:
+            record, done, total = last
+            for idx, cell in enumerate(record["board"]):
+                self.update_cell(*divmod(idx, BOARD_SIZE), *((cell[0], cell[1:]) if cell else (None, None)))
+            self.info_label.config(text=f"[{record['opponent']}] Partite {done}/{total} (B:{record['b_score']}, W:{record['w_score']})")
+            self.append_log(f"[{record['opponent']}] Config #{record['config']}: {'✅' if record['win'] else '❌'} - {done}/{total}")
+            self.update_graph()
+
+        if self.engine_thread.is_alive() or not self.results_queue.empty():
+            self.after(POLL_MS, self.poll_headless)
+        else:
+            order = {name: i for i, (name, _) in enumerate(self.strategies)}
+            self.scores.sort(key=lambda s: (order[s[0]], s[1]))
+            self.update_graph()
+            self.finish_training()
 
     def setup_widgets(self):
         top_frame = ttk.Frame(self)
@@ -258,5 +284,5 @@ if __name__ == "__main__":
     with open("../../ui/tuning_configs_60k.json") as f:
         configs = json.load(f)
 
-    app = TrainingViewer(configs=configs[:100], strategies_dict=STRATEGIES)
+    app = TrainingViewer(configs=configs[:100], strategies_dict=STRATEGIES, headless=True)
     app.mainloop()
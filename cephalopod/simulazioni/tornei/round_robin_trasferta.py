@@ -1,38 +1,27 @@
 import random
 from cephalopod.game_modes.cephalopod_game_dynamic import CephalopodGameDynamic
-from cephalopod.simulazioni.tornei.round_robin import best_config, best_multi_config
-from cephalopod.strategies import SmartLookaheadStrategy, SmartBlockAggressiveStrategy
-from cephalopod.strategies.deep5lookahead import SmartLookaheadStrategy6
-from cephalopod.strategies.deep_thinking import MinimaxStrategy, ExpectimaxStrategy
-from cephalopod.strategies.mod_smart_lookahead import ModSmartLookaheadStrategy
-from cephalopod.strategies.non5 import CautiousLookaheadStrategy
-from cephalopod.strategies.prob_lookahead import ProbabilisticLookaheadStrategy
-from cephalopod.strategies.smart_lookahead5 import SmartLookaheadStrategy5
-from cephalopod.strategies.smart_minimax import SmartMinimaxStrategy
-from cephalopod.strategies.smart_position import SmartPositionalLookaheadStrategy
-from strategies import NaiveStrategy, HeuristicStrategy, AggressiveStrategy
+from cephalopod.strategies.registry import STRATEGY_REGISTRY
 
 # === STRATEGIE REGISTRATE ===
-STRATEGIES = {
-    "Naive": NaiveStrategy,
-    "Heuristic": HeuristicStrategy,
-    "Aggressive": AggressiveStrategy,
-    "SmartLookahead": SmartLookaheadStrategy,
-    "Minimax (depth=3)": lambda: MinimaxStrategy(depth=3),
-    "Expectimax (depth=3)": lambda: ExpectimaxStrategy(depth=3),
-    "SmartMini": SmartMinimaxStrategy,
-    "SmartPositional": SmartPositionalLookaheadStrategy,
-    "ModifiedLookAhead": ModSmartLookaheadStrategy,
-    "SmartBA": SmartBlockAggressiveStrategy,
-    "SmartPos": SmartPositionalLookaheadStrategy,
-    "Non5": CautiousLookaheadStrategy,
-    # 🔥 Strategia probabilistica ottimizzata
-    "Prob (tuned)": lambda: ProbabilisticLookaheadStrategy(config=best_config, debug=False),
-    "Prob (multi)": lambda: ProbabilisticLookaheadStrategy(config=best_multi_config),
-    "Goat5": SmartLookaheadStrategy5,
-    "Goat?": SmartLookaheadStrategy6
-
-}
+# Import lazy: i moduli delle strategie vengono caricati solo per i nomi effettivamente in gara
+STRATEGIES = STRATEGY_REGISTRY.subset([
+    "Naive",
+    "Heuristic",
+    "Aggressive",
+    "SmartLookahead",
+    "Minimax (depth=3)",
+    "Expectimax (depth=3)",
+    "SmartMini",
+    "SmartPositional",
+    "ModifiedLookAhead",
+    "SmartBA",
+    "SmartPos",
+    "Non5",
+    "Prob (tuned)",  # 🔥 Strategia probabilistica ottimizzata
+    "Prob (multi)",
+    "Goat5",
+    "Goat?"
+])
 
 
 # === SIMULAZIONE PARTITA ===
@@ -54,7 +43,14 @@ def simulate_match(strategy_B, strategy_W, max_dice_per_player=24):
 
 
 # === TORNEO ROUND ROBIN CON RITORNO ===
-def run_round_robin_home_away(strategy_names, max_dice_per_player=24):
+def run_round_robin_home_away(strategy_names, max_dice_per_player=24, num_workers=1, seed=0):
+    if num_workers > 1:
+        # Stesso torneo distribuito su un pool di processi (vedi parallel_engine)
+        from cephalopod.simulazioni.tornei.parallel_engine import run_tournament_parallel
+        table = run_tournament_parallel(strategy_names, num_workers=num_workers, seed=seed,
+                                        max_dice_per_player=max_dice_per_player)
+        return table.to_results()
+
     strategies = []
     for name in strategy_names:
         strat = STRATEGIES[name]
@@ -0,0 +1,176 @@
+import csv
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+
+from cephalopod.simulazioni.openings import crn_seed
+from cephalopod.simulazioni.tornei.headless_tuning import (
+    CHUNKSIZE, NUM_WORKERS, OPPONENT_REGISTRY, TUNABLE_DEPTH, evaluate_config
+)
+from cephalopod.simulazioni.tornei.parallel_engine import load_registry
+
+# Parametri
+INITIAL_GAMES = 5   # partite per config al primo round (poi raddoppiano per i sopravvissuti)
+KEEP_FRACTION = 0.5  # frazione di config che passa al round successivo
+LOG_PATH = "halving_log.csv"
+BEST_PATH = "best_config.json"
+
+
+def game_slot(j, opponent_names, openings=None):
+    """
+    Partita j-esima del calendario, uguale per tutte le config: avversari a rotazione,
+    colore alternato, e con `openings` apertura i-esima. Ritorna (avversario, apertura, indice, colore).
+    """
+    name = opponent_names[j % len(opponent_names)]
+    k = j // len(opponent_names)
+    color = "B" if k % 2 == 0 else "W"
+    if openings:
+        return name, openings[k // 2], k // 2, color
+    return name, (), k, color
+
+
+def max_slots(opponent_names, openings=None):
+    """Partite distinte disponibili per config (illimitate senza aperture: cambia solo il seed)."""
+    return len(opponent_names) * 2 * len(openings) if openings else math.inf
+
+
+def distinct_configs(configs):
+    """
+    Indici delle config che giocano in modo diverso: per TunableMinimax contano solo i pesi letti
+    da evaluate_board (vedi texel_tuning.evaluator_matrix), le altre sono doppioni.
+    Ritorna {indice rappresentante: numero di config equivalenti}.
+    """
+    from cephalopod.simulazioni.texel_tuning import evaluator_matrix
+    matrix, _ = evaluator_matrix(configs, "tunmin")
+    groups = {}
+    for idx, row in enumerate(map(tuple, matrix)):
+        groups.setdefault(row, []).append(idx)
+    return {members[0]: len(members) for members in groups.values()}
+
+
+class HalvingState:
+    """Vittorie e margini accumulati per config; le partite dei round precedenti restano valide."""
+
+    def __init__(self, indices):
+        self.games = {idx: 0 for idx in indices}
+        self.wins = {idx: 0 for idx in indices}
+        self.margin = {idx: 0 for idx in indices}
+
+    def add(self, idx, record, color):
+        mine, theirs = (record["b_score"], record["w_score"]) if color == "B" else (record["w_score"], record["b_score"])
+        self.games[idx] += 1
+        self.wins[idx] += record["win"]
+        self.margin[idx] += mine - theirs
+
+    def win_rate(self, idx):
+        return self.wins[idx] / self.games[idx] if self.games[idx] else 0.0
+
+    def ranking(self, indices):
+        """Win rate, poi margine medio, poi indice più basso (ordine stabile come pick_best_config)."""
+        return sorted(indices, key=lambda i: (-self.win_rate(i), -self.margin[i] / max(self.games[i], 1), i))
+
+
+def run_successive_halving(configs, opponent_names, registry_path=OPPONENT_REGISTRY, num_workers=NUM_WORKERS,
+                           depth=TUNABLE_DEPTH, seed=0, initial_games=INITIAL_GAMES, keep_fraction=KEEP_FRACTION,
+                           budget=None, openings=None, dedupe=True, log_path=LOG_PATH, best_path=BEST_PATH,
+                           verbose=True):
+    """
+    Successive halving sulle configurazioni di TunableMinimax: ogni config sopravvissuta gioca fino a
+    `initial_games` partite nel primo round, poi si tiene la frazione `keep_fraction` migliore e si
+    raddoppiano le partite, finché resta una sola config, finiscono le partite distinte o il `budget`
+    (partite totali) non basta per il round successivo.
+    Tutte le config giocano lo stesso calendario (game_slot) con seed comuni (crn_seed): a parità di
+    partite i confronti tra config non dipendono dalla fortuna. Le partite girano su un pool di processi.
+    Ritorna (best_config, rounds) con rounds = lista di dict con config, partite e classifica del round.
+    """
+    groups = distinct_configs(configs) if dedupe else {idx: 1 for idx in range(len(configs))}
+    alive = sorted(groups)
+    state = HalvingState(alive)
+    limit = max_slots(opponent_names, openings)
+    target = min(initial_games, limit)
+    played, rounds = 0, []
+    start = time.time()
+    if verbose:
+        print(f"[✓] {len(configs)} config, {len(alive)} distinte, {len(opponent_names)} avversari")
+
+    pool = mp.get_context("spawn").Pool(num_workers) if num_workers > 1 else None
+    try:
+        while True:
+            slots = range(state.games[alive[0]], target)
+            cost = len(alive) * len(slots)
+            if budget is not None and played + cost > budget:
+                if verbose:
+                    print(f"[WARN] Budget esaurito: servirebbero {cost} partite, ne restano {budget - played}")
+                break
+
+            tasks, colors = [], []
+            for idx in alive:
+                for j in slots:
+                    name, opening, k, color = game_slot(j, opponent_names, openings)
+                    tasks.append((idx, configs[idx], name, registry_path, depth,
+                                  crn_seed(seed, name, k, color), opening, color))
+                    colors.append(color)
+            results = pool.imap(evaluate_config, tasks, chunksize=CHUNKSIZE) if pool else map(evaluate_config, tasks)
+            for task, color, record in zip(tasks, colors, results):
+                state.add(task[0], record, color)
+            played += cost
+
+            ranking = state.ranking(alive)
+            rounds.append({"round": len(rounds) + 1, "configs": len(alive), "games": target, "ranking": ranking})
+            if verbose:
+                best = ranking[0]
+                print(f"Round {len(rounds)}: {len(alive)} config × {target} partite, migliore #{best + 1} "
+                      f"({state.win_rate(best):.0%}), {played} partite in {time.time() - start:.1f}s")
+
+            if len(alive) == 1 or target >= limit:
+                break
+            alive = ranking[:max(1, math.ceil(len(alive) * keep_fraction))]
+            if len(alive) == 1:
+                break
+            target = min(target * 2, limit)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    best_index = state.ranking(alive)[0] if rounds else None
+    best_config = configs[best_index] if best_index is not None else None
+    if log_path and rounds:
+        save_halving_log(rounds, state, groups, log_path)
+    if best_config is None:
+        print("❌ Budget insufficiente anche per il primo round.")
+    else:
+        if best_path:
+            with open(best_path, "w") as f:
+                json.dump(best_config, f, indent=4)
+        if verbose:
+            print(f"🥇 Migliore: config #{best_index + 1} con {state.wins[best_index]}/{state.games[best_index]} "
+                  f"vittorie ({groups[best_index]} config equivalenti)")
+            print(f"🏁 {played} partite in {time.time() - start:.1f}s su {num_workers} processi")
+    return best_config, rounds
+
+
+def save_halving_log(rounds, state, groups, path=LOG_PATH):
+    """Una riga per config: ultimo round giocato e statistiche cumulative, dalla vincitrice alle prime eliminate."""
+    eliminated = {}
+    for rnd in rounds:
+        for idx in rnd["ranking"]:
+            eliminated[idx] = rnd["round"]
+    with open(path, "w", newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Configurazione", "Ultimo round", "Partite", "Vittorie", "Win rate", "Margine medio",
+                         "Config equivalenti"])
+        for idx in rounds[-1]["ranking"] + [i for rnd in reversed(rounds[:-1]) for i in rnd["ranking"]
+                                            if eliminated[i] == rnd["round"]]:
+            writer.writerow([idx + 1, eliminated[idx], state.games[idx], state.wins[idx],
+                             f"{state.win_rate(idx):.3f}", f"{state.margin[idx] / state.games[idx]:.2f}", groups[idx]])
+
+
+if __name__ == "__main__":
+    here = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(here, "../../ui/tuning_configs_60k.json")) as f:
+        configs = json.load(f)
+
+    run_successive_halving(configs, list(load_registry(OPPONENT_REGISTRY)))
@@ -2,6 +2,7 @@ import itertools
 from cephalopod.game_modes.cephalopod_game_dynamic import CephalopodGameDynamic
 from cephalopod.strategies.deep5lookahead import SmartLookaheadStrategy6
 
+from cephalopod.simulazioni.sprt import simulate_match_sequential
 from main import main
 from strategies import NaiveStrategy
 
@@ -30,17 +31,21 @@ def train_strategy(param_grid, num_games=10):
             weight_captured_dice=weight_captured_dice
         )
         opponent = NaiveStrategy()
-        result = simulate_match(strategy, opponent, num_games)
+        # num_games è il tetto: il test sequenziale si ferma appena il confronto è deciso
+        result = simulate_match_sequential(strategy, opponent, num_games)
 
         results.append({
             "weight_capture_sum": weight_capture_sum,
             "weight_captured_dice": weight_captured_dice,
             "wins_vs_naive": result["strategy1"],
-            "losses": result["strategy2"]
+            "losses": result["strategy2"],
+            "win_rate": result["strategy1"] / result["games"]
         })
-        print(f"Testato: sum={weight_capture_sum}, captured={weight_captured_dice} → W: {result['strategy1']}, L: {result['strategy2']}")
+        print(f"Testato: sum={weight_capture_sum}, captured={weight_captured_dice} → W: {result['strategy1']}, L: {result['strategy2']} "
+              f"({result['games']} partite, {result['games_saved']} risparmiate)")
 
-    return sorted(results, key=lambda x: x["wins_vs_naive"], reverse=True)
+    # Con l'arresto anticipato il numero di partite varia: si ordina per win rate
+    return sorted(results, key=lambda x: (x["win_rate"], x["wins_vs_naive"]), reverse=True)
 
 
 if __name__ == "__main__":
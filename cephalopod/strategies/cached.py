@@ -0,0 +1,214 @@
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+
+from cephalopod.core.board import BOARD_SIZE
+from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset
+from cephalopod.core.packing import board_codes, canonical_key, pack_codes
+from cephalopod.core.symmetry import inverse_symmetry, transform_cell
+
+# Parametri
+MAX_ENTRIES = 200000   # posizioni tenute in memoria per strategia (LRU)
+SQLITE_TIMEOUT = 30    # secondi di attesa sui lock quando più worker scrivono sullo stesso file
+_SKIP_ATTRS = {"name", "debug"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS moves (
+    strategy TEXT NOT NULL,
+    board    TEXT NOT NULL,
+    cell     INTEGER NOT NULL,
+    PRIMARY KEY (strategy, board)
+) WITHOUT ROWID;
+"""
+
+# Cache in memoria condivise tra le istanze dello stesso processo: strategia -> LRUCache
+_MEMORY = {}
+
+
+def legal_move_at(board, r, c):
+    """L'unica mossa legale nella cella (r, c): con una cattura possibile è obbligata (choose_capturing_subset)."""
+    capturing_options = find_capturing_subsets(board, r, c)
+    if capturing_options:
+        subset, sum_pips = choose_capturing_subset(capturing_options)
+        return r, c, sum_pips, subset
+    return r, c, 1, []
+
+
+def strategy_id(strategy, config=None):
+    """
+    Identità della strategia: classe più hash della configurazione.
+    Senza `config` si usano gli attributi pubblici serializzabili in JSON (depth, weights, config, ...).
+    """
+    cls = type(strategy)
+    if config is None:
+        config = {}
+        for key, value in sorted(vars(strategy).items()):
+            if key.startswith("_") or key in _SKIP_ATTRS:
+                continue
+            try:
+                json.dumps(value, sort_keys=True)
+            except (TypeError, ValueError):
+                continue
+            config[key] = value
+    digest = hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return f"{cls.__module__}.{cls.__qualname__}#{digest}"
+
+
+class LRUCache:
+    """Dict limitato a `max_entries` elementi: all'inserimento oltre il limite esce il meno usato di recente."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.data = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        cell = self.data.get(key)
+        if cell is not None:
+            self.data.move_to_end(key)
+        return cell
+
+    def put(self, key, cell):
+        self.data[key] = cell
+        self.data.move_to_end(key)
+        if len(self.data) > self.max_entries:
+            self.data.popitem(last=False)
+
+    def __len__(self):
+        return len(self.data)
+
+
+class CachedStrategy:
+    """
+    Wrapper opzionale che memorizza choose_move(board, color) di una strategia deterministica.
+    La chiave è (strategia, colore, board canonica): con use_symmetry=True le 8 simmetrie della
+    board condividono la stessa voce e la mossa viene riportata nel sistema di riferimento reale.
+    Si salva solo la cella giocata: la mossa completa è ricostruita con legal_move_at, quindi
+    ha sempre lo stesso formato delle mosse legali del motore.
+
+    Va usato solo con strategie che dipendono esclusivamente dalla board: con pareggi risolti a caso
+    (es. HeuristicStrategy) la cache fissa una delle mosse migliori; con use_symmetry=True anche
+    i pareggi risolti dall'ordine di visita delle celle possono cambiare.
+    Con `path` le mosse sono salvate anche in un file SQLite condiviso tra processi e partite.
+    """
+
+    def __init__(self, strategy, path=None, max_entries=MAX_ENTRIES, use_symmetry=True, config=None):
+        self.strategy = strategy
+        self.path = path
+        self.use_symmetry = use_symmetry
+        self.strategy_key = strategy_id(strategy, config) + ("" if use_symmetry else ":exact")
+        self.memory = _MEMORY.setdefault(self.strategy_key, LRUCache(max_entries))
+        self._conn = None
+
+    def __getattr__(self, attr):
+        # name, depth, weights, ... della strategia originale
+        if attr == "strategy":
+            raise AttributeError(attr)
+        return getattr(self.strategy, attr)
+
+    def __getstate__(self):
+        # La connessione SQLite non si passa ai worker (spawn): ognuno apre la sua
+        state = dict(self.__dict__)
+        state["_conn"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.memory = _MEMORY.setdefault(self.strategy_key, LRUCache(self.memory.max_entries))
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _key(self, board, color):
+        codes = board_codes(board)
+        if self.use_symmetry:
+            key, k = canonical_key(codes)
+        else:
+            key, k = pack_codes(codes), 0
+        return f"{color}{key}", k
+
+    def choose_move(self, board, color):
+        size = len(board.grid)
+        if size != BOARD_SIZE:
+            return self.strategy.choose_move(board, color)  # le tabelle di simmetria sono per la 5x5
+        key, k = self._key(board, color)
+        cell = self.memory.get(key)
+        if cell is not None:
+            self.memory.hits += 1
+        elif self.path:
+            row = self._db().execute("SELECT cell FROM moves WHERE strategy = ? AND board = ?",
+                                     (self.strategy_key, key)).fetchone()
+            if row is not None:
+                cell = row[0]
+                self.memory.disk_hits += 1
+                self.memory.put(key, cell)
+
+        if cell is not None:
+            # Cella salvata nel sistema canonico -> sistema della board reale
+            r, c = transform_cell(*divmod(cell, size), inverse_symmetry(k), size)
+            return legal_move_at(board, r, c)
+
+        self.memory.misses += 1
+        move = self.strategy.choose_move(board, color)
+        if move is None:
+            return move
+        r, c, top_face, captured = move
+        legal = legal_move_at(board, r, c)
+        if (top_face, sorted(map(tuple, captured))) != (legal[2], sorted(legal[3])):
+            return move  # mossa non legale: la decide il motore, non la memorizziamo
+        rr, cc = transform_cell(r, c, k, size)
+        cell = rr * size + cc
+        self.memory.put(key, cell)
+        if self.path:
+            with self._db() as conn:
+                conn.execute("INSERT OR IGNORE INTO moves (strategy, board, cell) VALUES (?, ?, ?)",
+                             (self.strategy_key, key, cell))
+        return move
+
+    def stats(self):
+        """Statistiche della cache di questa strategia nel processo corrente (condivise tra le istanze)."""
+        lookups = self.memory.hits + self.memory.disk_hits + self.memory.misses
+        return {
+            "strategy": self.strategy_key,
+            "lookups": lookups,
+            "hits": self.memory.hits,
+            "disk_hits": self.memory.disk_hits,
+            "misses": self.memory.misses,
+            "hit_rate": (self.memory.hits + self.memory.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self.memory),
+        }
+
+    def report(self):
+        s = self.stats()
+        print(f"[cache] {s['strategy']}: {s['hit_rate']:.1%} hit su {s['lookups']} richieste "
+              f"(memoria {s['hits']}, disco {s['disk_hits']}, calcolate {s['misses']}), {s['entries']} posizioni")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def cached_strategy(name, path=None, max_entries=MAX_ENTRIES, use_symmetry=True):
+    """
+    Factory per il registry: la strategia `name` di STRATEGY_REGISTRY avvolta in CachedStrategy.
+    Es. in STRATEGY_SPECS: "Goat5 (cache)": ("cephalopod.strategies.cached:cached_strategy", {"name": "Goat5"}).
+    """
+    from cephalopod.strategies.registry import STRATEGY_REGISTRY
+    return CachedStrategy(STRATEGY_REGISTRY[name](), path=path, max_entries=max_entries, use_symmetry=use_symmetry)
+
+
+def cache_report():
+    """Hit rate di tutte le strategie in cache nel processo corrente."""
+    for strategy_key, memory in _MEMORY.items():
+        lookups = memory.hits + memory.disk_hits + memory.misses
+        rate = (memory.hits + memory.disk_hits) / lookups if lookups else 0.0
+        print(f"[cache] {strategy_key}: {rate:.1%} hit su {lookups} richieste, {len(memory)} posizioni")
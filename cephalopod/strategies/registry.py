@@ -0,0 +1,115 @@
+import importlib
+import json
+import os
+from collections.abc import Mapping
+from functools import partial
+
+# Registry centrale delle strategie: nome -> "modulo:factory" oppure ("modulo:factory", kwargs).
+# I moduli vengono importati solo alla prima richiesta di quella strategia, così un match
+# headless o un worker non carica torch/matplotlib/pandas per strategie che non usa.
+
+_TORNEI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulazioni", "tornei")
+
+
+def _load_config(filename):
+    with open(os.path.join(_TORNEI_DIR, filename)) as f:
+        return json.load(f)
+
+
+def prob_tuned():
+    from cephalopod.strategies.prob_lookahead import ProbabilisticLookaheadStrategy
+    return ProbabilisticLookaheadStrategy(config=_load_config("best_config.json"), debug=False)
+
+
+def prob_multi():
+    from cephalopod.strategies.prob_lookahead import ProbabilisticLookaheadStrategy
+    return ProbabilisticLookaheadStrategy(config=_load_config("best_config_multi.json"))
+
+
+def rl_player():
+    from cephalopod.RL.base_rl_player import RLPlayer
+    from cephalopod.RL.reward_shaping.rewardshaping import AdvancedBoardShaper
+    return RLPlayer(name="RL", exp_rate=0.0, policy_path="policies/policy_RL_advanced.pkl",
+                    reward_shaper=AdvancedBoardShaper())
+
+
+def linear_rl_player():
+    from cephalopod.RL.linear_rl_player import LinearRLPlayer
+    from cephalopod.RL.reward_shaping.rewardshaping import AdvancedBoardShaper
+    return LinearRLPlayer(name="LinearRL", exp_rate=0.0, policy_path="policies/policy_LinearRL_advanced.pkl",
+                          reward_shaper=AdvancedBoardShaper())
+
+
+STRATEGY_SPECS = {
+    "Naive": "cephalopod.strategies.naive:NaiveStrategy",
+    "Heuristic": "cephalopod.strategies.heuristic:HeuristicStrategy",
+    "Aggressive": "cephalopod.strategies.aggressive:AggressiveStrategy",
+    "Orthogonal1": "cephalopod.strategies.orthogonal1:Orthogonal1Strategy",
+    "SmartLookahead": "cephalopod.strategies.smart_lookahead:SmartLookaheadStrategy",
+    "SmartBA": "cephalopod.strategies.smart_block_aggressive:SmartBlockAggressiveStrategy",
+    "Minimax (depth=3)": ("cephalopod.strategies.deep_thinking:MinimaxStrategy", {"depth": 3}),
+    "Expectimax (depth=3)": ("cephalopod.strategies.deep_thinking:ExpectimaxStrategy", {"depth": 3}),
+    "SmartMini": "cephalopod.strategies.smart_minimax:SmartMinimaxStrategy",
+    "SmartPositional": "cephalopod.strategies.smart_position:SmartPositionalLookaheadStrategy",
+    "SmartPos": "cephalopod.strategies.smart_position:SmartPositionalLookaheadStrategy",
+    "ModifiedLookAhead": "cephalopod.strategies.mod_smart_lookahead:ModSmartLookaheadStrategy",
+    "Non5": "cephalopod.strategies.non5:CautiousLookaheadStrategy",
+    "Prob (tuned)": f"{__name__}:prob_tuned",
+    "Prob (multi)": f"{__name__}:prob_multi",
+    "Goat5": "cephalopod.strategies.smart_lookahead5:SmartLookaheadStrategy5",
+    "Goat?": "cephalopod.strategies.deep5lookahead:SmartLookaheadStrategy6",
+    "V1": "cephalopod.strategies.variant2_lookahead2:Variant2SmartLookahead",
+    "we2": "cephalopod.strategies.weird2:Weird2Strategy",
+    "we3": "cephalopod.strategies.we3:Weird3Strategy",
+    "TunableMinimax": "cephalopod.strategies.tunMinMax:TunableMinimaxStrategy",
+    "RLPlayer": f"{__name__}:rl_player",
+    "LinearRL": f"{__name__}:linear_rl_player",
+    "BCPlayer": "cephalopod.clon.evaluate_bc_vs_expert:BCPolicyPlayer",
+}
+
+
+def resolve_spec(spec):
+    """"modulo:attributo" (o la coppia con kwargs) -> callable che crea la strategia."""
+    target, kwargs = (spec, None) if isinstance(spec, str) else spec
+    module_name, attr = target.split(":")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return partial(factory, **kwargs) if kwargs else factory
+
+
+class LazyRegistry(Mapping):
+    """
+    Dict nome -> factory che importa il modulo solo al primo accesso a quel nome.
+    Si usa come i vecchi dizionari STRATEGIES: `registry[name]()` crea l'istanza.
+    """
+
+    def __init__(self, specs):
+        self.specs = dict(specs)
+        self._factories = {}
+
+    def __getitem__(self, name):
+        if name not in self._factories:
+            self._factories[name] = resolve_spec(self.specs[name])
+        return self._factories[name]
+
+    def __iter__(self):
+        return iter(self.specs)
+
+    def __len__(self):
+        return len(self.specs)
+
+    def create(self, name):
+        instance = self[name]()
+        instance.name = name
+        return instance
+
+    def subset(self, names):
+        """Registry con i soli nomi indicati, nell'ordine dato (le factory già risolte sono condivise)."""
+        sub = LazyRegistry({name: self.specs[name] for name in names})
+        sub._factories = self._factories
+        return sub
+
+
+STRATEGY_REGISTRY = LazyRegistry(STRATEGY_SPECS)
+
+# Avversari del tuning di TunableMinimax (round_robin.TrainingViewer, nonUituining, headless_tuning)
+TUNING_OPPONENTS = STRATEGY_REGISTRY.subset(["SmartLookahead", "Goat5", "Goat?", "V1", "we2"])
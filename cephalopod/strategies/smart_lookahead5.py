@@ -18,7 +18,7 @@ def opponent_can_capture_six(board, opponent_color):
     return False
 
 
-def is_candidate_position_danger   ous(original_board, candidate_move, my_color):
+def is_candidate_position_dangerous(original_board, candidate_move, my_color):
     """
     Simula la board dopo aver applicato candidate_move e verifica se l’avversario
     può effettuare una cattura con somma 6.
@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 
 
 from cephalopod.RL.base_rl_player import RLPlayer
+from cephalopod.RL.linear_rl_player import LinearRLPlayer
 from cephalopod.RL.reward_shaping.rewardshaping import AdvancedBoardShaper
 
 # Strategie tradizionali
@@ -52,6 +53,12 @@ STRATEGIES = {
         policy_path="policies/policy_RL_advanced.pkl",
         reward_shaper=AdvancedBoardShaper()
     ),
+    "LinearRL": lambda: LinearRLPlayer(
+        name="LinearRL",
+        exp_rate=0.0,
+        policy_path="policies/policy_LinearRL_advanced.pkl",
+        reward_shaper=AdvancedBoardShaper()
+    ),
 
     "BCPlayer": lambda: BCPolicyPlayer(),
      "We2": Weird2Strategy
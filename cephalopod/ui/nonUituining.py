@@ -5,20 +5,10 @@ from pathlib import Path
 
 from cephalopod.core.board import Board, Die
 from cephalopod.core.mechanics import find_capturing_subsets, choose_capturing_subset
-from cephalopod.strategies import SmartLookaheadStrategy
-from cephalopod.strategies.deep5lookahead import SmartLookaheadStrategy6
-from cephalopod.strategies.smart_lookahead5 import SmartLookaheadStrategy5
+from cephalopod.strategies.registry import TUNING_OPPONENTS
 from cephalopod.strategies.tunMinMax import TunableMinimaxStrategy
-from cephalopod.strategies.variant2_lookahead2 import Variant2SmartLookahead
-from cephalopod.strategies.weird2 import Weird2Strategy
-
-STRATEGIES = {
-    "SmartLookahead": SmartLookaheadStrategy,
-    "Goat5": SmartLookaheadStrategy5,
-    "Goat?": SmartLookaheadStrategy6,
-    "V1": Variant2SmartLookahead,
-    "we2": Weird2Strategy,
-}
+
+STRATEGIES = TUNING_OPPONENTS
 
 BOARD_SIZE = 5
 
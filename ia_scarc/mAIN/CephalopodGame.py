@@ -1,4 +1,3 @@
-import concurrent.futures
 import itertools
 import tkinter as tk
 from tkinter import ttk
@@ -181,7 +180,8 @@ class GameSetupDialog(tk.Toplevel):
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 import random, time, threading, importlib
-import concurrent.futures
+
+from mAIN.engine_host import EngineHost
 
 
 class CephalopodGUI:
@@ -191,7 +191,7 @@ class CephalopodGUI:
         self.ai_names = ai_names  # E.g., {"Blue": "player.playerMinimax", "Red": "Human"}
         self.state_history = [game.initial]
         self.current_index = 0
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self.engines = {}  # colore -> EngineHost: ogni giocatore AI gira nel suo processo
         self.waiting_for_human = False
         self.human_move = None
         self.time_out = time_out
@@ -365,19 +365,9 @@ class CephalopodGUI:
         legal_moves = self.game.actions(state)
         move = None
         if self.player_types[current_player] == "ai":
-            if current_player == "Blue":
-                future = self.executor.submit(playerBmodule.playerStrategy, self.game, state)
-            else:
-                future = self.executor.submit(playerRmodule.playerStrategy, self.game, state)
-            try:
-                move = future.result(timeout=self.time_out)
-            except concurrent.futures.TimeoutError:
-                print(f"[TIMEOUT] {current_player} ha sforato i {self.time_out} secondi. Esegue mossa random.")
-                future.cancel()
-                move = random.choice(legal_moves)
-
-                future.cancel()
-                move = random.choice(legal_moves)
+            module = playerBmodule if current_player == "Blue" else playerRmodule
+            # Timeout, errori e mosse illegali sono gestiti dall'host (mossa random, processo riavviato se serve)
+            move, _ = self.engine_for(current_player, module.__name__).choose_move(self.game, state)
         else:
             self.waiting_for_human = True
             self.human_move = None
@@ -393,6 +383,21 @@ class CephalopodGUI:
         if self.game.is_terminal(new_state):
             self.show_game_over()
 
+    def engine_for(self, color, module_name):
+        """EngineHost del giocatore `color`, ricreato solo se cambia il modulo (es. dopo restart_game)."""
+        host = self.engines.get(color)
+        if host is None or host.module_name != module_name:
+            if host is not None:
+                host.close()
+            host = self.engines[color] = EngineHost(module_name, time_out=self.time_out)
+        return host
+
+    def close_engines(self):
+        for color, host in self.engines.items():
+            print(f"[ENGINE] {color}: {host.summary()}")
+            host.close()
+        self.engines = {}
+
     def restart_game(self, dialog):
         dialog.destroy()
         from CephalopodGame import GameSetupDialog  # evita circular import
@@ -463,6 +468,7 @@ class CephalopodGUI:
 
             threading.Thread(target=loop, daemon=True).start()
         self.root.mainloop()
+        self.close_engines()
 
 
 def main():
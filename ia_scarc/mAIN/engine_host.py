@@ -0,0 +1,198 @@
+import importlib
+import multiprocessing as mp
+import random
+import time
+import traceback
+
+# Parametri
+TIME_OUT = 3.0        # limite per mossa (come CephalopodGUI.time_out)
+GRACE = 0.5           # oltre TIME_OUT + GRACE il processo viene ucciso e ricreato
+STARTUP_TIMEOUT = 60  # secondi concessi all'import del modulo giocatore (non contano sul tempo di mossa)
+
+# Protocollo (tuple su una Pipe):
+#   host -> engine: ("move", id, size, first_player, board, to_move, last_move) | ("quit",)
+#   engine -> host: ("ready", nome_modulo) | ("move", id, mossa, cpu, wall) | ("error", id, traceback)
+# Lo stato viaggia come dati semplici e viene ricostruito nel processo: niente pickle di classi di __main__.
+
+
+def _engine_main(conn, module_name):
+    """Processo engine: importa il modulo una volta sola e risponde alle richieste di mossa."""
+    try:
+        from mAIN.CephalopodGame import Board, CephalopodGame
+        module = importlib.import_module(module_name)
+    except Exception:
+        conn.send(("error", None, traceback.format_exc()))
+        return
+    conn.send(("ready", module_name))
+
+    games = {}
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            return
+        if msg[0] == "quit":
+            return
+        _, move_id, size, first_player, board, to_move, last_move = msg
+        game = games.get((size, first_player))
+        if game is None:
+            game = games[(size, first_player)] = CephalopodGame(size=size, first_player=first_player)
+        state = Board(size, board, to_move, last_move)
+
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        try:
+            move = module.playerStrategy(game, state)
+        except Exception:
+            conn.send(("error", move_id, traceback.format_exc()))
+            continue
+        conn.send(("move", move_id, move, time.process_time() - cpu_start, time.perf_counter() - wall_start))
+
+
+class EngineHost:
+    """
+    Esegue playerStrategy di un modulo giocatore in un processo separato e riutilizzabile.
+    Ogni mossa ha un limite `time_out`: una risposta in ritardo viene scartata, e se l'engine non
+    risponde entro time_out + grace il processo viene ucciso (libera subito la CPU) e ricreato.
+    In ogni caso di errore, ritardo o mossa illegale si gioca una mossa legale casuale,
+    come nel vecchio play_turn con ThreadPoolExecutor.
+    """
+
+    def __init__(self, module_name, time_out=TIME_OUT, grace=GRACE, startup_timeout=STARTUP_TIMEOUT):
+        self.module_name = module_name
+        self.time_out = time_out
+        self.grace = grace
+        self.startup_timeout = startup_timeout
+        self.ctx = mp.get_context("spawn")
+        self.process = None
+        self.conn = None
+        self.ready = False
+        self.next_id = 0
+        self.history = []  # un dict per mossa: status, cpu, wall
+        self.restarts = 0
+        self.broken = False  # import del modulo fallito: inutile riprovare a ogni mossa
+        self.start()
+
+    def start(self):
+        """Avvia il processo senza attendere l'import: si aspetta solo alla prima mossa."""
+        parent_conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(target=_engine_main, args=(child_conn, self.module_name), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.ready = False
+
+    def _wait_ready(self):
+        if self.ready:
+            return True
+        if self.conn.poll(self.startup_timeout):
+            try:
+                msg = self.conn.recv()
+            except EOFError:
+                msg = ("error", None, "processo terminato durante l'avvio")
+            if msg[0] == "ready":
+                self.ready = True
+                return True
+            print(f"[ENGINE] {self.module_name}: avvio fallito\n{msg[2]}")
+            self.broken = True
+        else:
+            print(f"[ENGINE] {self.module_name}: avvio oltre {self.startup_timeout}s")
+        self.kill()
+        return False
+
+    def kill(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+        self.process, self.conn, self.ready = None, None, False
+
+    def restart(self):
+        self.kill()
+        self.restarts += 1
+        self.start()
+
+    def choose_move(self, game, state):
+        """Ritorna (mossa, info) con info = {"status", "cpu", "wall"}; status "ok", "timeout", "killed", "error" o "illegal"."""
+        legal_moves = game.actions(state)
+        if self.broken:
+            return self._fallback(legal_moves, "error")
+        if self.process is None:
+            self.start()
+        if not self._wait_ready():
+            return self._fallback(legal_moves, "error")
+
+        self.next_id += 1
+        move_id = self.next_id
+        start = time.perf_counter()
+        try:
+            self.conn.send(("move", move_id, state.size, game.first_player, state.board, state.to_move,
+                            state.last_move))
+        except (BrokenPipeError, OSError):
+            self.restart()
+            return self._fallback(legal_moves, "error")
+
+        deadline = start + self.time_out + self.grace
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not self.conn.poll(remaining):
+                # Engine ancora al lavoro oltre il limite rigido: lo si uccide e si riparte con un processo nuovo
+                print(f"[TIMEOUT] {self.module_name} non ha risposto entro {self.time_out + self.grace:.1f}s: "
+                      f"processo riavviato, mossa random.")
+                self.restart()
+                return self._fallback(legal_moves, "killed", wall=time.perf_counter() - start)
+            try:
+                msg = self.conn.recv()
+            except EOFError:
+                self.restart()
+                return self._fallback(legal_moves, "error", wall=time.perf_counter() - start)
+            if msg[1] == move_id:
+                break  # le risposte con id vecchio sono avanzi di mosse già rimpiazzate
+
+        if msg[0] == "error":
+            print(f"[ENGINE] {self.module_name}: errore in playerStrategy\n{msg[2]}")
+            return self._fallback(legal_moves, "error", wall=time.perf_counter() - start)
+        _, _, move, cpu, wall = msg
+        if wall > self.time_out:
+            print(f"[TIMEOUT] {self.module_name} ha sforato i {self.time_out} secondi ({wall:.2f}s). Esegue mossa random.")
+            return self._fallback(legal_moves, "timeout", cpu, wall)
+        if move not in legal_moves:
+            print(f"[ENGINE] {self.module_name}: mossa illegale {move}. Esegue mossa random.")
+            return self._fallback(legal_moves, "illegal", cpu, wall)
+        return move, self._record("ok", cpu, wall)
+
+    def _fallback(self, legal_moves, status, cpu=None, wall=None):
+        return random.choice(legal_moves), self._record(status, cpu, wall)
+
+    def _record(self, status, cpu, wall):
+        info = {"status": status, "cpu": cpu, "wall": wall}
+        self.history.append(info)
+        return info
+
+    def summary(self):
+        """Mosse per esito, tempo CPU medio e massimo delle risposte valide, riavvii."""
+        cpu = [h["cpu"] for h in self.history if h["cpu"] is not None]
+        counts = {}
+        for h in self.history:
+            counts[h["status"]] = counts.get(h["status"], 0) + 1
+        return {
+            "module": self.module_name,
+            "moves": len(self.history),
+            "status": counts,
+            "cpu_mean": sum(cpu) / len(cpu) if cpu else 0.0,
+            "cpu_max": max(cpu) if cpu else 0.0,
+            "restarts": self.restarts,
+        }
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.send(("quit",))
+            except (BrokenPipeError, OSError):
+                pass
+        if self.process is not None:
+            self.process.join(1)
+        self.kill()
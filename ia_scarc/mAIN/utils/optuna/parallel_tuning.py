@@ -0,0 +1,127 @@
+import json
+import logging
+import multiprocessing as mp
+import statistics
+from statistics import harmonic_mean
+
+import optuna
+from optuna.pruners import MedianPruner
+from optuna.samplers import CmaEsSampler
+
+from mAIN.utils.optuna.tunable2 import TunableResilient2MinimaxStrategy
+from mAIN.utils.optuna.tuning_optuna import BASELINES, play_game, score_trial, suggest_weights
+
+logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+# Parametri
+STUDY_NAME = "cephalopod_tuning_parallel"
+STORAGE = "sqlite:///cephalopod_parallel.db"
+N_TRIALS = 30
+STUDY_WORKERS = 2        # processi che eseguono trial in contemporanea sullo stesso storage
+GAME_WORKERS = 4         # processi per le partite di ogni trial (uno per baseline)
+PAIRS_PER_BASELINE = 5   # 5 coppie = 10 partite per baseline, come tournament_match(games_per_color=5)
+N_STARTUP_TRIALS = 5     # trial completi prima che il pruner inizi a intervenire
+SQLITE_TIMEOUT = 60      # secondi di attesa sui lock di SQLite con più processi
+
+
+def play_pair(task):
+    """Una coppia di partite (sfidante Blue poi Red); margini dal punto di vista dello sfidante."""
+    weights, baseline_name = task
+    challenger = TunableResilient2MinimaxStrategy(depth=2, weights=weights)
+    opponent = BASELINES[baseline_name]()
+    return baseline_name, [play_game(challenger, opponent), -play_game(opponent, challenger)]
+
+
+def make_objective(pool, pairs_per_baseline=PAIRS_PER_BASELINE):
+    """
+    Obiettivo di tuning_optuna.objective (media armonica dei win rate sulle baseline), giocato a round:
+    in ogni round tutte le baseline giocano una coppia di partite in parallelo sul pool,
+    poi il punteggio parziale viene riportato a Optuna (step = round) e il pruner può fermare il trial.
+    """
+    def objective(trial):
+        weights = suggest_weights(trial)
+        results = {name: [] for name in BASELINES}
+        logger.info(f"Trial {trial.number}: Testing weights {weights}")
+
+        composite_score = 0.0
+        for step in range(pairs_per_baseline):
+            for name, margins in pool.imap_unordered(play_pair, [(weights, name) for name in BASELINES]):
+                results[name].extend(margins)
+            composite_score = harmonic_mean([score_trial(results[name])[0] for name in BASELINES])
+            trial.report(composite_score, step)
+            if trial.should_prune():
+                logger.info(f"Trial {trial.number}: pruned al round {step + 1} (score parziale {composite_score:.4f})")
+                raise optuna.TrialPruned()
+
+        win_rates, margins = [], []
+        for name in BASELINES:
+            win_rate, margin, wins, losses = score_trial(results[name])
+            logger.info(f"{name}: {wins}W/{losses}L ({win_rate:.2%} win rate), Avg Margin = {margin:.2f}")
+            win_rates.append(win_rate)
+            margins.append(margin)
+        avg_margin = statistics.mean(margins)
+        logger.info(f"Trial {trial.number}: Composite Score = {composite_score:.4f}, Avg Margin = {avg_margin:.2f}")
+
+        if composite_score >= 0.75:
+            with open("supreme_configs.json", "a") as f:
+                json.dump({"trial": trial.number, "weights": weights, "score": composite_score}, f)
+                f.write("\n")
+
+        trial.set_user_attr("win_rates", win_rates)
+        trial.set_user_attr("margins", margins)
+        return composite_score
+
+    return objective
+
+
+def _storage(url):
+    return optuna.storages.RDBStorage(url, engine_kwargs={"connect_args": {"timeout": SQLITE_TIMEOUT}})
+
+
+def _study_worker(worker_id, n_trials, storage_url, study_name, game_workers, pairs_per_baseline):
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=_storage(storage_url),
+        sampler=CmaEsSampler(seed=42 + worker_id, sigma0=0.5),  # seed diverso per worker: niente trial duplicati
+        pruner=MedianPruner(n_startup_trials=N_STARTUP_TRIALS, n_warmup_steps=0)
+    )
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(game_workers) as pool:
+        study.optimize(make_objective(pool, pairs_per_baseline), n_trials=n_trials)
+
+
+def run_parallel_study(n_trials=N_TRIALS, study_workers=STUDY_WORKERS, game_workers=GAME_WORKERS,
+                       pairs_per_baseline=PAIRS_PER_BASELINE, storage_url=STORAGE, study_name=STUDY_NAME):
+    """Distribuisce n_trials su study_workers processi che condividono lo stesso storage SQLite."""
+    optuna.create_study(direction="maximize", study_name=study_name, storage=_storage(storage_url),
+                        load_if_exists=True)
+
+    ctx = mp.get_context("spawn")
+    workers = []
+    for worker_id in range(study_workers):
+        trials = n_trials // study_workers + (1 if worker_id < n_trials % study_workers else 0)
+        if trials == 0:
+            continue
+        p = ctx.Process(target=_study_worker,
+                        args=(worker_id, trials, storage_url, study_name, game_workers, pairs_per_baseline))
+        p.start()
+        workers.append(p)
+    for p in workers:
+        p.join()
+
+    study = optuna.load_study(study_name=study_name, storage=_storage(storage_url))
+    pruned = sum(1 for t in study.trials if t.state == optuna.trial.TrialState.PRUNED)
+    logger.info(f"Trial completati: {len(study.trials) - pruned}, pruned: {pruned}")
+    return study
+
+
+if __name__ == "__main__":
+    logger.info("Starting parallel Optuna study")
+    study = run_parallel_study()
+
+    with open("best_supreme_config.json", "w") as f:
+        json.dump(study.best_params, f, indent=4)
+
+    logger.info("\n\U0001F3C1 Supreme tuning complete. Best configuration:")
+    logger.info(study.best_params)
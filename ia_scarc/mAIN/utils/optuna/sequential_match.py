@@ -0,0 +1,98 @@
+import math
+
+# Parametri
+CONFIDENCE = 0.95
+P0, P1 = 0.45, 0.55  # Ipotesi SPRT: win rate dello sfidante <= P0 contro >= P1
+
+
+def _betacf(a, b, x):
+    """Frazione continua della beta incompleta (Lentz)."""
+    tiny = 1e-30
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 200):
+        m2 = 2 * m
+        for num in (m * (b - m) * x / ((a + m2 - 1) * (a + m2)),
+                    -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1))):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def beta_cdf(x, a, b):
+    """P(X <= x) per X ~ Beta(a, b)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _betacf(b, a, 1 - x) / b
+
+
+class SequentialTest:
+    """
+    Stesso test di cephalopod/simulazioni/sprt.py per il motore Blue/Red.
+    Punteggi dal punto di vista dello sfidante: 1 vittoria, 0.5 pareggio, 0 sconfitta.
+      - "sprt":  test di Wald tra win rate P0 e P1, errori alfa = beta = 1 - confidence
+      - "bayes": posterior Beta(1 + W, 1 + L), stop se P(p > 0.5) esce da [1 - confidence, confidence]
+    """
+
+    def __init__(self, method="bayes", confidence=CONFIDENCE, p0=P0, p1=P1):
+        if method not in ("sprt", "bayes"):
+            raise ValueError(f"Metodo sconosciuto: {method}")
+        self.method = method
+        self.confidence = confidence
+        self.p0, self.p1 = p0, p1
+        self.wins = 0.0
+        self.losses = 0.0
+
+    def update(self, score):
+        self.wins += score
+        self.losses += 1 - score
+
+    def decision(self):
+        error = 1 - self.confidence
+        if self.method == "sprt":
+            llr = (self.wins * math.log(self.p1 / self.p0)
+                   + self.losses * math.log((1 - self.p1) / (1 - self.p0)))
+            if llr >= math.log((1 - error) / error):
+                return "win"
+            if llr <= math.log(error / (1 - error)):
+                return "loss"
+            return None
+        p = 1.0 - beta_cdf(0.5, 1 + self.wins, 1 + self.losses)
+        if p >= self.confidence:
+            return "win"
+        if p <= error:
+            return "loss"
+        return None
+
+
+def tournament_match_sequential(play_game, challenger, opponent, max_pairs=5, method="bayes",
+                                confidence=CONFIDENCE):
+    """
+    Come tuning_optuna.tournament_match, ma a coppie di partite (sfidante Blue poi Red)
+    con arresto appena il test sequenziale decide. `play_game(blue, red)` ritorna Blue - Red.
+    Ritorna (margini dal punto di vista dello sfidante, info) con info = partite giocate/risparmiate e decisione.
+    """
+    test = SequentialTest(method, confidence)
+    results = []
+    decision = None
+    for _ in range(max_pairs):
+        margins = (play_game(challenger, opponent), -play_game(opponent, challenger))
+        for margin in margins:
+            results.append(margin)
+            test.update(1 if margin > 0 else 0 if margin < 0 else 0.5)
+        decision = test.decision()
+        if decision:
+            break
+    info = {"games": len(results), "games_saved": 2 * max_pairs - len(results), "decision": decision}
+    return results, info
@@ -5,22 +5,21 @@ import logging
 from optuna.samplers import CmaEsSampler
 from statistics import harmonic_mean
 from mAIN.CephalopodGame import CephalopodGame
-from mAIN.strategies.minimax_strategies import MinimaxStrategy
-from mAIN.strategies.smart_lookahead5 import SmartLookaheadStrategy5
-from mAIN.utils.optuna.trial44_strategy import Trial44BestStrategy
+from mAIN.utils.optuna.sequential_match import tournament_match_sequential
 from mAIN.utils.optuna.tunable2 import TunableResilient2MinimaxStrategy
+from mAIN.utils.registry import LazyRegistry, STRATEGY_SPECS
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
-# Baseline registry (usa lambda solo per strategie che vogliamo re-istanziate ad ogni run)
-BASELINES = {
-    "Minimax": MinimaxStrategy(depth=2),
-    "SmartLookahead5": SmartLookaheadStrategy5(),
-    "SelfDefault": TunableResilient2MinimaxStrategy(depth=2),
-    "Trial44Best": lambda: Trial44BestStrategy(depth=2),
-}
+# Baseline dal registry lazy (factory: istanziate ad ogni run, moduli importati al primo uso)
+BASELINES = LazyRegistry({
+    "Minimax": STRATEGY_SPECS["DynamicMinimax"],
+    "SmartLookahead5": STRATEGY_SPECS["SmartLookahead5"],
+    "SelfDefault": STRATEGY_SPECS["SelfDefault"],
+    "Trial44Best": STRATEGY_SPECS["Trial44Timed"],
+})
 
 
 # Tournament match
@@ -64,9 +63,8 @@ def score_trial(results):
     return win_rate, avg_margin, wins, losses
 
 
-# Obiettivo multi-metrico
-def objective(trial):
-    weights = {
+def suggest_weights(trial):
+    return {
         "piece_weight": trial.suggest_float("piece_weight", 0.5, 2.0),
         "bonus_six_weight": trial.suggest_float("bonus_six_weight", 1.0, 4.0),
         "opponent_piece_weight": trial.suggest_float("opponent_piece_weight", 0.5, 2.0),
@@ -77,24 +75,33 @@ def objective(trial):
         "opponent_threat_weight": trial.suggest_float("opponent_threat_weight", 0.0, 2.0)
     }
 
+
+# Obiettivo multi-metrico
+def objective(trial):
+    weights = suggest_weights(trial)
     challenger = TunableResilient2MinimaxStrategy(depth=2, weights=weights)
     win_rates = []
     margins = []
+    games_saved = 0
 
     logger.info(f"Trial {trial.number}: Testing weights {weights}")
 
     for name, opponent_factory in BASELINES.items():
         opponent = opponent_factory() if callable(opponent_factory) else opponent_factory
-        results = tournament_match(challenger, opponent, games_per_color=5, repetitions=1)
+        # Al massimo 5 partite per colore come prima, ma stop appena il confronto è deciso
+        results, info = tournament_match_sequential(play_game, challenger, opponent, max_pairs=5)
+        games_saved += info["games_saved"]
         win_rate, margin, wins, losses = score_trial(results)
-        logger.info(f"{name}: {wins}W/{losses}L ({win_rate:.2%} win rate), Avg Margin = {margin:.2f}")
+        logger.info(f"{name}: {wins}W/{losses}L ({win_rate:.2%} win rate), Avg Margin = {margin:.2f}, "
+                    f"{info['games']} partite ({info['decision'] or 'indeciso'})")
         win_rates.append(win_rate)
         margins.append(margin)
 
     composite_score = harmonic_mean(win_rates)
     avg_margin = statistics.mean(margins)
 
-    logger.info(f"Trial {trial.number}: Composite Score = {composite_score:.4f}, Avg Margin = {avg_margin:.2f}")
+    logger.info(f"Trial {trial.number}: Composite Score = {composite_score:.4f}, Avg Margin = {avg_margin:.2f}, "
+                f"partite risparmiate = {games_saved}")
 
     if composite_score >= 0.75:
         with open("supreme_configs.json", "a") as f:
@@ -103,6 +110,7 @@ def objective(trial):
 
     trial.set_user_attr("win_rates", win_rates)
     trial.set_user_attr("margins", margins)
+    trial.set_user_attr("games_saved", games_saved)
     return composite_score
 
 
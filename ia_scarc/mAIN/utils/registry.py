@@ -0,0 +1,84 @@
+import importlib
+from collections.abc import Mapping
+from functools import partial
+
+# Registry delle strategie del motore Blue/Red: nome -> "modulo:factory" oppure ("modulo:factory", kwargs).
+# Come cephalopod/strategies/registry.py: i moduli sono importati solo al primo uso del nome.
+
+STRATEGY_SPECS = {
+    "DynamicMinimax": "mAIN.strategies.minimax_strategies:DynamicMinimaxStrategy",
+    "DynamicMinimax2": "mAIN.strategies.new_minimax:DynamicMinimaxStrategy2",
+    "DynamicIterativeMinimax2": "mAIN.strategies.DynamicIterativeMinimaxStrategy2:DynamicIterativeMinimaxStrategy2",
+    "Adrian": "mAIN.strategies.PERF_minimax:DynamicMinimaxStrategyAdrian",
+    "Adrian2": "mAIN.strategies.adr:DynamicMinimaxStrategyAdrian2",
+    "AlphaBeta": "mAIN.strategies.alphabeta_minimax:AlphaBetaMinimaxStrategy",
+    "AlphaBetaPaolo": "mAIN.strategies.alphabeta2:AlphaBetaMinimaxStrategyPaolo",
+    "AlphaBetaIA": "mAIN.strategies.alphabeta3:AlphaBetaMinimaxStrategyIA",
+    "AlphaBetaPaoluz": "mAIN.strategies.fixed:AlphaBetaMinimaxStrategyPaoluz",
+    "ParallelDynamicMinimax": "mAIN.strategies.mcts_minimax:ParallelDynamicMinimaxStrategy",
+    "SuperMinimax": "mAIN.strategies.merge_minimax:SuperMinimaxStrategy",
+    "Enhanced": "mAIN.strategies.minimax_selfutned:CephalopodEnhancedStrategy",
+    "RobustDynamicMinimax": "mAIN.strategies.minimax_zobreist:RobustDynamicMinimaxStrategy",
+    "RobustDynamicMinimaxPar": "mAIN.strategies.par:RobustDynamicMinimax",
+    "ResilientMinimax": "mAIN.strategies.resilent_minimax:ResilientMinimaxStrategy",
+    "SmartLookahead5": "mAIN.strategies.smart_lookahead5:SmartLookaheadStrategy5",
+    "AdaptiveSimpleMinimax": "mAIN.utils.mcts.mcts_strategy:AdaptiveSimpleMinimaxStrategy",
+    "Trial44Timed": "mAIN.utils.optuna.trial44_strategy:Trial44BestStrategyTimed",
+    "TunableResilient": ("mAIN.utils.optuna.tunable_resilient_minimax:TunableResilientMinimaxStrategy", {"depth": 3}),
+    "SelfDefault": ("mAIN.utils.optuna.tunable2:TunableResilient2MinimaxStrategy", {"depth": 2}),
+}
+
+# Moduli giocatore (funzione playerStrategy(game, state)) usati dalla GUI e dal torneo del corso
+PLAYER_SPECS = {
+    "44player": "mAIN.player.44player:playerStrategy",
+    "advPlayer": "mAIN.player.advPlayer:playerStrategy",
+    "alphabeta_player": "mAIN.player.alphabeta_player:playerStrategy",
+    "alphabeta_player2": "mAIN.player.alphabeta_player2:playerStrategy",
+    "merge_player": "mAIN.player.merge_player:playerStrategy",
+    "playerMinimax": "mAIN.player.playerMinimax:playerStrategy",
+    "playerResilientMinimax": "mAIN.player.playerResilientMinimax:playerStrategy",
+    "playerSmartLookahead5": "mAIN.player.playerSmartLookahead5:playerStrategy",
+    "playerTunableResilient": "mAIN.player.playerTunableResilient:playerStrategy",
+    "self_minimax": "mAIN.player.self_minimax:playerStrategy",
+    "zob": "mAIN.player.zob:playerStrategy",
+    "playerExampleRandom": "mAIN.playerExampleRandom:playerStrategy",
+}
+
+
+def resolve_spec(spec):
+    """"modulo:attributo" (o la coppia con kwargs) -> oggetto/factory importato."""
+    target, kwargs = (spec, None) if isinstance(spec, str) else spec
+    module_name, attr = target.split(":")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return partial(factory, **kwargs) if kwargs else factory
+
+
+class LazyRegistry(Mapping):
+    """Dict nome -> factory che importa il modulo solo al primo accesso a quel nome."""
+
+    def __init__(self, specs):
+        self.specs = dict(specs)
+        self._factories = {}
+
+    def __getitem__(self, name):
+        if name not in self._factories:
+            self._factories[name] = resolve_spec(self.specs[name])
+        return self._factories[name]
+
+    def __iter__(self):
+        return iter(self.specs)
+
+    def __len__(self):
+        return len(self.specs)
+
+    def create(self, name):
+        return self[name]()
+
+    def subset(self, names):
+        sub = LazyRegistry({name: self.specs[name] for name in names})
+        sub._factories = self._factories
+        return sub
+
+
+STRATEGY_REGISTRY = LazyRegistry(STRATEGY_SPECS)
+PLAYER_REGISTRY = LazyRegistry(PLAYER_SPECS)